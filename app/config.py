@@ -23,10 +23,31 @@ class Settings(BaseSettings):
     default_cleanup_files: bool = False
     default_max_weeks: int = 21
 
+    # Настройки анализатора
+    analysis_workers: int = 1  # Процессов общего пула поиска окон (0 - по числу ядер)
+    academic_calendar_file: str = "data/academic_calendar.json"  # Сессии, каникулы и переносы рабочих дней
+    standing_queries_max: int = 100  # Постоянных запросов в памяти сервиса (старые вытесняются)
+
+    # Настройки YouGile
+    yougile_requests_per_minute: int = 50  # Лимит запросов YouGile API на компанию
+    yougile_write_workers: int = 4  # Потоков для массовой записи задач
+    yougile_timeout: float = 30.0  # Таймаут запросов асинхронного клиента (секунды)
+    yougile_max_connections: int = 20  # Размер пула соединений асинхронного клиента
+    yougile_http2: bool = False  # HTTP/2 для асинхронного клиента (нужен пакет h2)
+    yougile_key_ttl: int = 3600  # Время хранения ключа API в кэше (секунды)
+    yougile_entity_cache: bool = True  # Общий для запросов кэш проектов, досок, колонок и задач
+    yougile_cache_ttl: int = 300  # Время до полной перезагрузки кэша сущностей (секунды, 0 - без ограничения)
+    yougile_cache_resync_ttl: int = 86400  # То же при подписке на вебхуки: сверка на случай пропущенных событий
+    yougile_cache_persist: bool = False  # Сохранять кэш сущностей в SQLite между перезапусками
+    yougile_cache_dir: str = "data/yougile_cache"  # Каталог файлов кэша сущностей
+    yougile_webhook_url: str = ""  # Внешний адрес сервиса для вебхуков YouGile (пусто - без вебхуков)
+    yougile_webhook_secret: str = ""  # Токен в адресе вебхуков (обязателен: без него события отклоняются)
+
     # Пути к данным
     data_dir: str = "data"
     json_schedules_dir: str = "data/json_schedules"
     logs_dir: str = "data/logs"
+    profiles_dir: str = "data/profiles"  # Профили cProfile запросов анализа с profile=true
 
     class Config:
         env_file = ".env"
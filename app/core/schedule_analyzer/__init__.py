@@ -5,7 +5,16 @@
 загруженных из JSON-файлов или моделей YouGile, и поиска окон в расписании.
 """
 
-from .analyzer import ScheduleAnalyzer
+from .constants import DEFAULT_TOP_K
 
-__all__ = ['ScheduleAnalyzer']
+__all__ = ['ScheduleAnalyzer', 'DEFAULT_TOP_K']
+
+
+def __getattr__(name):
+    # Анализатор (и его зависимости) загружается при первом обращении, чтобы
+    # импорт констант пакета не тянул за собой весь анализатор
+    if name == 'ScheduleAnalyzer':
+        from .analyzer import ScheduleAnalyzer
+        return ScheduleAnalyzer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
@@ -5,40 +5,81 @@
 различными алгоритмами и создания отчетов в YouGile.
 """
 
+import heapq
 import logging
+from time import perf_counter
+from array import array
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta, date, time
-from typing import List, Dict, Any, Optional, Set
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterator, Callable
+from dataclasses import dataclass, field
 from enum import Enum
 from itertools import combinations
 from intervaltree import IntervalTree
-import holidays
 
 from yougile_integration.yougile_integrator import ScheduleIntegrator
+from .parallel import run_parallel_search
+from .work_calendar import WorkCalendar
+from .timing import StageTimer
+from .constants import DEFAULT_TOP_K
+from .slot_sources import (
+    TimeSlot, SlotStore, SlotSource, YouGileSlotSource, _EPOCH, to_epoch_minutes, from_epoch_minutes
+)
+
+# Типы постоянных запросов, результат которых складывается из лучших окон
+# отдельных дней: при изменении доски пересчитываются только затронутые дни
+DAY_DECOMPOSABLE_TYPES = {"common_window", "split_window", "min_conflict_window"}
+
+# Типы постоянных запросов. Еженедельное окно зависит от всех недель диапазона,
+# а оценка окна с аудиторией - от начала диапазона, поэтому такие запросы при
+# изменении доски пересчитываются целиком
+STANDING_QUERY_TYPES = DAY_DECOMPOSABLE_TYPES | {"recurring_window", "room_window"}
+
+# Максимальное количество интервальных деревьев подмножеств в кэше анализатора
+ADJUSTED_TREE_CACHE_SIZE = 256
+
+# Горячие пути поиска работают с целыми микросекундами от эпохи: в них точно
+# представимы и минуты хранилища слотов, и дробные шаги/промежутки из часов
+_MICROSECOND = timedelta(microseconds=1)
+_US_PER_MINUTE = 60_000_000
+_US_PER_SECOND = 1_000_000
+_US_PER_DAY = 86_400_000_000
+
+
+def to_epoch_microseconds(dt: datetime) -> int:
+    """Переводит время в целое число микросекунд от эпохи."""
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def from_epoch_microseconds(microseconds: int) -> datetime:
+    """Переводит число микросекунд от эпохи обратно во время."""
+    return _EPOCH + timedelta(microseconds=microseconds)
+
+
+def _time_of_day_microseconds(t: time) -> int:
+    """Возвращает время суток в микросекундах от полуночи."""
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * _US_PER_SECOND + t.microsecond
+
+
+def _hours_to_microseconds(hours: float) -> int:
+    """Переводит часы в микросекунды с тем же округлением, что и timedelta."""
+    return timedelta(hours=hours) // _MICROSECOND
+
+
+def _minutes_to_microseconds(minutes: float) -> int:
+    """Переводит минуты в микросекунды с тем же округлением, что и timedelta."""
+    return timedelta(minutes=minutes) // _MICROSECOND
 
 
 class WindowType(Enum):
     """Типы окон для поиска."""
     COMMON_WINDOW = "common_window"
     SPLIT_WINDOW = "split_window"
+    RECURRING_WINDOW = "recurring_window"
 
 
-@dataclass
-class TimeSlot:
-    """Временной слот для занятия."""
-    start: datetime
-    end: datetime
-    title: str
-    description: str = ""
-    board_name: str = ""
-
-    def duration_hours(self) -> float:
-        """Возвращает продолжительность слота в часах."""
-        return (self.end - self.start).total_seconds() / 3600
-
-    def overlaps_with(self, other: 'TimeSlot') -> bool:
-        """Проверяет пересечение с другим временным слотом."""
-        return self.start < other.end and self.end > other.start
+WEEKDAY_NAMES = ["понедельник", "вторник", "среда", "четверг", "пятница", "суббота", "воскресенье"]
 
 
 @dataclass
@@ -51,6 +92,8 @@ class Window:
     description: str
     participants: List[str] = None
     days_count: int = 1
+    score: Optional[float] = None
+    room: Optional[str] = None
 
     def to_task_data(self) -> Dict[str, Any]:
         """Преобразует окно в данные для создания задачи в YouGile."""
@@ -68,6 +111,10 @@ class Window:
             f"Продолжительность: {self.duration_hours:.1f} часов",
             self.description
         ]
+        if self.room:
+            description_parts.append(f"Аудитория: {self.room}")
+        if self.score is not None:
+            description_parts.append(f"Оценка: {self.score:.3f}")
         if self.participants:
             description_parts.append(f"Участники: {', '.join(self.participants)}")
 
@@ -82,6 +129,105 @@ class Window:
         }
 
 
+class WindowRanking:
+    """
+    Ограниченная куча лучших окон.
+
+    Хранит не более top_k окон с наибольшей оценкой. При равной оценке
+    предпочтение отдаётся окну, добавленному раньше.
+    """
+
+    def __init__(self, top_k: int):
+        """
+        Инициализация рейтинга.
+
+        Args:
+            top_k: Количество лучших окон.
+        """
+        self.top_k = top_k
+        self._heap: List[Tuple[float, int, Window]] = []
+        self._seq = 0
+
+    @property
+    def threshold(self) -> Optional[float]:
+        """Оценка худшего из хранимых окон или None, если куча ещё не заполнена."""
+        if len(self._heap) < self.top_k:
+            return None
+        return self._heap[0][0]
+
+    def can_improve(self, bound: float) -> bool:
+        """Проверяет, может ли окно с оценкой не выше bound попасть в рейтинг."""
+        threshold = self.threshold
+        return threshold is None or bound > threshold
+
+    def offer(self, window: Window, score: float) -> None:
+        """
+        Предлагает окно для включения в рейтинг.
+
+        Args:
+            window: Окно-кандидат.
+            score: Оценка окна.
+        """
+        entry = (score, -self._seq, window)
+        self._seq += 1
+        if len(self._heap) < self.top_k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            heapq.heapreplace(self._heap, entry)
+
+    def results(self) -> List[Window]:
+        """
+        Возвращает окна рейтинга с заполненной оценкой.
+
+        Returns:
+            List[Window]: Окна, отсортированные по убыванию оценки.
+        """
+        best_windows = []
+        for score, _, window in sorted(self._heap, key=lambda e: e[:2], reverse=True):
+            window.score = score
+            best_windows.append(window)
+        return best_windows
+
+
+@dataclass
+class StandingQuery:
+    """
+    Постоянный запрос поиска окон.
+
+    Хранит лучшие окна каждого дня диапазона, чтобы при изменении доски
+    пересчитывать только затронутые дни и заново сливать результаты.
+    """
+    query_id: str
+    algo_config: Dict[str, Any]
+    reference_time: datetime
+    board_names: List[str] = field(default_factory=list)
+    day_results: Dict[date, List[Window]] = field(default_factory=dict)
+    windows: List[Window] = field(default_factory=list)
+
+    @property
+    def type(self) -> str:
+        """Тип алгоритма запроса."""
+        return self.algo_config.get("type")
+
+    @property
+    def participants(self) -> List[str]:
+        """Участники запроса (по умолчанию - доски, переданные при регистрации)."""
+        return list(self.algo_config.get("participants") or self.board_names)
+
+    @property
+    def by_day(self) -> bool:
+        """Результат складывается из независимых результатов дней диапазона."""
+        return self.type in DAY_DECOMPOSABLE_TYPES
+
+    @property
+    def boards(self) -> Set[str]:
+        """Доски, от которых зависит результат запроса: участники и пул аудиторий."""
+        boards = set(self.participants)
+        if self.type == "room_window":
+            boards.update(self.algo_config.get("rooms") or [])
+        return boards
+
+
 class ScheduleAnalyzer:
     """
     Класс для анализа расписания и поиска окон в YouGile.
@@ -90,24 +236,40 @@ class ScheduleAnalyzer:
     в YouGile для отображения результатов анализа.
     """
 
-    def __init__(self, integrator: ScheduleIntegrator):
+    def __init__(self, integrator: Optional[ScheduleIntegrator], slot_source: Optional[SlotSource] = None,
+                 calendar: Optional[WorkCalendar] = None, timer: Optional[StageTimer] = None):
         """
         Инициализация анализатора.
 
         Args:
-            integrator: Экземпляр ScheduleIntegrator.
+            integrator: Экземпляр ScheduleIntegrator (None для локального анализа без YouGile).
+            slot_source: Источник временных слотов (по умолчанию задачи досок YouGile).
+            calendar: Календарь нерабочих дней (по умолчанию выходные и праздники РФ).
+            timer: Замеры этапов анализа (по умолчанию выключены).
         """
         self.integrator = integrator
+        self.slot_source = slot_source or (YouGileSlotSource(integrator) if integrator else None)
         self.logger = logging.getLogger('ScheduleAnalyzer')
         self._setup_logging()
 
         # Кэши
-        self._time_slots_cache: Dict[str, List[TimeSlot]] = {}
+        # Компактные хранилища слотов (массивы минут от эпохи) по доскам
+        self._time_slots_cache: Dict[str, SlotStore] = {}
+        # Индекс по дням: участник -> номер дня от эпохи -> (отсортированные начала, отсортированные окончания)
+        self._day_index_cache: Dict[str, Dict[int, Tuple[List[int], List[int]]]] = {}
+        # Слитые интервалы занятости участника (микросекунды) с учётом min_gap_hours, общие для всех запросов
+        self._busy_intervals_cache: Dict[Tuple[str, float], List[Tuple[int, int]]] = {}
+        # Интервальные деревья подмножеств участников (LRU)
+        self._adjusted_tree_cache: "OrderedDict[Tuple[frozenset, float], IntervalTree]" = OrderedDict()
         self._windows_column_cache: Optional[str] = None
+        # Постоянные запросы, обновляемые инкрементально при изменении досок
+        self._standing_queries: Dict[str, StandingQuery] = {}
 
-        # Ограничения по времени
-        self.weekend_days = {5, 6}  # Суббота, воскресенье (0=понедельник)
-        self.holidays = self._get_holidays()
+        # Ограничения по времени: выходные, праздники и академический календарь
+        self.calendar = calendar or WorkCalendar()
+
+        # Замеры этапов и счётчики для отладки производительности
+        self.timer = timer or StageTimer(enabled=False)
 
     def _setup_logging(self):
         """Настройка логирования."""
@@ -119,23 +281,6 @@ class ScheduleAnalyzer:
             console_handler.setFormatter(formatter)
             self.logger.addHandler(console_handler)
 
-    def _get_holidays(self) -> Set[date]:
-        """Получение праздничных дней для России на 2025 год."""
-        try:
-            ru_holidays = holidays.RU(years=2025)
-            return set(ru_holidays.keys())
-        except Exception as e:
-            self.logger.error(f"Ошибка при загрузке праздников: {e}")
-            return set()
-
-    def _get_board_id(self, board_name: str) -> Optional[str]:
-        """Получение ID доски по её названию."""
-        for board in self.integrator.schedule_boards:
-            if board.title == board_name:
-                return board.id
-        self.logger.warning(f"Доска '{board_name}' не найдена")
-        return None
-
     def _get_windows_column_id(self) -> Optional[str]:
         """Получение ID колонки 'Найденные окна' из кэша или API."""
         if self._windows_column_cache:
@@ -152,7 +297,7 @@ class ScheduleAnalyzer:
 
     def load_time_slots(self, board_name: str) -> List[TimeSlot]:
         """
-        Загружает временные слоты из задач указанной доски.
+        Загружает временные слоты указанной доски из источника слотов.
 
         Args:
             board_name: Название доски для загрузки слотов.
@@ -160,61 +305,38 @@ class ScheduleAnalyzer:
         Returns:
             List[TimeSlot]: Список временных слотов.
         """
+        return list(self.load_slot_store(board_name))
+
+    def load_slot_store(self, board_name: str) -> SlotStore:
+        """
+        Загружает слоты доски в компактное хранилище (с кэшированием).
+
+        Args:
+            board_name: Название доски для загрузки слотов.
+
+        Returns:
+            SlotStore: Хранилище слотов доски.
+        """
         if board_name in self._time_slots_cache:
             self.logger.info(f"Загружено {len(self._time_slots_cache[board_name])} слотов из кэша для доски '{board_name}'")
             return self._time_slots_cache[board_name]
 
         try:
             self.logger.info(f"Загрузка временных слотов для доски '{board_name}'")
-            self.integrator.get_schedule_tasks()
-            board_id = self._get_board_id(board_name)
-            if not board_id:
-                return []
-
-            # Фильтруем задачи по доске
-            column_ids = {c.id for c in self.integrator.schedule_columns if c.board_id == board_id}
-            time_slots = []
-
-            for task in self.integrator.schedule_tasks:
-                if task.column_id not in column_ids:
-                    continue
-
-                try:
-                    if not hasattr(task, 'deadline') or not task.deadline:
-                        continue
-
-                    deadline = task.deadline
-                    if not isinstance(deadline, dict):
-                        continue
-
-                    start_timestamp = deadline.get('startDate')
-                    end_timestamp = deadline.get('deadline')
-                    if not start_timestamp or not end_timestamp:
-                        continue
-
-                    start_dt = datetime.fromtimestamp(start_timestamp / 1000)
-                    end_dt = datetime.fromtimestamp(end_timestamp / 1000)
-
-                    time_slot = TimeSlot(
-                        start=start_dt,
-                        end=end_dt,
-                        title=task.title,
-                        description=getattr(task, 'description', ''),
-                        board_name=board_name
-                    )
-                    time_slots.append(time_slot)
+            if not self.slot_source:
+                self.logger.warning("Источник временных слотов не задан")
+                return SlotStore.from_arrays(board_name, [], [])
 
-                except Exception as e:
-                    self.logger.warning(f"Ошибка при обработке задачи '{task.title}': {e}")
-
-            time_slots.sort(key=lambda x: x.start)
-            self._time_slots_cache[board_name] = time_slots
-            self.logger.info(f"Загружено {len(time_slots)} временных слотов для доски '{board_name}'")
-            return time_slots
+            with self.timer.stage("slot_load"):
+                store = SlotStore.from_slots(board_name, self.slot_source.load_time_slots(board_name))
+            self._time_slots_cache[board_name] = store
+            self._invalidate_participant(board_name)
+            self.logger.info(f"Загружено {len(store)} временных слотов для доски '{board_name}'")
+            return store
 
         except Exception as e:
             self.logger.error(f"Ошибка при загрузке слотов для доски '{board_name}': {e}")
-            return []
+            return SlotStore.from_arrays(board_name, [], [])
 
     def is_working_time(self, dt: datetime, earliest_start_hour: int, latest_end_hour: int) -> bool:
         """
@@ -230,11 +352,7 @@ class ScheduleAnalyzer:
         """
         if dt.hour < earliest_start_hour or dt.hour >= latest_end_hour:
             return False
-        if dt.weekday() in self.weekend_days:
-            return False
-        if dt.date() in self.holidays:
-            return False
-        return True
+        return self.calendar.is_working_day(dt.date())
 
     def is_time_slot_free(self, start: datetime, end: datetime, exclude_boards: Optional[Set[str]] = None) -> bool:
         """
@@ -248,15 +366,13 @@ class ScheduleAnalyzer:
         Returns:
             bool: True, если слот свободен.
         """
-        test_slot = TimeSlot(start=start, end=end, title="test")
         exclude_boards = exclude_boards or set()
 
-        for board_name, slots in self._time_slots_cache.items():
+        for board_name, store in self._time_slots_cache.items():
             if board_name in exclude_boards:
                 continue
-            for slot in slots:
-                if test_slot.overlaps_with(slot):
-                    return False
+            if store.overlaps(start, end):
+                return False
         return True
 
     def find_split_window(self, start_date: date, end_date: date, total_duration: float,
@@ -291,111 +407,235 @@ class ScheduleAnalyzer:
         Returns:
             Window: Найденное окно или None.
         """
+        windows = self.find_split_windows(
+            start_date, end_date, total_duration, min_segment_duration, max_segments, participants,
+            earliest_start_time, latest_end_time, min_gap_hours,
+            maximize_participants, minimize_start_time, minimize_total_idle, minimize_max_gap,
+            include_holidays, include_weekends,
+            weight_participants, weight_start_time, weight_total_idle, weight_max_gap,
+            top_k=1
+        )
+        return windows[0] if windows else None
+
+    def find_split_windows(self, start_date: date, end_date: date, total_duration: float,
+                           min_segment_duration: float, max_segments: int, participants: List[str],
+                           earliest_start_time: time = time(hour=7, minute=0),
+                           latest_end_time: time = time(hour=23, minute=0), min_gap_hours: float = 0.0,
+                           maximize_participants: bool = True, minimize_start_time: bool = True,
+                           minimize_total_idle: bool = True, minimize_max_gap: bool = True,
+                           include_holidays: bool = False, include_weekends: bool = False,
+                           weight_participants: float = 1.0, weight_start_time: float = 1.0,
+                           weight_total_idle: float = 1.0, weight_max_gap: float = 1.0,
+                           top_k: int = DEFAULT_TOP_K, workers: int = 1,
+                           reference_time: Optional[datetime] = None) -> List[Window]:
+        """
+        Находит top_k лучших сплит-окон заданной общей продолжительности.
+
+        Кандидаты генерируются лениво и сразу оцениваются, в памяти хранится
+        не более top_k окон.
+
+        Args:
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            total_duration: Общая продолжительность сплит-окна в часах.
+            min_segment_duration: Минимальная продолжительность сегмента в часах.
+            max_segments: Максимальное количество сегментов.
+            participants: Список названий досок участников.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            maximize_participants: Учитывать максимизацию участников.
+            minimize_start_time: Учитывать минимизацию времени начала.
+            minimize_total_idle: Учитывать минимизацию суммарного простоя.
+            minimize_max_gap: Учитывать минимизацию максимального промежутка.
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            top_k: Количество лучших окон в результате.
+            workers: Количество процессов для поиска по частям диапазона дат
+                (1 - в текущем процессе, 0 - по числу ядер).
+            reference_time: Время отсчета для оценки начала окна
+                (по умолчанию начало рабочего времени первого дня).
+
+        Returns:
+            List[Window]: Окна, отсортированные по убыванию оценки.
+        """
         try:
             self.logger.info(f"Поиск сплит-окна с {start_date} по {end_date} для участников: {participants}")
             if not participants or total_duration <= 0 or min_segment_duration <= 0 or \
-               earliest_start_time >= latest_end_time or max_segments < 1:
+               earliest_start_time >= latest_end_time or max_segments < 1 or top_k < 1:
                 self.logger.warning("Некорректные входные параметры для сплит-окна")
-                return None
+                return []
 
             # Загрузка временных слотов
             for participant in participants:
-                self.load_time_slots(participant)
+                self.load_slot_store(participant)
+
+            now = reference_time or datetime.combine(start_date, earliest_start_time)
+            if self._use_parallel_search(start_date, end_date, workers):
+                search_kwargs = {
+                    "total_duration": total_duration,
+                    "min_segment_duration": min_segment_duration,
+                    "max_segments": max_segments,
+                    "participants": participants,
+                    "earliest_start_time": earliest_start_time,
+                    "latest_end_time": latest_end_time,
+                    "min_gap_hours": min_gap_hours,
+                    "maximize_participants": maximize_participants,
+                    "minimize_start_time": minimize_start_time,
+                    "minimize_total_idle": minimize_total_idle,
+                    "minimize_max_gap": minimize_max_gap,
+                    "include_holidays": include_holidays,
+                    "include_weekends": include_weekends,
+                    "weight_participants": weight_participants,
+                    "weight_start_time": weight_start_time,
+                    "weight_total_idle": weight_total_idle,
+                    "weight_max_gap": weight_max_gap,
+                    "top_k": top_k,
+                    "reference_time": now
+                }
+                partial_results = run_parallel_search(
+                    self, "split_window", search_kwargs, participants, start_date, end_date, workers
+                )
+                return self._log_split_result(self._merge_split_results(partial_results, top_k))
 
-            possible_split_windows = []
-            current_date = start_date
+            ranking = WindowRanking(top_k)
 
-            while current_date <= end_date:
-                if (not include_holidays and current_date in self.holidays) or \
-                   (not include_weekends and current_date.weekday() in self.weekend_days):
-                    current_date += timedelta(days=1)
-                    continue
+            # Все сплит-окна включают всех участников, поэтому оценка сверху зависит только от начала окна
+            def cannot_improve(window_start: datetime) -> bool:
+                return not ranking.can_improve(self._score_upper_bound(
+                    len(participants), window_start, now, participants, maximize_participants,
+                    minimize_start_time, minimize_total_idle, minimize_max_gap,
+                    weight_participants, weight_start_time, weight_total_idle, weight_max_gap
+                ))
+
+            # Оценка и выбор лучших сплит-окон
+            for window in self._iter_split_windows(
+                start_date, end_date, total_duration, min_segment_duration, max_segments, participants,
+                earliest_start_time, latest_end_time, min_gap_hours, include_holidays, include_weekends,
+                should_stop=cannot_improve
+            ):
+                scoring_started = perf_counter() if self.timer.enabled else 0.0
+                ranking.offer(window, self._score_window(
+                    window, now, participants, maximize_participants,
+                    minimize_start_time, minimize_total_idle, minimize_max_gap, earliest_start_time, latest_end_time,
+                    weight_participants, weight_start_time, weight_total_idle, weight_max_gap
+                ))
+                if self.timer.enabled:
+                    self.timer.add("scoring", perf_counter() - scoring_started)
+            return self._log_split_result(ranking.results())
 
-                day_start_dt = datetime.combine(current_date, earliest_start_time)
-                day_end_dt = datetime.combine(current_date, latest_end_time)
-
-                # Генерируем все возможные сегменты в течение дня
-                segments = []
-                t = day_start_dt
-                while t <= day_end_dt:
-                    segment_end = t + timedelta(hours=min_segment_duration)
-                    if segment_end <= day_end_dt:
-                        segments.append((t, segment_end))
-                    t += timedelta(minutes=min_gap_hours if min_gap_hours else 15) # Шаг в 15 минут для генерации сегментов
-
-                # Поиск комбинаций сегментов
-                for num_segments in range(1, max_segments + 1):
-                    for segment_combination in combinations(segments, num_segments):
-                        # Проверяем, что сегменты не пересекаются и идут по порядку
-                        is_valid_combination = True
-                        combined_duration = 0.0
-                        current_end = None
-                        for seg_start, seg_end in segment_combination:
-                            if current_end and seg_start < current_end:
-                                is_valid_combination = False
-                                break
-                            combined_duration += (seg_end - seg_start).total_seconds() / 3600
-                            current_end = seg_end
-
-                        if not is_valid_combination or combined_duration < total_duration:
-                            continue
-
-                        # Проверяем, что все сегменты свободны для всех участников
-                        all_segments_free = True
-                        for participant_subset in combinations(participants, len(participants)):
-                            adjusted_tree = self._build_adjusted_tree(set(participant_subset), min_gap_hours)
-                            for seg_start, seg_end in segment_combination:
-                                if adjusted_tree.overlap(seg_start, seg_end):
-                                    all_segments_free = False
-                                    break
-                            if not all_segments_free: break
-
-                        if not all_segments_free:
-                            continue
-
-                        # Если комбинация валидна и свободна, создаем сплит-окно
-                        split_window_start = segment_combination[0][0]
-                        split_window_end = segment_combination[-1][1]
-
-                        window = Window(
-                            start=split_window_start,
-                            end=split_window_end,
-                            duration_hours=combined_duration,
-                            window_type=WindowType.SPLIT_WINDOW,
-                            description=f"Сплит-окно для участников: {', '.join(participants)}",
-                            participants=list(participants),
-                            days_count=(split_window_end.date() - split_window_start.date()).days + 1
-                        )
-                        possible_split_windows.append(window)
+        except Exception as e:
+            self.logger.error(f"Ошибка при поиске сплит-окна: {e}")
+            return []
+
+    def _iter_split_windows(self, start_date: date, end_date: date, total_duration: float,
+                            min_segment_duration: float, max_segments: int, participants: List[str],
+                            earliest_start_time: time, latest_end_time: time, min_gap_hours: float,
+                            include_holidays: bool, include_weekends: bool,
+                            should_stop: Optional[Callable[[datetime], bool]] = None) -> Iterator[Window]:
+        """
+        Лениво генерирует свободные сплит-окна по дням.
+
+        Args:
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            total_duration: Общая продолжительность сплит-окна в часах.
+            min_segment_duration: Минимальная продолжительность сегмента в часах.
+            max_segments: Максимальное количество сегментов.
+            participants: Список названий досок участников.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            should_stop: Функция, возвращающая True, если окна, начинающиеся не раньше
+                переданного времени, уже не нужны. Проверяется в начале каждого дня.
 
+        Yields:
+            Window: Найденное сплит-окно.
+        """
+        earliest_us = _time_of_day_microseconds(earliest_start_time)
+        latest_us = _time_of_day_microseconds(latest_end_time)
+        segment_us = _hours_to_microseconds(min_segment_duration)
+        step_us = _minutes_to_microseconds(min_gap_hours if min_gap_hours else 15)
+        excluded_days = self.calendar.excluded_days(start_date, end_date, include_holidays, include_weekends)
+        current_date = start_date
+
+        while current_date <= end_date:
+            if current_date in excluded_days:
                 current_date += timedelta(days=1)
+                continue
 
-            if not possible_split_windows:
-                self.logger.info("Сплит-окно не найдено")
-                return None
+            day_start_dt = datetime.combine(current_date, earliest_start_time)
+            if should_stop and should_stop(day_start_dt):
+                return
 
-            # Оценка и выбор лучшего сплит-окна
-            now = datetime.combine(start_date, earliest_start_time)
-            best_split_window = max(
-                possible_split_windows,
-                key=lambda w: self._score_window(
-                    w, now, participants, maximize_participants,
-                    minimize_start_time, minimize_total_idle, minimize_max_gap, earliest_start_time, latest_end_time,
-                    weight_participants, weight_start_time, weight_total_idle, weight_max_gap
-                )
-            )
+            # Генерируем все возможные сегменты в течение дня (в микросекундах от эпохи)
+            day_base = to_epoch_microseconds(datetime.combine(current_date, time()))
+            day_end = day_base + latest_us
+            segments = []
+            t = day_base + earliest_us
+            while t <= day_end:
+                segment_end = t + segment_us
+                if segment_end <= day_end:
+                    segments.append((t, segment_end))
+                t += step_us  # Шаг в 15 минут для генерации сегментов
+
+            # Поиск комбинаций сегментов
+            for num_segments in range(1, max_segments + 1):
+                for segment_combination in combinations(segments, num_segments):
+                    # Проверяем, что сегменты не пересекаются и идут по порядку
+                    is_valid_combination = True
+                    combined_duration = 0.0
+                    current_end = None
+                    for seg_start, seg_end in segment_combination:
+                        if current_end and seg_start < current_end:
+                            is_valid_combination = False
+                            break
+                        combined_duration += (seg_end - seg_start) / _US_PER_SECOND / 3600
+                        current_end = seg_end
+
+                    if not is_valid_combination or combined_duration < total_duration:
+                        continue
 
-            self.logger.info(f"Найдено сплит-окно: {best_split_window.start} - {best_split_window.end} для участников: {best_split_window.participants}")
-            return best_split_window
+                    # Проверяем, что все сегменты свободны для всех участников
+                    all_segments_free = True
+                    for participant_subset in combinations(participants, len(participants)):
+                        adjusted_tree = self._build_adjusted_tree(set(participant_subset), min_gap_hours)
+                        for seg_start, seg_end in segment_combination:
+                            if adjusted_tree.overlap(seg_start, seg_end):
+                                all_segments_free = False
+                                break
+                        if not all_segments_free: break
 
-        except Exception as e:
-            self.logger.error(f"Ошибка при поиске сплит-окна: {e}")
-            return None
+                    if not all_segments_free:
+                        continue
+
+                    # Если комбинация валидна и свободна, создаем сплит-окно
+                    split_window_start = from_epoch_microseconds(segment_combination[0][0])
+                    split_window_end = from_epoch_microseconds(segment_combination[-1][1])
+
+                    yield Window(
+                        start=split_window_start,
+                        end=split_window_end,
+                        duration_hours=combined_duration,
+                        window_type=WindowType.SPLIT_WINDOW,
+                        description=f"Сплит-окно для участников: {', '.join(participants)}",
+                        participants=list(participants),
+                        days_count=(split_window_end.date() - split_window_start.date()).days + 1
+                    )
+
+            current_date += timedelta(days=1)
 
     def _build_adjusted_tree(self, participants: Set[str], min_gap_hours: float) -> IntervalTree:
         """
         Создает интервальное дерево с интервалами, расширенными на min_gap_hours.
 
+        Границы интервалов - целые микросекунды от эпохи.
+
+        Деревья кэшируются по подмножеству участников и промежутку, поэтому
+        повторные запросы с теми же участниками не перестраивают их.
+
         Args:
             participants: Множество участников.
             min_gap_hours: Минимальный промежуток в часах.
@@ -403,15 +643,61 @@ class ScheduleAnalyzer:
         Returns:
             IntervalTree: Дерево с расширенными интервалами.
         """
-        tree = IntervalTree()
-        gap = timedelta(hours=min_gap_hours)
-        for participant in participants:
-            for slot in self._time_slots_cache.get(participant, []):
-                adjusted_start = slot.start - gap
-                adjusted_end = slot.end + gap
-                tree.addi(adjusted_start, adjusted_end)
+        key = (frozenset(participants), min_gap_hours)
+        tree = self._adjusted_tree_cache.get(key)
+        if tree is not None:
+            self._adjusted_tree_cache.move_to_end(key)
+            return tree
+
+        with self.timer.stage("tree_build"):
+            tree = IntervalTree.from_tuples(
+                interval
+                for participant in key[0]
+                for interval in self._get_busy_intervals(participant, min_gap_hours)
+            )
+        self._adjusted_tree_cache[key] = tree
+        if len(self._adjusted_tree_cache) > ADJUSTED_TREE_CACHE_SIZE:
+            self._adjusted_tree_cache.popitem(last=False)
         return tree
 
+    def _get_busy_intervals(self, participant: str, min_gap_hours: float) -> List[Tuple[int, int]]:
+        """
+        Возвращает слитые интервалы занятости участника, расширенные на min_gap_hours.
+
+        Args:
+            participant: Название доски участника.
+            min_gap_hours: Минимальный промежуток в часах.
+
+        Returns:
+            List[Tuple[int, int]]: Непересекающиеся интервалы по возрастанию (микросекунды от эпохи).
+        """
+        key = (participant, min_gap_hours)
+        intervals = self._busy_intervals_cache.get(key)
+        if intervals is None:
+            gap = _hours_to_microseconds(min_gap_hours)
+            intervals = []
+            store = self._time_slots_cache.get(participant)
+            for start, end in zip(store.starts, store.ends) if store else ():
+                adjusted_start = start * _US_PER_MINUTE - gap
+                adjusted_end = end * _US_PER_MINUTE + gap
+                if adjusted_start >= adjusted_end:
+                    continue
+                if intervals and adjusted_start <= intervals[-1][1]:
+                    if adjusted_end > intervals[-1][1]:
+                        intervals[-1] = (intervals[-1][0], adjusted_end)
+                else:
+                    intervals.append((adjusted_start, adjusted_end))
+            self._busy_intervals_cache[key] = intervals
+        return intervals
+
+    def _invalidate_participant(self, participant: str) -> None:
+        """Сбрасывает производные кэши участника после изменения его слотов."""
+        self._day_index_cache.pop(participant, None)
+        for key in [k for k in self._busy_intervals_cache if k[0] == participant]:
+            del self._busy_intervals_cache[key]
+        for key in [k for k in self._adjusted_tree_cache if participant in k[0]]:
+            del self._adjusted_tree_cache[key]
+
     def find_common_window(self, start_date: date, end_date: date, required_duration: float,
                            participants: List[str], earliest_start_time: time = time(hour=7, minute=0),
                            latest_end_time: time = time(hour=23, minute=0), min_gap_hours: float = 0.0,
@@ -441,55 +727,227 @@ class ScheduleAnalyzer:
         Returns:
             Window: Найденное окно или None.
         """
+        windows = self.find_common_windows(
+            start_date, end_date, required_duration, participants,
+            earliest_start_time, latest_end_time, min_gap_hours,
+            maximize_participants, minimize_start_time, minimize_total_idle, minimize_max_gap,
+            include_holidays, include_weekends,
+            weight_participants, weight_start_time, weight_total_idle, weight_max_gap,
+            top_k=1
+        )
+        return windows[0] if windows else None
+
+    def find_common_windows(self, start_date: date, end_date: date, required_duration: float,
+                            participants: List[str], earliest_start_time: time = time(hour=7, minute=0),
+                            latest_end_time: time = time(hour=23, minute=0), min_gap_hours: float = 0.0,
+                            maximize_participants: bool = True, minimize_start_time: bool = True,
+                            minimize_total_idle: bool = True, minimize_max_gap: bool = True,
+                            include_holidays: bool = False, include_weekends: bool = False,
+                            weight_participants: float = 1.0, weight_start_time: float = 1.0,
+                            weight_total_idle: float = 1.0, weight_max_gap: float = 1.0,
+                            top_k: int = DEFAULT_TOP_K, workers: int = 1,
+                            reference_time: Optional[datetime] = None) -> List[Window]:
+        """
+        Находит top_k лучших общих окон строго заданной продолжительности.
+
+        Кандидаты генерируются лениво и сразу оцениваются, в памяти хранится
+        не более top_k окон.
+
+        Args:
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            required_duration: Точная продолжительность окна в часах.
+            participants: Список названий досок участников.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            maximize_participants: Учитывать максимизацию участников.
+            minimize_start_time: Учитывать минимизацию времени начала.
+            minimize_total_idle: Учитывать минимизацию суммарного простоя.
+            minimize_max_gap: Учитывать минимизацию максимального промежутка.
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            top_k: Количество лучших окон в результате.
+            workers: Количество процессов для поиска по частям диапазона дат
+                (1 - в текущем процессе, 0 - по числу ядер).
+            reference_time: Время отсчета для оценки начала окна
+                (по умолчанию начало рабочего времени первого дня).
+
+        Returns:
+            List[Window]: Окна, отсортированные по убыванию оценки.
+        """
         try:
             self.logger.info(f"Поиск окна с {start_date} по {end_date} для участников: {participants}")
-            if not participants or required_duration <= 0 or earliest_start_time >= latest_end_time:
+            if not participants or required_duration <= 0 or earliest_start_time >= latest_end_time or top_k < 1:
                 self.logger.warning("Некорректные входные параметры")
-                return None
+                return []
 
             # Загрузка временных слотов
             for participant in participants:
-                self.load_time_slots(participant)
-
-            possible_windows = []
-            if maximize_participants and len(participants) > 1:
-                for r in range(len(participants), 0, -1):
-                    for subset in combinations(participants, r):
-                        subset = set(subset)
-                        windows = self._find_windows_for_subset(
-                            subset, required_duration, start_date, end_date,
-                            earliest_start_time, latest_end_time, min_gap_hours,
-                            include_holidays, include_weekends
-                        )
-                        possible_windows.extend(windows)
-            else:
-                windows = self._find_windows_for_subset(
-                    set(participants), required_duration, start_date, end_date,
-                    earliest_start_time, latest_end_time, min_gap_hours,
-                    include_holidays, include_weekends
+                self.load_slot_store(participant)
+
+            now = reference_time or datetime.combine(start_date, earliest_start_time)
+            if self._use_parallel_search(start_date, end_date, workers):
+                search_kwargs = {
+                    "required_duration": required_duration,
+                    "participants": participants,
+                    "earliest_start_time": earliest_start_time,
+                    "latest_end_time": latest_end_time,
+                    "min_gap_hours": min_gap_hours,
+                    "maximize_participants": maximize_participants,
+                    "minimize_start_time": minimize_start_time,
+                    "minimize_total_idle": minimize_total_idle,
+                    "minimize_max_gap": minimize_max_gap,
+                    "include_holidays": include_holidays,
+                    "include_weekends": include_weekends,
+                    "weight_participants": weight_participants,
+                    "weight_start_time": weight_start_time,
+                    "weight_total_idle": weight_total_idle,
+                    "weight_max_gap": weight_max_gap,
+                    "top_k": top_k,
+                    "reference_time": now
+                }
+                partial_results = run_parallel_search(
+                    self, "common_window", search_kwargs, participants, start_date, end_date, workers
                 )
-                possible_windows.extend(windows)
+                return self._log_common_result(self._merge_common_results(
+                    partial_results, participants, maximize_participants, top_k
+                ))
 
-            if not possible_windows:
-                self.logger.info("Общее окно не найдено")
-                return None
+            ranking = WindowRanking(top_k)
 
-            now = datetime.combine(start_date, earliest_start_time)
-            best_window = max(
-                possible_windows,
-                key=lambda w: self._score_window(
-                    w, now, participants, maximize_participants,
-                    minimize_start_time, minimize_total_idle, minimize_max_gap, earliest_start_time, latest_end_time,
+            def upper_bound(subset_size: int, window_start: datetime) -> float:
+                return self._score_upper_bound(
+                    subset_size, window_start, now, participants, maximize_participants,
+                    minimize_start_time, minimize_total_idle, minimize_max_gap,
                     weight_participants, weight_start_time, weight_total_idle, weight_max_gap
                 )
-            )
 
-            self.logger.info(f"Найдено окно: {best_window.start} - {best_window.end} для участников: {best_window.participants}")
-            return best_window
+            if maximize_participants and len(participants) > 1:
+                subsets = (set(subset) for r in range(len(participants), 0, -1)
+                           for subset in combinations(participants, r))
+            else:
+                subsets = iter([set(participants)])
+
+            for subset in subsets:
+                # Подмножества идут по убыванию размера: если это не может улучшить результат,
+                # то и все следующие тоже
+                if not ranking.can_improve(upper_bound(len(subset), now)):
+                    break
+
+                for window in self._iter_windows_for_subset(
+                    subset, required_duration, start_date, end_date,
+                    earliest_start_time, latest_end_time, min_gap_hours,
+                    include_holidays, include_weekends,
+                    should_stop=lambda t, size=len(subset): not ranking.can_improve(upper_bound(size, t))
+                ):
+                    scoring_started = perf_counter() if self.timer.enabled else 0.0
+                    ranking.offer(window, self._score_window(
+                        window, now, participants, maximize_participants,
+                        minimize_start_time, minimize_total_idle, minimize_max_gap, earliest_start_time, latest_end_time,
+                        weight_participants, weight_start_time, weight_total_idle, weight_max_gap
+                    ))
+                    if self.timer.enabled:
+                        self.timer.add("scoring", perf_counter() - scoring_started)
+            return self._log_common_result(ranking.results())
 
         except Exception as e:
             self.logger.error(f"Ошибка при поиске окна: {e}")
-            return None
+            return []
+
+    def _log_common_result(self, best_windows: List[Window]) -> List[Window]:
+        """Логирует результат поиска общего окна и возвращает его."""
+        if not best_windows:
+            self.logger.info("Общее окно не найдено")
+            return []
+        best_window = best_windows[0]
+        self.logger.info(f"Найдено окно: {best_window.start} - {best_window.end} для участников: {best_window.participants}")
+        return best_windows
+
+    def _log_split_result(self, best_split_windows: List[Window]) -> List[Window]:
+        """Логирует результат поиска сплит-окна и возвращает его."""
+        if not best_split_windows:
+            self.logger.info("Сплит-окно не найдено")
+            return []
+        best_split_window = best_split_windows[0]
+        self.logger.info(f"Найдено сплит-окно: {best_split_window.start} - {best_split_window.end} для участников: {best_split_window.participants}")
+        return best_split_windows
+
+    def _merge_split_results(self, partial_results: List[List[Window]], top_k: int) -> List[Window]:
+        """
+        Сливает лучшие сплит-окна частей диапазона, идущих в порядке дат.
+
+        Args:
+            partial_results: Оценённые окна каждой части.
+            top_k: Количество лучших окон в результате.
+
+        Returns:
+            List[Window]: Окна, отсортированные по убыванию оценки.
+        """
+        # Порядок частей совпадает с порядком дней, поэтому устойчивая сортировка
+        # сохраняет приоритет более раннего кандидата при равной оценке
+        return sorted((w for windows in partial_results for w in windows), key=lambda w: -w.score)[:top_k]
+
+    def _merge_common_results(self, partial_results: List[List[Window]], participants: List[str],
+                              maximize_participants: bool, top_k: int) -> List[Window]:
+        """
+        Сливает лучшие общие окна частей диапазона, идущих в порядке дат.
+
+        Args:
+            partial_results: Оценённые окна каждой части.
+            participants: Список названий досок участников.
+            maximize_participants: Учитывать максимизацию участников.
+            top_k: Количество лучших окон в результате.
+
+        Returns:
+            List[Window]: Окна, отсортированные по убыванию оценки.
+        """
+        # При последовательном поиске подмножества перебираются по порядку, а окна
+        # внутри подмножества - по времени начала; сортировка воспроизводит этот порядок
+        subset_order = {}
+        if maximize_participants and len(participants) > 1:
+            for r in range(len(participants), 0, -1):
+                for subset in combinations(participants, r):
+                    subset_order.setdefault(frozenset(subset), len(subset_order))
+        return sorted(
+            (w for windows in partial_results for w in windows),
+            key=lambda w: (-w.score, subset_order.get(frozenset(w.participants), 0), w.start)
+        )[:top_k]
+
+    def _use_parallel_search(self, start_date: date, end_date: date, workers: int) -> bool:
+        """Проверяет, нужно ли выполнять поиск в пуле процессов."""
+        return workers != 1 and (end_date - start_date).days > 0
+
+    def export_busy_index(self, participants: List[str]) -> Dict[str, Tuple[array, array]]:
+        """
+        Возвращает компактный индекс занятости участников.
+
+        Для каждого участника - копии массивов int64 хранилища слотов с началами
+        и окончаниями в минутах от эпохи. Индекс дешево сериализуется и передаётся
+        в процессы параллельного поиска без названий и описаний.
+
+        Args:
+            participants: Список названий досок участников.
+
+        Returns:
+            Dict: Словарь участник -> (начала слотов, окончания слотов).
+        """
+        busy_index = {}
+        for participant in participants:
+            store = self._time_slots_cache.get(participant)
+            busy_index[participant] = (array('q', store.starts), array('q', store.ends)) if store else (array('q'), array('q'))
+        return busy_index
+
+    def load_busy_index(self, busy_index: Dict[str, Tuple[array, array]]) -> None:
+        """
+        Заполняет кэш слотов из компактного индекса занятости.
+
+        Args:
+            busy_index: Индекс, полученный из export_busy_index.
+        """
+        for participant, (starts, ends) in busy_index.items():
+            self._time_slots_cache[participant] = SlotStore.from_arrays(participant, starts, ends)
+            self._invalidate_participant(participant)
 
     def _find_windows_for_subset(self, subset: Set[str], required_duration: float,
                                  start_date: date, end_date: date, earliest_start_time: time,
@@ -512,42 +970,480 @@ class ScheduleAnalyzer:
         Returns:
             List[Window]: Список найденных окон.
         """
-        windows = []
-        adjusted_tree = self._build_adjusted_tree(subset, min_gap_hours)
-        current_date = start_date
-
-        while current_date <= end_date:
-            if (not include_holidays and current_date in self.holidays) or \
-               (not include_weekends and current_date.weekday() in self.weekend_days):
-                current_date += timedelta(days=1)
-                continue
-
-            day_start = datetime.combine(current_date, earliest_start_time)
-            day_end = datetime.combine(current_date, latest_end_time)
-
-            t = day_start
-            while t <= day_end:
-                window_end = t + timedelta(hours=required_duration)
-                if window_end < day_end:
-                    if not adjusted_tree.overlap(t, window_end):
-                        window = Window(
-                            start=t,
-                            end=window_end,
-                            duration_hours=required_duration,
-                            window_type=WindowType.COMMON_WINDOW,
-                            description=f"Общее окно для участников: {', '.join(subset)}",
-                            participants=list(subset)
-                        )
-                        windows.append(window)
-                t += timedelta(minutes=min_gap_hours if min_gap_hours else 15)
+        return list(self._iter_windows_for_subset(
+            subset, required_duration, start_date, end_date, earliest_start_time,
+            latest_end_time, min_gap_hours, include_holidays, include_weekends
+        ))
 
-            current_date += timedelta(days=1)
+    def _iter_windows_for_subset(self, subset: Set[str], required_duration: float,
+                                 start_date: date, end_date: date, earliest_start_time: time,
+                                 latest_end_time: time, min_gap_hours: float,
+                                 include_holidays: bool, include_weekends: bool,
+                                 should_stop: Optional[Callable[[datetime], bool]] = None) -> Iterator[Window]:
+        """
+        Лениво генерирует окна строго заданной продолжительности для подмножества участников.
 
-        return windows
+        Окна выдаются в порядке возрастания времени начала.
 
-    def _score_window(self, window: Window, time: datetime, participants: List[str],
-                      maximize_participants: bool, minimize_start_time: bool,
-                      minimize_total_idle: bool, minimize_max_gap: bool,
+        Args:
+            subset: Множество участников.
+            required_duration: Точная продолжительность окна в часах.
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            should_stop: Функция, возвращающая True, если окна, начинающиеся не раньше
+                переданного времени, уже не нужны. Проверяется перед каждым кандидатом.
+
+        Yields:
+            Window: Найденное окно.
+        """
+        adjusted_tree = self._build_adjusted_tree(subset, min_gap_hours)
+        earliest_us = _time_of_day_microseconds(earliest_start_time)
+        latest_us = _time_of_day_microseconds(latest_end_time)
+        duration_us = _hours_to_microseconds(required_duration)
+        step_us = _minutes_to_microseconds(min_gap_hours if min_gap_hours else 15)
+        excluded_days = self.calendar.excluded_days(start_date, end_date, include_holidays, include_weekends)
+        current_date = start_date
+        candidates = tree_queries = 0
+
+        try:
+            while current_date <= end_date:
+                if current_date in excluded_days:
+                    current_date += timedelta(days=1)
+                    continue
+
+                # Кандидаты перебираются в микросекундах от эпохи
+                day_base = to_epoch_microseconds(datetime.combine(current_date, time()))
+                day_end = day_base + latest_us
+
+                t = day_base + earliest_us
+                while t <= day_end:
+                    if should_stop and should_stop(from_epoch_microseconds(t)):
+                        return
+                    candidates += 1
+                    window_end = t + duration_us
+                    if window_end < day_end:
+                        tree_queries += 1
+                        if not adjusted_tree.overlap(t, window_end):
+                            yield Window(
+                                start=from_epoch_microseconds(t),
+                                end=from_epoch_microseconds(window_end),
+                                duration_hours=required_duration,
+                                window_type=WindowType.COMMON_WINDOW,
+                                description=f"Общее окно для участников: {', '.join(subset)}",
+                                participants=list(subset)
+                            )
+                    t += step_us
+
+                current_date += timedelta(days=1)
+        finally:
+            self.timer.count("candidates", candidates)
+            self.timer.count("tree_queries", tree_queries)
+
+    def _candidate_grid(self, day: date, earliest_start_time: time, latest_end_time: time,
+                        duration_us: int, step_us: int) -> Tuple[int, int]:
+        """
+        Возвращает сетку начал окон дня, как при переборе в _iter_windows_for_subset.
+
+        Кандидат k начинается в grid_start + k * step_us и заканчивается строго
+        раньше конца рабочего времени.
+
+        Args:
+            day: День.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            duration_us: Продолжительность окна (микросекунды).
+            step_us: Шаг сетки (микросекунды).
+
+        Returns:
+            Tuple[int, int]: Начало сетки (микросекунды от эпохи) и количество кандидатов.
+        """
+        day_base = to_epoch_microseconds(datetime.combine(day, time()))
+        grid_start = day_base + _time_of_day_microseconds(earliest_start_time)
+        span = day_base + _time_of_day_microseconds(latest_end_time) - duration_us - grid_start
+        return grid_start, (span + step_us - 1) // step_us if span > 0 else 0
+
+    def _conflict_ranges(self, participant: str, min_gap_hours: float, grid_start: int, count: int,
+                         duration_us: int, step_us: int) -> List[Tuple[int, int]]:
+        """
+        Возвращает диапазоны индексов кандидатов сетки, пересекающихся с занятостью участника.
+
+        Кандидат k конфликтует с интервалом [s, e), если s - duration < t_k < e,
+        поэтому каждый интервал занятости даёт один непрерывный диапазон индексов.
+
+        Args:
+            participant: Название доски участника.
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            grid_start: Начало сетки (микросекунды от эпохи).
+            count: Количество кандидатов сетки.
+            duration_us: Продолжительность окна (микросекунды).
+            step_us: Шаг сетки (микросекунды).
+
+        Returns:
+            List[Tuple[int, int]]: Непересекающиеся диапазоны (включительно) по возрастанию.
+        """
+        ranges = []
+        if count <= 0:
+            return ranges
+        intervals = self._get_busy_intervals(participant, min_gap_hours)
+        grid_end = grid_start + (count - 1) * step_us + duration_us
+        i = bisect_right(intervals, grid_start, key=lambda interval: interval[1])
+        while i < len(intervals) and intervals[i][0] < grid_end:
+            start, end = intervals[i]
+            i += 1
+            lo = max(0, (start - duration_us - grid_start) // step_us + 1)
+            hi = min(count - 1, -((grid_start - end) // step_us) - 1)
+            if lo > hi:
+                continue
+            if ranges and lo <= ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], max(ranges[-1][1], hi))
+            else:
+                ranges.append((lo, hi))
+        return ranges
+
+    def _conflict_mask(self, participants: List[str], min_gap_hours: float, grid_start: int, count: int,
+                       duration_us: int, step_us: int) -> int:
+        """Возвращает битовую маску кандидатов сетки, конфликтующих хотя бы с одним участником."""
+        mask = 0
+        for participant in participants:
+            for lo, hi in self._conflict_ranges(participant, min_gap_hours, grid_start, count, duration_us, step_us):
+                mask |= ((1 << (hi - lo + 1)) - 1) << lo
+        return mask
+
+    def find_min_conflict_windows(self, start_date: date, end_date: date, required_duration: float,
+                                  participants: List[str], earliest_start_time: time = time(hour=7, minute=0),
+                                  latest_end_time: time = time(hour=23, minute=0), min_gap_hours: float = 0.0,
+                                  include_holidays: bool = False, include_weekends: bool = False,
+                                  participant_weights: Optional[Dict[str, float]] = None,
+                                  top_k: int = DEFAULT_TOP_K) -> List[Window]:
+        """
+        Находит окна с наименьшим (взвешенным) числом занятых участников.
+
+        Альтернатива перебору подмножеств участников, когда общего окна для всех
+        нет: для каждого дня диапазоны конфликтов участников накладываются на
+        разностный массив по сетке кандидатов, и один линейный проход даёт вес
+        конфликтов каждого кандидата. Окна без конфликтов идут первыми, при равном
+        весе предпочтение отдаётся более раннему окну.
+
+        Args:
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            required_duration: Точная продолжительность окна в часах.
+            participants: Список названий досок участников.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            participant_weights: Вес конфликта для участников (по умолчанию 1.0).
+            top_k: Количество лучших окон в результате.
+
+        Returns:
+            List[Window]: Окна со свободными участниками, отсортированные по возрастанию
+                веса конфликтов (оценка окна - вес конфликтов со знаком минус).
+        """
+        try:
+            self.logger.info(f"Поиск окна с минимумом конфликтов с {start_date} по {end_date} для участников: {participants}")
+            if not participants or required_duration <= 0 or earliest_start_time >= latest_end_time or top_k < 1:
+                self.logger.warning("Некорректные входные параметры")
+                return []
+
+            for participant in participants:
+                self.load_slot_store(participant)
+
+            weights = participant_weights or {}
+            duration_us = _hours_to_microseconds(required_duration)
+            step_us = _minutes_to_microseconds(min_gap_hours if min_gap_hours else 15)
+            excluded_days = self.calendar.excluded_days(start_date, end_date, include_holidays, include_weekends)
+            ranking = WindowRanking(top_k)
+
+            current_date = start_date
+            while current_date <= end_date:
+                if current_date in excluded_days:
+                    current_date += timedelta(days=1)
+                    continue
+
+                grid_start, count = self._candidate_grid(
+                    current_date, earliest_start_time, latest_end_time, duration_us, step_us
+                )
+                if count <= 0:
+                    current_date += timedelta(days=1)
+                    continue
+
+                # Разностный массив покрытия сетки конфликтами участников
+                coverage = [0.0] * (count + 1)
+                day_ranges = []
+                for participant in participants:
+                    ranges = self._conflict_ranges(participant, min_gap_hours, grid_start, count, duration_us, step_us)
+                    weight = weights.get(participant, 1.0)
+                    for lo, hi in ranges:
+                        coverage[lo] += weight
+                        coverage[hi + 1] -= weight
+                    day_ranges.append((participant, ranges))
+
+                conflict_weight = 0.0
+                for k in range(count):
+                    conflict_weight += coverage[k]
+                    score = 0.0 - round(conflict_weight, 9)
+                    if not ranking.can_improve(score):
+                        continue
+
+                    busy = {participant for participant, ranges in day_ranges
+                            if self._range_contains(ranges, k)}
+                    free = [participant for participant in participants if participant not in busy]
+                    if not free:
+                        continue
+                    window_start = grid_start + k * step_us
+                    description = f"Окно с минимумом конфликтов для участников: {', '.join(free)}"
+                    if busy:
+                        description += f"; заняты: {', '.join(p for p in participants if p in busy)}"
+                    ranking.offer(Window(
+                        start=from_epoch_microseconds(window_start),
+                        end=from_epoch_microseconds(window_start + duration_us),
+                        duration_hours=required_duration,
+                        window_type=WindowType.COMMON_WINDOW,
+                        description=description,
+                        participants=free
+                    ), score)
+
+                current_date += timedelta(days=1)
+
+            return self._log_common_result(ranking.results())
+
+        except Exception as e:
+            self.logger.error(f"Ошибка при поиске окна с минимумом конфликтов: {e}")
+            return []
+
+    @staticmethod
+    def _range_contains(ranges: List[Tuple[int, int]], index: int) -> bool:
+        """Проверяет, попадает ли индекс в один из упорядоченных диапазонов (включительно)."""
+        i = bisect_right(ranges, index, key=lambda r: r[0]) - 1
+        return i >= 0 and ranges[i][1] >= index
+
+    def find_recurring_windows(self, start_date: date, end_date: date, required_duration: float,
+                               participants: List[str], earliest_start_time: time = time(hour=7, minute=0),
+                               latest_end_time: time = time(hour=23, minute=0), min_gap_hours: float = 0.0,
+                               include_holidays: bool = False, include_weekends: bool = False,
+                               top_k: int = DEFAULT_TOP_K) -> List[Window]:
+        """
+        Находит еженедельные окна: интервалы дня недели, свободные у всех участников
+        в каждую неделю диапазона.
+
+        Дни раскладываются по неделям и дням недели так же, как в расписании парсера
+        (неделя начинается с понедельника, номер недели считается от недели начала
+        диапазона). За один проход по дням для каждого дня строится битовая маска
+        занятых кандидатов сетки (как у общего окна), маски одного дня недели
+        объединяются по всем неделям. Нулевые биты - начала окон, свободных каждую
+        неделю; подряд идущие начала сливаются в один интервал. Пропущенные
+        праздничные дни не мешают еженедельному окну.
+
+        Args:
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            required_duration: Минимальная продолжительность окна в часах.
+            participants: Список названий досок участников.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями (часы).
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            top_k: Количество лучших окон в результате.
+
+        Returns:
+            List[Window]: Окна первой недели, отсортированные по убыванию оценки
+                (продолжительности окна в часах), при равной оценке - по дню недели
+                и времени; days_count - количество недель, в которые окно свободно.
+        """
+        try:
+            self.logger.info(f"Поиск еженедельного окна с {start_date} по {end_date} для участников: {participants}")
+            if not participants or required_duration <= 0 or earliest_start_time >= latest_end_time or top_k < 1:
+                self.logger.warning("Некорректные входные параметры для еженедельного окна")
+                return []
+
+            for participant in participants:
+                self.load_slot_store(participant)
+
+            duration_us = _hours_to_microseconds(required_duration)
+            step_us = _minutes_to_microseconds(min_gap_hours if min_gap_hours else 15)
+            excluded_days = self.calendar.excluded_days(start_date, end_date, include_holidays, include_weekends)
+            first_monday = start_date - timedelta(days=start_date.weekday())
+
+            # День недели -> объединённая маска занятости, сетка первого дня и номера недель
+            weekday_masks: Dict[int, int] = {}
+            weekday_grids: Dict[int, Tuple[int, int]] = {}
+            weekday_weeks: Dict[int, List[int]] = {}
+            current_date = start_date
+            while current_date <= end_date:
+                if current_date not in excluded_days:
+                    grid_start, count = self._candidate_grid(
+                        current_date, earliest_start_time, latest_end_time, duration_us, step_us
+                    )
+                    weekday = current_date.weekday()
+                    week = (current_date - first_monday).days // 7 + 1
+                    weekday_grids.setdefault(weekday, (grid_start, count))
+                    weekday_masks[weekday] = weekday_masks.get(weekday, 0) | self._conflict_mask(
+                        participants, min_gap_hours, grid_start, count, duration_us, step_us
+                    )
+                    weekday_weeks.setdefault(weekday, []).append(week)
+                current_date += timedelta(days=1)
+
+            windows = []
+            for weekday in sorted(weekday_masks):
+                mask = weekday_masks[weekday]
+                grid_start, count = weekday_grids[weekday]
+                weeks = weekday_weeks[weekday]
+                weeks_label = f"{weeks[0]}-{weeks[-1]}" if len(weeks) > 1 else str(weeks[0])
+                k = 0
+                while k < count:
+                    if mask >> k & 1:
+                        k += 1
+                        continue
+                    run_start = k
+                    while k < count and not mask >> k & 1:
+                        k += 1
+                    window_start = from_epoch_microseconds(grid_start + run_start * step_us)
+                    window_end = from_epoch_microseconds(grid_start + (k - 1) * step_us + duration_us)
+                    duration_hours = (window_end - window_start).total_seconds() / 3600
+                    windows.append(Window(
+                        start=window_start,
+                        end=window_end,
+                        duration_hours=duration_hours,
+                        window_type=WindowType.RECURRING_WINDOW,
+                        description=(
+                            f"Еженедельное окно: {WEEKDAY_NAMES[weekday]} "
+                            f"{window_start.strftime('%H:%M')}-{window_end.strftime('%H:%M')}, "
+                            f"недели {weeks_label} (всего {len(weeks)}), участники: {', '.join(participants)}"
+                        ),
+                        participants=list(participants),
+                        days_count=len(weeks),
+                        score=duration_hours
+                    ))
+
+            self.logger.info(f"Найдено еженедельных окон: {len(windows)}")
+            return sorted(windows, key=lambda w: -w.score)[:top_k]
+
+        except Exception as e:
+            self.logger.error(f"Ошибка при поиске еженедельного окна: {e}")
+            return []
+
+    def find_room_windows(self, start_date: date, end_date: date, required_duration: float,
+                          participants: List[str], rooms: List[str],
+                          earliest_start_time: time = time(hour=7, minute=0),
+                          latest_end_time: time = time(hour=23, minute=0), min_gap_hours: float = 0.0,
+                          minimize_start_time: bool = True, minimize_total_idle: bool = True,
+                          minimize_max_gap: bool = True, include_holidays: bool = False,
+                          include_weekends: bool = False, weight_start_time: float = 1.0,
+                          weight_total_idle: float = 1.0, weight_max_gap: float = 1.0,
+                          top_k: int = DEFAULT_TOP_K) -> List[Window]:
+        """
+        Находит общие окна всех участников вместе со свободной аудиторией.
+
+        Для каждого дня строится индекс занятости аудиторий по кандидатам сетки:
+        элемент k - битовая маска аудиторий, занятых в окне кандидата k. Свободные
+        аудитории кандидата получаются одной битовой операцией, без отдельного
+        поиска по каждой аудитории. Расписания аудиторий загружаются как доски
+        (например, расписания типа room из парсера).
+
+        Args:
+            start_date: Начальная дата поиска.
+            end_date: Конечная дата поиска.
+            required_duration: Точная продолжительность окна в часах.
+            participants: Список названий досок участников.
+            rooms: Список названий досок (расписаний) аудиторий в порядке предпочтения.
+            earliest_start_time: Начало рабочего времени (время).
+            latest_end_time: Конец рабочего времени (время).
+            min_gap_hours: Минимальный промежуток между занятиями участников (часы).
+            minimize_start_time: Учитывать минимизацию времени начала.
+            minimize_total_idle: Учитывать минимизацию суммарного простоя.
+            minimize_max_gap: Учитывать минимизацию максимального промежутка.
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+            weight_start_time: Вес критерия времени начала.
+            weight_total_idle: Вес критерия суммарного простоя.
+            weight_max_gap: Вес критерия максимального промежутка.
+            top_k: Количество лучших окон в результате.
+
+        Returns:
+            List[Window]: Окна с заполненным полем room (первая свободная аудитория
+                из пула), отсортированные по убыванию оценки.
+        """
+        try:
+            self.logger.info(f"Поиск окна с аудиторией с {start_date} по {end_date} для участников: {participants}")
+            if not participants or not rooms or required_duration <= 0 or \
+               earliest_start_time >= latest_end_time or top_k < 1:
+                self.logger.warning("Некорректные входные параметры для поиска аудитории")
+                return []
+
+            for board_name in list(participants) + list(rooms):
+                self.load_slot_store(board_name)
+
+            now = datetime.combine(start_date, earliest_start_time)
+            duration_us = _hours_to_microseconds(required_duration)
+            step_us = _minutes_to_microseconds(min_gap_hours if min_gap_hours else 15)
+            excluded_days = self.calendar.excluded_days(start_date, end_date, include_holidays, include_weekends)
+            all_rooms = (1 << len(rooms)) - 1
+            ranking = WindowRanking(top_k)
+
+            current_date = start_date
+            while current_date <= end_date:
+                if current_date in excluded_days:
+                    current_date += timedelta(days=1)
+                    continue
+
+                grid_start, count = self._candidate_grid(
+                    current_date, earliest_start_time, latest_end_time, duration_us, step_us
+                )
+                busy_mask = self._conflict_mask(participants, min_gap_hours, grid_start, count, duration_us, step_us)
+
+                # Индекс занятости аудиторий: кандидат -> маска занятых аудиторий
+                room_busy = [0] * count
+                for room_index, room in enumerate(rooms):
+                    room_bit = 1 << room_index
+                    for lo, hi in self._conflict_ranges(room, 0.0, grid_start, count, duration_us, step_us):
+                        for k in range(lo, hi + 1):
+                            room_busy[k] |= room_bit
+
+                for k in range(count):
+                    free_rooms = all_rooms & ~room_busy[k]
+                    if busy_mask >> k & 1 or not free_rooms:
+                        continue
+                    free_room_names = [room for i, room in enumerate(rooms) if free_rooms >> i & 1]
+                    window_start = grid_start + k * step_us
+                    window = Window(
+                        start=from_epoch_microseconds(window_start),
+                        end=from_epoch_microseconds(window_start + duration_us),
+                        duration_hours=required_duration,
+                        window_type=WindowType.COMMON_WINDOW,
+                        description=(
+                            f"Общее окно для участников: {', '.join(participants)}; "
+                            f"свободные аудитории: {', '.join(free_room_names)}"
+                        ),
+                        participants=list(participants),
+                        room=free_room_names[0]
+                    )
+                    ranking.offer(window, self._score_window(
+                        window, now, participants, False,
+                        minimize_start_time, minimize_total_idle, minimize_max_gap, earliest_start_time, latest_end_time,
+                        0.0, weight_start_time, weight_total_idle, weight_max_gap
+                    ))
+
+                current_date += timedelta(days=1)
+
+            best_windows = ranking.results()
+            self.logger.info(f"Найдено окон с аудиторией: {len(best_windows)}")
+            return best_windows
+
+        except Exception as e:
+            self.logger.error(f"Ошибка при поиске окна с аудиторией: {e}")
+            return []
+
+    def _score_window(self, window: Window, time: datetime, participants: List[str],
+                      maximize_participants: bool, minimize_start_time: bool,
+                      minimize_total_idle: bool, minimize_max_gap: bool,
                       earliest_start_time: time, latest_end_time: time,
                       weight_participants: float = 1.0, weight_start_time: float = 1.0,
                       weight_total_idle: float = 1.0, weight_max_gap: float = 1.0) -> float:
@@ -592,70 +1488,164 @@ class ScheduleAnalyzer:
             start_time_score = 1.0 - min(start_delay / max_start_delay_hours, 1.0)
             score += start_time_score * weight_start_time
 
-        if minimize_total_idle:
-            total_idle = sum(
-                (window.start - self._get_last_slot_end_before(p, window.start,
-                                                               earliest_start_time)).total_seconds() / 3600 +
-                (self._get_next_slot_start_after(p, window.end, latest_end_time) - window.end).total_seconds() / 3600
-                for p in window.participants
-            )
-            total_idle_score = 1.0 - min(total_idle / (max_idle_per_participant * len(window.participants)), 1.0)
-            score += total_idle_score * weight_total_idle
-
-        if minimize_max_gap:
-            max_gap = max(
-                max(
-                    (window.start - self._get_last_slot_end_before(p, window.start,
-                                                                   earliest_start_time)).total_seconds() / 3600,
-                    (self._get_next_slot_start_after(p, window.end,
-                                                     latest_end_time) - window.end).total_seconds() / 3600
-                )
-                for p in window.participants
-            )
-            max_gap_score = 1.0 - min(max_gap / max_possible_gap, 1.0)
-            score += max_gap_score * weight_max_gap
+        if (minimize_total_idle or minimize_max_gap) and window.participants:
+            # Простой до и после окна считается один раз на участника
+            gaps = [self._get_participant_gaps(p, window.start, window.end, earliest_start_time, latest_end_time)
+                    for p in window.participants]
+
+            if minimize_total_idle:
+                total_idle = sum(before + after for before, after in gaps)
+                total_idle_score = 1.0 - min(total_idle / (max_idle_per_participant * len(window.participants)), 1.0)
+                score += total_idle_score * weight_total_idle
+
+            if minimize_max_gap:
+                max_gap = max(max(before, after) for before, after in gaps)
+                max_gap_score = 1.0 - min(max_gap / max_possible_gap, 1.0)
+                score += max_gap_score * weight_max_gap
 
         return score
 
-    def _get_last_slot_end_before(self, participant: str, before_time: datetime, earliest_start_time: time) -> datetime:
+    def _score_upper_bound(self, subset_size: int, window_start: datetime, time: datetime,
+                           participants: List[str], maximize_participants: bool, minimize_start_time: bool,
+                           minimize_total_idle: bool, minimize_max_gap: bool,
+                           weight_participants: float = 1.0, weight_start_time: float = 1.0,
+                           weight_total_idle: float = 1.0, weight_max_gap: float = 1.0) -> float:
         """
-        Находит время окончания последнего слота перед указанным временем в тот же день.
+        Оптимистичная оценка сверху для окон подмножества участников.
+
+        Повторяет вычисления _score_window, подставляя для простоя и промежутка
+        наилучшие значения. Оценка не убывает при уменьшении window_start и
+        увеличении subset_size, поэтому годится для отсечения дней и подмножеств.
+
+        Args:
+            subset_size: Количество участников в окне.
+            window_start: Самое раннее возможное начало окна.
+            time: Время отсчета.
+            participants: Список всех возможных участников.
+            maximize_participants: Учитывать количество участников.
+            minimize_start_time: Учитывать время начала.
+            minimize_total_idle: Учитывать суммарное время простоя.
+            minimize_max_gap: Учитывать максимальный промежуток.
+            weight_participants: Вес критерия количества участников.
+            weight_start_time: Вес критерия времени начала.
+            weight_total_idle: Вес критерия суммарного простоя.
+            weight_max_gap: Вес критерия максимального промежутка.
+
+        Returns:
+            float: Оценка сверху (inf, если отсечение невозможно).
+        """
+        if min(weight_participants, weight_start_time, weight_total_idle, weight_max_gap) < 0:
+            return float('inf')
+
+        score = 0.0
+        max_possible_participants = len(participants)
+        max_start_delay_hours = 24.0
+
+        if maximize_participants and max_possible_participants > 0:
+            score += subset_size / max_possible_participants * weight_participants
+
+        if minimize_start_time:
+            start_delay = (window_start - time).total_seconds() / 3600
+            score += (1.0 - min(start_delay / max_start_delay_hours, 1.0)) * weight_start_time
+
+        if subset_size > 0:
+            if minimize_total_idle:
+                score += 1.0 * weight_total_idle
+            if minimize_max_gap:
+                score += 1.0 * weight_max_gap
+
+        return score
+
+    def _get_day_index(self, participant: str) -> Dict[int, Tuple[List[int], List[int]]]:
+        """
+        Возвращает индекс слотов участника по дням для бинарного поиска.
+
+        Начала слотов группируются по дню начала, окончания - по дню окончания
+        (номер дня от эпохи), оба списка минут от эпохи внутри дня отсортированы.
+
+        Args:
+            participant: Название доски участника.
+
+        Returns:
+            Dict: Словарь номер дня -> (начала слотов, окончания слотов).
+        """
+        day_index = self._day_index_cache.get(participant)
+        if day_index is None:
+            day_index = {}
+            store = self._time_slots_cache.get(participant)
+            for start, end in zip(store.starts, store.ends) if store else ():
+                day_index.setdefault(start // 1440, ([], []))[0].append(start)
+                day_index.setdefault(end // 1440, ([], []))[1].append(end)
+            for starts, ends in day_index.values():
+                starts.sort()
+                ends.sort()
+            self._day_index_cache[participant] = day_index
+        return day_index
+
+    def _get_participant_gaps(self, participant: str, start: datetime, end: datetime,
+                              earliest_start_time: time, latest_end_time: time) -> Tuple[float, float]:
+        """
+        Вычисляет простой участника до и после окна в часах.
 
         Args:
             participant: Название доски участника.
-            before_time: Время, до которого искать слот.
+            start: Начало окна.
+            end: Конец окна.
             earliest_start_time: Начало рабочего дня (время).
+            latest_end_time: Конец рабочего дня (время).
 
         Returns:
-            datetime: Время окончания последнего слота или начало рабочего дня.
+            Tuple[float, float]: Простой до окна и после окна в часах.
         """
-        day = before_time.date()
-        slots = self._time_slots_cache.get(participant, [])
-        past_slots = [slot for slot in slots if slot.end <= before_time and slot.end.date() == day]
-        if past_slots:
-            return max(slot.end for slot in past_slots)
-        else:
-            return datetime.combine(day, earliest_start_time)
+        start_us = to_epoch_microseconds(start)
+        end_us = to_epoch_microseconds(end)
+        before_us = start_us - self._get_last_slot_end_before(participant, start_us, earliest_start_time)
+        after_us = self._get_next_slot_start_after(participant, end_us, latest_end_time) - end_us
+        return before_us / _US_PER_SECOND / 3600, after_us / _US_PER_SECOND / 3600
+
+    def _get_last_slot_end_before(self, participant: str, before_time: int, earliest_start_time: time) -> int:
+        """
+        Находит время окончания последнего слота перед указанным временем в тот же день.
 
-    def _get_next_slot_start_after(self, participant: str, after_time: datetime, latest_end_time: time) -> datetime:
+        Args:
+            participant: Название доски участника.
+            before_time: Время (микросекунды от эпохи), до которого искать слот.
+            earliest_start_time: Начало рабочего дня (время).
+
+        Returns:
+            int: Окончание последнего слота или начало рабочего дня (микросекунды от эпохи).
+        """
+        day = before_time // _US_PER_DAY
+        day_slots = self._get_day_index(participant).get(day)
+        if day_slots:
+            ends = day_slots[1]
+            # Окончание в минутах не позже before_time <=> не позже floor(before_time)
+            i = bisect_right(ends, before_time // _US_PER_MINUTE)
+            if i > 0:
+                return ends[i - 1] * _US_PER_MINUTE
+        return day * _US_PER_DAY + _time_of_day_microseconds(earliest_start_time)
+
+    def _get_next_slot_start_after(self, participant: str, after_time: int, latest_end_time: time) -> int:
         """
         Находит время начала ближайшего слота после указанного времени в тот же день.
 
         Args:
             participant: Название доски участника.
-            after_time: Время, после которого искать слот.
+            after_time: Время (микросекунды от эпохи), после которого искать слот.
             latest_end_time: Конец рабочего дня (время).
 
         Returns:
-            datetime: Время начала ближайшего слота или конец рабочего дня.
+            int: Начало ближайшего слота или конец рабочего дня (микросекунды от эпохи).
         """
-        day = after_time.date()
-        slots = self._time_slots_cache.get(participant, [])
-        future_slots = [slot for slot in slots if slot.start >= after_time and slot.start.date() == day]
-        if future_slots:
-            return min(slot.start for slot in future_slots)
-        else:
-            return datetime.combine(day, latest_end_time)
+        day = after_time // _US_PER_DAY
+        day_slots = self._get_day_index(participant).get(day)
+        if day_slots:
+            starts = day_slots[0]
+            # Начало в минутах не раньше after_time <=> не раньше ceil(after_time)
+            i = bisect_left(starts, -(-after_time // _US_PER_MINUTE))
+            if i < len(starts):
+                return starts[i] * _US_PER_MINUTE
+        return day * _US_PER_DAY + _time_of_day_microseconds(latest_end_time)
 
     def create_analysis_board(self) -> bool:
         """
@@ -694,15 +1684,10 @@ class ScheduleAnalyzer:
             task_data = window.to_task_data()
             task_data["column_id"] = column_id
 
-            create_response = self.integrator._api_call_with_retry(self.integrator.client.tasks.create, **task_data)
-            task_id = create_response.get('id')
-            if not task_id:
+            if not self.integrator.create_task(**task_data):
                 self.logger.error("Не получен ID созданной задачи для окна")
                 return False
 
-            # Получаем полные данные задачи для кэша
-            task_data = self.integrator._api_call_with_retry(self.integrator.client.tasks.get, id=task_id)
-            self.integrator._tasks_cache[task_id] = task_data
             self.logger.info(f"Создана задача для окна: {window.start} - {window.end}")
             return True
 
@@ -710,91 +1695,349 @@ class ScheduleAnalyzer:
             self.logger.error(f"Ошибка при создании задачи для окна: {e}")
             return False
 
-    def analyze_schedule(self, algorithms: Optional[List[Dict[str, Any]]] = None, board_names: Optional[List[str]] = None) -> List[Window]:
+    def run_algorithm(self, algo_config: Dict[str, Any], board_names: Optional[List[str]] = None) -> List[Window]:
+        """
+        Выполняет один алгоритм поиска окон без записи результатов в YouGile.
+
+        Args:
+            algo_config: Конфигурация алгоритма.
+            board_names: Участники по умолчанию, если они не заданы в конфигурации.
+
+        Returns:
+            List[Window]: Найденные окна, отсортированные по убыванию оценки.
+        """
+        algo_type = algo_config.get("type")
+        if algo_type == "split_window":
+            return self.find_split_windows(
+                start_date=algo_config.get("start_date"),
+                end_date=algo_config.get("end_date"),
+                total_duration=algo_config.get("total_duration", 4.0),
+                min_segment_duration=algo_config.get("min_segment_duration", 0.5),
+                max_segments=algo_config.get("max_segments", 5),
+                participants=algo_config.get("participants", board_names),
+                earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
+                latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
+                min_gap_hours=algo_config.get("min_gap_hours", 0.0),
+                maximize_participants=algo_config.get("maximize_participants", True),
+                minimize_start_time=algo_config.get("minimize_start_time", True),
+                minimize_total_idle=algo_config.get("minimize_total_idle", True),
+                minimize_max_gap=algo_config.get("minimize_max_gap", True),
+                include_holidays=algo_config.get("include_holidays", False),
+                include_weekends=algo_config.get("include_weekends", False),
+                weight_participants=algo_config.get("weight_participants", 1.0),
+                weight_start_time=algo_config.get("weight_start_time", 1.0),
+                weight_total_idle=algo_config.get("weight_total_idle", 1.0),
+                weight_max_gap=algo_config.get("weight_max_gap", 1.0),
+                top_k=algo_config.get("top_k", DEFAULT_TOP_K),
+                workers=algo_config.get("workers", 1),
+                reference_time=algo_config.get("reference_time")
+            )
+        elif algo_type == "common_window":
+            return self.find_common_windows(
+                start_date=algo_config.get("start_date"),
+                end_date=algo_config.get("end_date"),
+                required_duration=algo_config.get("required_duration", 1.0),
+                participants=algo_config.get("participants", board_names),
+                earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
+                latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
+                min_gap_hours=algo_config.get("min_gap_hours", 0.0),
+                maximize_participants=algo_config.get("maximize_participants", True),
+                minimize_start_time=algo_config.get("minimize_start_time", True),
+                minimize_total_idle=algo_config.get("minimize_total_idle", True),
+                minimize_max_gap=algo_config.get("minimize_max_gap", True),
+                include_holidays=algo_config.get("include_holidays", False),
+                include_weekends=algo_config.get("include_weekends", False),
+                weight_participants=algo_config.get("weight_participants", 1.0),
+                weight_start_time=algo_config.get("weight_start_time", 1.0),
+                weight_total_idle=algo_config.get("weight_total_idle", 1.0),
+                weight_max_gap=algo_config.get("weight_max_gap", 1.0),
+                top_k=algo_config.get("top_k", DEFAULT_TOP_K),
+                workers=algo_config.get("workers", 1),
+                reference_time=algo_config.get("reference_time")
+            )
+        elif algo_type == "min_conflict_window":
+            return self.find_min_conflict_windows(
+                start_date=algo_config.get("start_date"),
+                end_date=algo_config.get("end_date"),
+                required_duration=algo_config.get("required_duration", 1.0),
+                participants=algo_config.get("participants", board_names),
+                earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
+                latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
+                min_gap_hours=algo_config.get("min_gap_hours", 0.0),
+                include_holidays=algo_config.get("include_holidays", False),
+                include_weekends=algo_config.get("include_weekends", False),
+                participant_weights=algo_config.get("participant_weights"),
+                top_k=algo_config.get("top_k", DEFAULT_TOP_K)
+            )
+        elif algo_type == "room_window":
+            return self.find_room_windows(
+                start_date=algo_config.get("start_date"),
+                end_date=algo_config.get("end_date"),
+                required_duration=algo_config.get("required_duration", 1.0),
+                participants=algo_config.get("participants", board_names),
+                rooms=algo_config.get("rooms", []),
+                earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
+                latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
+                min_gap_hours=algo_config.get("min_gap_hours", 0.0),
+                minimize_start_time=algo_config.get("minimize_start_time", True),
+                minimize_total_idle=algo_config.get("minimize_total_idle", True),
+                minimize_max_gap=algo_config.get("minimize_max_gap", True),
+                include_holidays=algo_config.get("include_holidays", False),
+                include_weekends=algo_config.get("include_weekends", False),
+                weight_start_time=algo_config.get("weight_start_time", 1.0),
+                weight_total_idle=algo_config.get("weight_total_idle", 1.0),
+                weight_max_gap=algo_config.get("weight_max_gap", 1.0),
+                top_k=algo_config.get("top_k", DEFAULT_TOP_K)
+            )
+        elif algo_type == "recurring_window":
+            return self.find_recurring_windows(
+                start_date=algo_config.get("start_date"),
+                end_date=algo_config.get("end_date"),
+                required_duration=algo_config.get("required_duration", 1.0),
+                participants=algo_config.get("participants", board_names),
+                earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
+                latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
+                min_gap_hours=algo_config.get("min_gap_hours", 0.0),
+                include_holidays=algo_config.get("include_holidays", False),
+                include_weekends=algo_config.get("include_weekends", False),
+                top_k=algo_config.get("top_k", DEFAULT_TOP_K)
+            )
+        self.logger.warning(f"Неизвестный тип алгоритма: {algo_type}")
+        return []
+
+    def analyze_batch(self, algorithms: List[Dict[str, Any]], board_names: Optional[List[str]] = None) -> List[List[Window]]:
+        """
+        Выполняет пакет запросов поиска окон за один проход без записи в YouGile.
+
+        Слоты всех участников загружаются один раз, а слитые интервалы занятости
+        и интервальные деревья подмножеств переиспользуются запросами
+        с пересекающимися участниками.
+
+        Args:
+            algorithms: Список конфигураций алгоритмов.
+            board_names: Доски для запросов без явного списка участников.
+
+        Returns:
+            List[List[Window]]: Найденные окна для каждого запроса в исходном порядке.
+        """
+        self.logger.info(f"Пакетный анализ: запросов {len(algorithms)}")
+        board_names = list(dict.fromkeys(list(board_names or []) + [
+            participant for algo_config in algorithms for participant in algo_config.get("participants") or []
+        ]))
+        for board_name in board_names:
+            self.load_slot_store(board_name)
+
+        results = []
+        for algo_config in algorithms:
+            try:
+                with self.timer.stage("search"):
+                    results.append(self.run_algorithm(algo_config, board_names))
+            except Exception as e:
+                self.logger.error(f"Ошибка при выполнении алгоритма '{algo_config.get('type')}': {e}")
+                results.append([])
+        self.logger.info(f"Пакетный анализ завершён. Найдено окон: {sum(len(r) for r in results)}")
+        return results
+
+    def register_standing_query(self, query_id: str, algo_config: Dict[str, Any],
+                                board_names: Optional[List[str]] = None) -> List[Window]:
+        """
+        Регистрирует постоянный запрос и вычисляет его результат.
+
+        Запросы общего окна, сплит-окна и окна с минимумом конфликтов выполняются
+        по дням диапазона с общим временем отсчета, лучшие окна каждого дня
+        сохраняются, и при изменении доски (update_board) пересчитываются только
+        затронутые дни. Еженедельные окна и окна с аудиторией пересчитываются целиком.
+
+        Args:
+            query_id: Идентификатор запроса.
+            algo_config: Конфигурация алгоритма (как для run_algorithm).
+            board_names: Участники по умолчанию, если они не заданы в конфигурации.
+
+        Returns:
+            List[Window]: Лучшие окна запроса.
+
+        Raises:
+            ValueError: Тип алгоритма не поддерживается или не заданы участники.
+        """
+        if algo_config.get("type") not in STANDING_QUERY_TYPES:
+            raise ValueError(f"Тип алгоритма '{algo_config.get('type')}' не поддерживается постоянными запросами")
+
+        start_date = algo_config.get("start_date")
+        end_date = algo_config.get("end_date")
+        reference_time = algo_config.get("reference_time") or datetime.combine(
+            start_date, algo_config.get("earliest_start_time", time(hour=7, minute=0))
+        )
+        query = StandingQuery(query_id=query_id, algo_config=dict(algo_config), reference_time=reference_time,
+                              board_names=list(board_names or []))
+        if not query.participants:
+            raise ValueError("Для постоянного запроса не заданы участники")
+        self._standing_queries[query_id] = query
+
+        days = []
+        current_date = start_date
+        while current_date <= end_date:
+            days.append(current_date)
+            current_date += timedelta(days=1)
+        self._recompute_standing_days(query, days)
+        self.logger.info(f"Зарегистрирован постоянный запрос '{query_id}': найдено окон {len(query.windows)}")
+        return query.windows
+
+    def remove_standing_query(self, query_id: str) -> None:
+        """Удаляет постоянный запрос."""
+        self._standing_queries.pop(query_id, None)
+
+    def get_standing_results(self, query_id: str) -> List[Window]:
+        """Возвращает текущий результат постоянного запроса (пустой, если запроса нет)."""
+        query = self._standing_queries.get(query_id)
+        return query.windows if query else []
+
+    def get_standing_boards(self, query_id: str) -> Set[str]:
+        """Возвращает доски, от которых зависит постоянный запрос (пустое множество, если запроса нет)."""
+        query = self._standing_queries.get(query_id)
+        return query.boards if query else set()
+
+    def update_board(self, board_name: str, time_slots: Optional[List[TimeSlot]] = None) -> Dict[str, List[Window]]:
+        """
+        Обновляет слоты доски и пересчитывает затронутые постоянные запросы.
+
+        Args:
+            board_name: Название изменившейся доски.
+            time_slots: Новые слоты доски (по умолчанию перечитываются из источника).
+
+        Returns:
+            Dict[str, List[Window]]: Новые результаты пересчитанных запросов.
+        """
+        old_store = self._time_slots_cache.pop(board_name, None)
+        if time_slots is None:
+            new_store = self.load_slot_store(board_name)
+        else:
+            new_store = SlotStore.from_slots(board_name, time_slots)
+            self._time_slots_cache[board_name] = new_store
+            self._invalidate_participant(board_name)
+
+        old_intervals = set(zip(old_store.starts, old_store.ends)) if old_store else set()
+        changed = old_intervals ^ set(zip(new_store.starts, new_store.ends))
+        self.logger.info(f"Доска '{board_name}' обновлена: изменено слотов {len(changed)}")
+
+        updated = {}
+        for query in self._standing_queries.values():
+            if board_name not in query.boards or not changed:
+                continue
+            days = self._affected_days(changed, query)
+            if days:
+                self._recompute_standing_days(query, days)
+                updated[query.query_id] = query.windows
+        return updated
+
+    def _affected_days(self, changed: Set[Tuple[int, int]], query: StandingQuery) -> List[date]:
+        """
+        Возвращает дни диапазона запроса, на которые влияют изменённые слоты.
+
+        Слот влияет на дни, которые пересекает его интервал, расширенный на
+        min_gap_hours запроса.
+
+        Args:
+            changed: Изменённые слоты (начало, окончание в минутах от эпохи).
+            query: Постоянный запрос.
+
+        Returns:
+            List[date]: Затронутые дни в порядке возрастания.
+        """
+        start_date = query.algo_config.get("start_date")
+        end_date = query.algo_config.get("end_date")
+        gap = _hours_to_microseconds(query.algo_config.get("min_gap_hours", 0.0))
+        epoch_date = _EPOCH.date()
+        days = set()
+        for start, end in changed:
+            first_day = (start * _US_PER_MINUTE - gap) // _US_PER_DAY
+            last_day = (end * _US_PER_MINUTE + gap - 1) // _US_PER_DAY
+            for day_number in range(first_day, max(first_day, last_day) + 1):
+                day = epoch_date + timedelta(days=day_number)
+                if start_date <= day <= end_date:
+                    days.add(day)
+        return sorted(days)
+
+    def _recompute_standing_days(self, query: StandingQuery, days: List[date]) -> None:
+        """Пересчитывает лучшие окна запроса за указанные дни и сливает результат."""
+        config = query.algo_config
+        if not query.by_day:
+            query.windows = self.run_algorithm(config, query.participants)
+            return
+
+        for day in days:
+            day_config = dict(config, start_date=day, end_date=day, workers=1, reference_time=query.reference_time)
+            query.day_results[day] = self.run_algorithm(day_config, query.participants)
+
+        top_k = config.get("top_k", DEFAULT_TOP_K)
+        partial_results = [query.day_results[day] for day in sorted(query.day_results)]
+        if query.type == "common_window":
+            query.windows = self._merge_common_results(
+                partial_results, query.participants, config.get("maximize_participants", True), top_k
+            )
+        else:
+            # Оценка сплит-окна и окна с минимумом конфликтов не зависит от порядка
+            # подмножеств: достаточно устойчивой сортировки по оценке
+            query.windows = self._merge_split_results(partial_results, top_k)
+
+    def publish_results(self, board_names: List[str], windows: List[Window]) -> int:
+        """
+        Записывает результаты анализа в YouGile: готовит доску анализа,
+        копирует на неё задачи участников и создаёт задачи для окон.
+
+        Args:
+            board_names: Список названий досок участников.
+            windows: Окна, для которых создаются задачи.
+
+        Returns:
+            int: Количество созданных задач для окон.
+        """
+        try:
+            with self.timer.stage("analysis_board_setup"):
+                if not self.create_analysis_board():
+                    return 0
+
+                for board_name in board_names:
+                    self.integrator.copy_tasks_to_analysis_board(board_name)
+
+            with self.timer.stage("window_tasks"):
+                created = sum(1 for window in windows if self.create_window_task(window))
+            self.logger.info(f"Результаты анализа записаны в YouGile. Создано задач: {created}")
+            return created
+
+        except Exception as e:
+            self.logger.error(f"Ошибка при записи результатов анализа: {e}")
+            return 0
+
+    def analyze_schedule(self, algorithms: Optional[List[Dict[str, Any]]] = None, board_names: Optional[List[str]] = None,
+                         dry_run: bool = False) -> List[Window]:
         """
         Выполняет анализ расписания с использованием указанных алгоритмов.
 
+        Окна вычисляются без изменений в YouGile; затем, если не задан dry_run,
+        результаты записываются на доску анализа (задача создаётся только
+        для лучшего окна каждого алгоритма, остальные - альтернативы).
+
         Args:
             algorithms: Список конфигураций алгоритмов.
             board_names: Список названий досок для анализа.
+            dry_run: Только вычислить окна, не изменяя доску анализа.
 
         Returns:
             List[Window]: Список найденных окон.
         """
         try:
             self.logger.info("Начало анализа расписания")
-            if not self.create_analysis_board():
-                return []
-
-            board_names = board_names or [board.title for board in self.integrator.schedule_boards]
-            found_windows = []
-
-            # Загружаем слоты для всех досок
-            for board_name in board_names:
-                self.integrator.copy_tasks_to_analysis_board(board_name)
-                self.load_time_slots(board_name)
-
-            # Выполняем алгоритмы
-            for algo_config in algorithms:
-                algo_type = algo_config.get("type")
-                try:
-                    window = None
-                    if algo_type == "split_window":
-                        window = self.find_split_window(
-                            start_date=algo_config.get("start_date"),
-                            end_date=algo_config.get("end_date"),
-                            total_duration=algo_config.get("total_duration", 4.0),
-                            min_segment_duration=algo_config.get("min_segment_duration", 0.5),
-                            max_segments=algo_config.get("max_segments", 5),
-                            participants=algo_config.get("participants", board_names),
-                            earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
-                            latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
-                            min_gap_hours=algo_config.get("min_gap_hours", 0.0),
-                            maximize_participants=algo_config.get("maximize_participants", True),
-                            minimize_start_time=algo_config.get("minimize_start_time", True),
-                            minimize_total_idle=algo_config.get("minimize_total_idle", True),
-                            minimize_max_gap=algo_config.get("minimize_max_gap", True),
-                            include_holidays=algo_config.get("include_holidays", False),
-                            include_weekends=algo_config.get("include_weekends", False),
-                            weight_participants=algo_config.get("weight_participants", 1.0),
-                            weight_start_time=algo_config.get("weight_start_time", 1.0),
-                            weight_total_idle=algo_config.get("weight_total_idle", 1.0),
-                            weight_max_gap=algo_config.get("weight_max_gap", 1.0)
-                        )
-                    elif algo_type == "common_window":
-                        window = self.find_common_window(
-                            start_date=algo_config.get("start_date"),
-                            end_date=algo_config.get("end_date"),
-                            required_duration=algo_config.get("required_duration", 1.0),
-                            participants=algo_config.get("participants", board_names),
-                            earliest_start_time=algo_config.get("earliest_start_time", time(hour=7, minute=0)),
-                            latest_end_time=algo_config.get("latest_end_time", time(hour=23, minute=0)),
-                            min_gap_hours=algo_config.get("min_gap_hours", 0.0),
-                            maximize_participants=algo_config.get("maximize_participants", True),
-                            minimize_start_time=algo_config.get("minimize_start_time", True),
-                            minimize_total_idle=algo_config.get("minimize_total_idle", True),
-                            minimize_max_gap=algo_config.get("minimize_max_gap", True),
-                            include_holidays=algo_config.get("include_holidays", False),
-                            include_weekends=algo_config.get("include_weekends", False),
-                            weight_participants=algo_config.get("weight_participants", 1.0),
-                            weight_start_time=algo_config.get("weight_start_time", 1.0),
-                            weight_total_idle=algo_config.get("weight_total_idle", 1.0),
-                            weight_max_gap=algo_config.get("weight_max_gap", 1.0)
-                        )
-                    else:
-                        self.logger.warning(f"Неизвестный тип алгоритма: {algo_type}")
-                        continue
+            board_names = board_names or self.slot_source.list_boards()
 
-                    if window:
-                        found_windows.append(window)
-                        self.create_window_task(window)
+            results = self.analyze_batch(algorithms or [], board_names)
+            found_windows = [window for windows in results for window in windows]
 
-                except Exception as e:
-                    self.logger.error(f"Ошибка при выполнении алгоритма '{algo_type}': {e}")
+            if not dry_run:
+                self.publish_results(board_names, [windows[0] for windows in results if windows])
 
             self.logger.info(f"Анализ завершён. Найдено окон: {len(found_windows)}")
             return found_windows
 
         except Exception as e:
             self.logger.error(f"Ошибка при анализе расписания: {e}")
-            return []
\ No newline at end of file
+            return []
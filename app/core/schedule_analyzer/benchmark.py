@@ -0,0 +1,371 @@
+"""
+------------------------------------------------------------
+ScheduleAnalyzer - Бенчмарки алгоритмов поиска окон
+------------------------------------------------------------
+Синтетические расписания МЭИ (пары по расписанию звонков, числитель и
+знаменатель) подаются в анализатор через InMemorySlotSource без обращений
+к YouGile. Замеряются find_common_window, find_split_window и _score_window
+на кривых масштабирования по числу участников и длине диапазона дат.
+
+Запуск из каталога app/core:
+
+    python -m schedule_analyzer.benchmark --output bench.json
+    python -m schedule_analyzer.benchmark --compare bench.json
+
+При сравнении с сохранёнными результатами замеры, ставшие медленнее порога,
+выводятся как регрессии, и процесс завершается с кодом 1.
+------------------------------------------------------------
+"""
+
+import argparse
+import json
+import logging
+import platform
+import random
+import statistics
+import sys
+import time as timer
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, timedelta, date, time
+from typing import List, Dict, Any, Optional, Callable, Tuple
+
+from .analyzer import ScheduleAnalyzer, Window, WindowType
+from .constants import DEFAULT_TOP_K
+from .slot_sources import TimeSlot, InMemorySlotSource
+
+# Расписание звонков МЭИ (начало и конец пар)
+MPEI_PAIR_TIMES = [
+    (time(9, 20), time(10, 55)),
+    (time(11, 10), time(12, 45)),
+    (time(13, 45), time(15, 20)),
+    (time(15, 35), time(17, 10)),
+    (time(17, 20), time(18, 55)),
+    (time(19, 5), time(20, 40)),
+]
+
+# Начало синтетического семестра (понедельник)
+DEFAULT_START_DATE = date(2025, 9, 1)
+
+# Порог замедления относительно сохранённых результатов, после которого замер считается регрессией
+DEFAULT_REGRESSION_THRESHOLD = 1.25
+
+
+@dataclass
+class BenchmarkCase:
+    """Один замер бенчмарка: алгоритм и параметры синтетического расписания."""
+    name: str
+    participants: int
+    weeks: int
+    params: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def key(self) -> str:
+        """Ключ для сопоставления с сохранёнными результатами."""
+        extra = ",".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        return f"{self.name}[p={self.participants},w={self.weeks}{',' + extra if extra else ''}]"
+
+
+@dataclass
+class BenchmarkResult:
+    """Результат замера: лучшее и медианное время по повторам (секунды)."""
+    key: str
+    name: str
+    participants: int
+    weeks: int
+    params: Dict[str, Any]
+    repeat: int
+    best: float
+    median: float
+    windows_found: int
+
+
+def generate_schedules(participants: int, weeks: int, lessons_per_day: float = 3.0,
+                       start_date: date = DEFAULT_START_DATE, seed: int = 0,
+                       saturday_lessons: bool = True) -> Dict[str, List[TimeSlot]]:
+    """
+    Генерирует синтетические расписания групп МЭИ.
+
+    У каждой группы две недельные сетки (числитель и знаменатель): в учебный день
+    идут подряд несколько пар со случайным сдвигом от первой пары, их число
+    колеблется вокруг lessons_per_day.
+
+    Args:
+        participants: Количество участников (досок).
+        weeks: Количество недель расписания.
+        lessons_per_day: Среднее количество пар в учебный день.
+        start_date: Первый день расписания.
+        seed: Зерно генератора случайных чисел.
+        saturday_lessons: Ставить занятия на субботу.
+
+    Returns:
+        Dict[str, List[TimeSlot]]: Словарь название доски -> список временных слотов.
+    """
+    rnd = random.Random(seed)
+    study_days = 6 if saturday_lessons else 5
+    pair_count = len(MPEI_PAIR_TIMES)
+    schedules = {}
+
+    for index in range(participants):
+        board_name = f"Группа-{index + 1:03d}"
+
+        # Сетки числителя и знаменателя: день недели -> номера пар
+        templates = []
+        for _ in range(2):
+            template = {}
+            for weekday in range(study_days):
+                count = max(0, min(pair_count, round(rnd.gauss(lessons_per_day, 1.0))))
+                if weekday == 5:
+                    count = min(count, 2)
+                first = rnd.randint(0, pair_count - count) if count else 0
+                template[weekday] = range(first, first + count)
+            templates.append(template)
+
+        time_slots = []
+        for week in range(weeks):
+            template = templates[week % 2]
+            for weekday, pairs in template.items():
+                day = start_date + timedelta(weeks=week, days=weekday)
+                for pair in pairs:
+                    pair_start, pair_end = MPEI_PAIR_TIMES[pair]
+                    time_slots.append(TimeSlot(
+                        start=datetime.combine(day, pair_start),
+                        end=datetime.combine(day, pair_end),
+                        title=f"Пара {pair + 1}",
+                        board_name=board_name
+                    ))
+        schedules[board_name] = time_slots
+
+    return schedules
+
+
+def make_analyzer(schedules: Dict[str, List[TimeSlot]], log_level: int = logging.WARNING) -> ScheduleAnalyzer:
+    """Создаёт анализатор над синтетическими расписаниями без интеграции с YouGile."""
+    analyzer = ScheduleAnalyzer(None, slot_source=InMemorySlotSource(schedules))
+    # Информационные сообщения анализатора искажают замеры
+    analyzer.logger.setLevel(log_level)
+    return analyzer
+
+
+def _time_calls(setup: Callable[[], Any], run: Callable[[Any], int], repeat: int) -> Tuple[float, float, int]:
+    """
+    Замеряет run на свежем состоянии из setup (подготовка не входит в замер).
+
+    Первый запуск не замеряется: он прогревает общие для процесса кэши
+    (праздники календаря), которые иначе достаются первому замеру набора.
+
+    Returns:
+        Tuple[float, float, int]: Лучшее время, медианное время, результат последнего запуска.
+    """
+    run(setup())
+    timings = []
+    found = 0
+    for _ in range(repeat):
+        state = setup()
+        started = timer.perf_counter()
+        found = run(state)
+        timings.append(timer.perf_counter() - started)
+    return min(timings), statistics.median(timings), found
+
+
+def _run_case(case: BenchmarkCase, repeat: int, seed: int) -> BenchmarkResult:
+    """Выполняет один замер."""
+    schedules = generate_schedules(case.participants, case.weeks, seed=seed)
+    participants = list(schedules)
+    start_date = DEFAULT_START_DATE
+    end_date = start_date + timedelta(weeks=case.weeks, days=-1)
+    earliest_start_time = time(hour=9, minute=0)
+    latest_end_time = time(hour=21, minute=0)
+
+    if case.name == "find_common_window":
+        def run(analyzer: ScheduleAnalyzer) -> int:
+            windows = analyzer.find_common_windows(
+                start_date, end_date, case.params.get("required_duration", 1.5), participants,
+                earliest_start_time, latest_end_time,
+                maximize_participants=case.params.get("maximize_participants", True),
+                top_k=case.params.get("top_k", DEFAULT_TOP_K)
+            )
+            return len(windows)
+        setup = lambda: make_analyzer(schedules)
+
+    elif case.name == "find_split_window":
+        def run(analyzer: ScheduleAnalyzer) -> int:
+            windows = analyzer.find_split_windows(
+                start_date, end_date, case.params.get("total_duration", 2.0),
+                case.params.get("min_segment_duration", 1.0), case.params.get("max_segments", 2), participants,
+                earliest_start_time, latest_end_time,
+                maximize_participants=case.params.get("maximize_participants", False),
+                top_k=case.params.get("top_k", DEFAULT_TOP_K)
+            )
+            return len(windows)
+        setup = lambda: make_analyzer(schedules)
+
+    elif case.name == "_score_window":
+        calls = case.params.get("calls", 10000)
+        now = datetime.combine(start_date, earliest_start_time)
+        window = Window(
+            start=datetime.combine(start_date, time(13, 0)),
+            end=datetime.combine(start_date, time(14, 30)),
+            duration_hours=1.5,
+            window_type=WindowType.COMMON_WINDOW,
+            description="",
+            participants=participants
+        )
+
+        def setup() -> ScheduleAnalyzer:
+            analyzer = make_analyzer(schedules)
+            for participant in participants:
+                analyzer.load_slot_store(participant)
+            return analyzer
+
+        def run(analyzer: ScheduleAnalyzer) -> int:
+            for _ in range(calls):
+                analyzer._score_window(
+                    window, now, participants, True, True, True, True, earliest_start_time, latest_end_time
+                )
+            return calls
+
+    else:
+        raise ValueError(f"Неизвестный бенчмарк: {case.name}")
+
+    best, median, found = _time_calls(setup, run, repeat)
+    return BenchmarkResult(
+        key=case.key, name=case.name, participants=case.participants, weeks=case.weeks,
+        params=case.params, repeat=repeat, best=best, median=median, windows_found=found
+    )
+
+
+def build_suite(quick: bool = False) -> List[BenchmarkCase]:
+    """
+    Формирует набор замеров: кривые по числу участников и по числу недель.
+
+    Перебор подмножеств участников (maximize_participants) экспоненциален,
+    поэтому его кривая ограничена меньшими группами.
+
+    Args:
+        quick: Сокращённый набор для быстрой проверки.
+
+    Returns:
+        List[BenchmarkCase]: Замеры.
+    """
+    if quick:
+        subset_sizes, group_sizes, week_counts, split_sizes = (2, 4, 6), (4, 16), (1, 4), (2, 4)
+    else:
+        subset_sizes, group_sizes, week_counts, split_sizes = (2, 4, 6, 8, 10), (4, 16, 32, 64), (1, 2, 4, 8, 16), (2, 4, 8)
+
+    cases = []
+    for participants in subset_sizes:
+        cases.append(BenchmarkCase("find_common_window", participants, 2, {"maximize_participants": True}))
+    for participants in group_sizes:
+        cases.append(BenchmarkCase("find_common_window", participants, 2, {"maximize_participants": False}))
+    for weeks in week_counts:
+        cases.append(BenchmarkCase("find_common_window", 4, weeks, {"maximize_participants": True}))
+    for participants in split_sizes:
+        cases.append(BenchmarkCase("find_split_window", participants, 1, {"max_segments": 2}))
+    for weeks in week_counts[:3]:
+        cases.append(BenchmarkCase("find_split_window", 2, weeks, {"max_segments": 2}))
+    for participants in group_sizes:
+        cases.append(BenchmarkCase("_score_window", participants, 2, {"calls": 10000}))
+
+    # Точки кривых могут совпадать: каждый замер выполняется один раз
+    unique_cases = {}
+    for case in cases:
+        unique_cases.setdefault(case.key, case)
+    return list(unique_cases.values())
+
+
+def run_suite(cases: List[BenchmarkCase], repeat: int = 3, seed: int = 0) -> List[BenchmarkResult]:
+    """
+    Выполняет набор замеров.
+
+    Args:
+        cases: Замеры.
+        repeat: Количество повторов каждого замера.
+        seed: Зерно генератора расписаний.
+
+    Returns:
+        List[BenchmarkResult]: Результаты в порядке замеров.
+    """
+    results = []
+    for case in cases:
+        result = _run_case(case, repeat, seed)
+        print(f"{result.key:<70} best {result.best:9.4f}s  median {result.median:9.4f}s  found {result.windows_found}")
+        results.append(result)
+    return results
+
+
+def save_results(results: List[BenchmarkResult], path: str, seed: int) -> None:
+    """Сохраняет результаты в JSON вместе с описанием окружения."""
+    data = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": seed
+        },
+        "results": [asdict(result) for result in results]
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+
+def compare_results(results: List[BenchmarkResult], baseline_path: str,
+                    threshold: float = DEFAULT_REGRESSION_THRESHOLD) -> List[str]:
+    """
+    Сравнивает результаты с сохранёнными по лучшему времени (оно меньше
+    подвержено шуму от фоновой нагрузки, чем медиана).
+
+    Args:
+        results: Текущие результаты.
+        baseline_path: Путь к JSON с сохранёнными результатами.
+        threshold: Допустимое отношение текущего времени к сохранённому.
+
+    Returns:
+        List[str]: Ключи замеров с регрессией.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {entry["key"]: entry for entry in json.load(f).get("results", [])}
+
+    regressions = []
+    for result in results:
+        previous = baseline.get(result.key)
+        if not previous or previous["best"] <= 0:
+            print(f"{result.key:<70} нет сохранённого результата")
+            continue
+        ratio = result.best / previous["best"]
+        mark = ""
+        if ratio > threshold:
+            mark = "  РЕГРЕССИЯ"
+            regressions.append(result.key)
+        print(f"{result.key:<70} {previous['best']:9.4f}s -> {result.best:9.4f}s  x{ratio:5.2f}{mark}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарки алгоритмов ScheduleAnalyzer")
+    parser.add_argument("--quick", action="store_true", help="Сокращённый набор замеров")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество повторов каждого замера")
+    parser.add_argument("--seed", type=int, default=0, help="Зерно генератора синтетических расписаний")
+    parser.add_argument("--output", help="Сохранить результаты в JSON-файл")
+    parser.add_argument("--compare", help="Сравнить с сохранёнными результатами из JSON-файла")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD,
+                        help="Допустимое замедление относительно сохранённых результатов")
+    parser.add_argument("--only", help="Выполнить только замеры алгоритма с этим именем")
+    args = parser.parse_args(argv)
+
+    cases = build_suite(args.quick)
+    if args.only:
+        cases = [case for case in cases if case.name == args.only]
+    results = run_suite(cases, repeat=args.repeat, seed=args.seed)
+
+    if args.output:
+        save_results(results, args.output, args.seed)
+    if args.compare:
+        regressions = compare_results(results, args.compare, args.threshold)
+        if regressions:
+            print(f"Регрессий: {len(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,9 @@
+"""
+Общие константы анализатора расписаний.
+
+Модуль не имеет зависимостей, поэтому его импортируют и анализатор, и модели
+запросов API, не загружая остальной пакет.
+"""
+
+# Количество лучших окон, возвращаемых поиском по умолчанию
+DEFAULT_TOP_K = 5
@@ -0,0 +1,135 @@
+"""
+Параллельный поиск окон по частям диапазона дат.
+
+Диапазон дат разбивается на непрерывные части, которые обрабатываются в общем
+для процесса сервиса пуле процессов. Пул создаётся при первом параллельном
+поиске и останавливается при остановке сервиса (shutdown_process_pool).
+Компактный индекс занятости (массивы минут от эпохи) передаётся вместе с
+частью, процесс-обработчик строит по нему ScheduleAnalyzer один раз на запрос.
+"""
+
+import os
+import threading
+import uuid
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+# Анализатор процесса-обработчика и ключ запроса, для которого он построен
+_worker_analyzer = None
+_worker_index_key: Optional[str] = None
+
+# Общий пул процессов (создаётся при первом параллельном поиске)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+# Количество частей диапазона на один процесс (для выравнивания нагрузки)
+CHUNKS_PER_WORKER = 2
+
+
+def split_date_range(start_date: date, end_date: date, chunks_count: int) -> List[Tuple[date, date]]:
+    """
+    Делит диапазон дат на непрерывные части примерно равной длины.
+
+    Args:
+        start_date: Начальная дата.
+        end_date: Конечная дата (включительно).
+        chunks_count: Желаемое количество частей.
+
+    Returns:
+        List[Tuple[date, date]]: Части диапазона в порядке следования дат.
+    """
+    total_days = (end_date - start_date).days + 1
+    chunks_count = max(1, min(chunks_count, total_days))
+    chunk_days, remainder = divmod(total_days, chunks_count)
+
+    chunks = []
+    chunk_start = start_date
+    for i in range(chunks_count):
+        length = chunk_days + (1 if i < remainder else 0)
+        chunk_end = chunk_start + timedelta(days=length - 1)
+        chunks.append((chunk_start, chunk_end))
+        chunk_start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def get_process_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Возвращает общий пул процессов, создавая его при первом обращении.
+
+    Args:
+        workers: Количество процессов пула (0 - по числу ядер); учитывается
+            только при создании пула.
+
+    Returns:
+        ProcessPoolExecutor: Пул процессов.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers if workers > 0 else (os.cpu_count() or 1))
+        return _pool
+
+
+def shutdown_process_pool() -> None:
+    """Останавливает общий пул процессов (при остановке сервиса или после сбоя пула)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _search_chunk(index_key: str, busy_index: Dict[str, Tuple[array, array]], calendar, window_type: str,
+                  search_kwargs: Dict[str, Any], start_date: date, end_date: date) -> list:
+    """Выполняет поиск окон в одной части диапазона дат."""
+    global _worker_analyzer, _worker_index_key
+    if _worker_index_key != index_key:
+        from .analyzer import ScheduleAnalyzer
+
+        _worker_analyzer = ScheduleAnalyzer(None, calendar=calendar)
+        _worker_analyzer.load_busy_index(busy_index)
+        _worker_index_key = index_key
+
+    if window_type == "split_window":
+        return _worker_analyzer.find_split_windows(start_date=start_date, end_date=end_date, **search_kwargs)
+    return _worker_analyzer.find_common_windows(start_date=start_date, end_date=end_date, **search_kwargs)
+
+
+def run_parallel_search(analyzer, window_type: str, search_kwargs: Dict[str, Any], participants: List[str],
+                        start_date: date, end_date: date, workers: int) -> List[list]:
+    """
+    Выполняет поиск окон в общем пуле процессов.
+
+    Args:
+        analyzer: ScheduleAnalyzer с загруженными слотами участников.
+        window_type: Тип окна ("common_window" или "split_window").
+        search_kwargs: Параметры поиска без диапазона дат.
+        participants: Список названий досок участников.
+        start_date: Начальная дата поиска.
+        end_date: Конечная дата поиска.
+        workers: Количество процессов (0 - по числу ядер).
+
+    Returns:
+        List[list]: Лучшие окна каждой части в порядке следования частей.
+    """
+    pool = get_process_pool(workers)
+    workers = workers if workers > 0 else (os.cpu_count() or 1)
+    chunks = split_date_range(start_date, end_date, workers * CHUNKS_PER_WORKER)
+    analyzer.logger.info(f"Параллельный поиск: {len(chunks)} частей, процессов: {workers}")
+
+    index_key = uuid.uuid4().hex
+    busy_index = analyzer.export_busy_index(participants)
+    try:
+        futures = [
+            pool.submit(_search_chunk, index_key, busy_index, analyzer.calendar, window_type, search_kwargs,
+                        chunk_start, chunk_end)
+            for chunk_start, chunk_end in chunks
+        ]
+        return [future.result() for future in futures]
+    except BrokenProcessPool:
+        # Процесс-обработчик завершился аварийно: следующий поиск создаст новый пул
+        shutdown_process_pool()
+        raise
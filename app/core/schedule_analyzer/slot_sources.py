@@ -0,0 +1,472 @@
+"""
+Источники временных слотов для анализатора расписания.
+
+Анализатор получает занятия участников через SlotSource. YouGileSlotSource
+читает задачи досок YouGile, LocalSlotSource работает с расписаниями в формате
+MPEIRuzParser (результат парсинга или сохранённые JSON-файлы) без сетевых запросов,
+InMemorySlotSource отдаёт готовые списки слотов.
+"""
+
+import json
+import logging
+import os
+import re
+import sys
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable
+
+from schedule_parser.schedule_format import parse_lesson_time
+
+_EPOCH = datetime(1970, 1, 1)
+_MINUTE = timedelta(minutes=1)
+
+
+def to_epoch_minutes(dt: datetime, round_up: bool = False) -> int:
+    """Переводит время в целое число минут от эпохи (с округлением вниз или вверх)."""
+    if round_up:
+        return -((_EPOCH - dt) // _MINUTE)
+    return (dt - _EPOCH) // _MINUTE
+
+
+def from_epoch_minutes(minutes: int) -> datetime:
+    """Переводит число минут от эпохи обратно во время."""
+    return _EPOCH + timedelta(minutes=minutes)
+
+
+@dataclass(slots=True)
+class TimeSlot:
+    """Временной слот для занятия."""
+    start: datetime
+    end: datetime
+    title: str
+    description: str = ""
+    board_name: str = ""
+
+    def duration_hours(self) -> float:
+        """Возвращает продолжительность слота в часах."""
+        return (self.end - self.start).total_seconds() / 3600
+
+    def overlaps_with(self, other: 'TimeSlot') -> bool:
+        """Проверяет пересечение с другим временным слотом."""
+        return self.start < other.end and self.end > other.start
+
+
+class SlotStore:
+    """
+    Компактное хранилище слотов одной доски.
+
+    Начала и окончания слотов хранятся в параллельных массивах int64 (минуты от
+    эпохи, начала округляются вниз, окончания - вверх), отсортированных по началу.
+    Названия и описания интернируются: занятия одного предмета повторяются
+    каждую неделю. Объекты TimeSlot создаются только при итерации.
+    """
+
+    __slots__ = ('board_name', 'starts', 'ends', 'titles', 'descriptions', '_max_ends')
+
+    def __init__(self, board_name: str, starts: array, ends: array,
+                 titles: Optional[List[str]] = None, descriptions: Optional[List[str]] = None):
+        """
+        Инициализация хранилища.
+
+        Args:
+            board_name: Название доски.
+            starts: Начала слотов в минутах от эпохи (по возрастанию).
+            ends: Окончания слотов в минутах от эпохи.
+            titles: Названия слотов (по умолчанию пустые).
+            descriptions: Описания слотов (по умолчанию пустые).
+        """
+        self.board_name = board_name
+        self.starts = starts
+        self.ends = ends
+        self.titles = titles if titles is not None else [""] * len(starts)
+        self.descriptions = descriptions if descriptions is not None else [""] * len(starts)
+        # Префиксные максимумы окончаний (строятся при первой проверке пересечения)
+        self._max_ends: Optional[array] = None
+
+    @classmethod
+    def from_slots(cls, board_name: str, slots: Iterable[TimeSlot]) -> 'SlotStore':
+        """
+        Создаёт хранилище из временных слотов.
+
+        Args:
+            board_name: Название доски.
+            slots: Временные слоты в произвольном порядке.
+
+        Returns:
+            SlotStore: Хранилище, отсортированное по началу слотов.
+        """
+        records = sorted(
+            (to_epoch_minutes(slot.start), to_epoch_minutes(slot.end, round_up=True),
+             sys.intern(slot.title or ""), sys.intern(slot.description or ""))
+            for slot in slots
+        )
+        return cls(
+            board_name,
+            array('q', (r[0] for r in records)),
+            array('q', (r[1] for r in records)),
+            [r[2] for r in records],
+            [r[3] for r in records]
+        )
+
+    @classmethod
+    def from_arrays(cls, board_name: str, starts: Iterable[int], ends: Iterable[int]) -> 'SlotStore':
+        """
+        Создаёт хранилище из массивов начал и окончаний (без названий).
+
+        Args:
+            board_name: Название доски.
+            starts: Начала слотов в минутах от эпохи.
+            ends: Окончания слотов в минутах от эпохи.
+
+        Returns:
+            SlotStore: Хранилище, отсортированное по началу слотов.
+        """
+        pairs = sorted(zip(starts, ends))
+        return cls(board_name, array('q', (p[0] for p in pairs)), array('q', (p[1] for p in pairs)))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[TimeSlot]:
+        for i in range(len(self.starts)):
+            yield self.slot(i)
+
+    def slot(self, i: int) -> TimeSlot:
+        """Возвращает i-й слот в виде TimeSlot."""
+        return TimeSlot(
+            start=from_epoch_minutes(self.starts[i]),
+            end=from_epoch_minutes(self.ends[i]),
+            title=self.titles[i],
+            description=self.descriptions[i],
+            board_name=self.board_name
+        )
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """
+        Проверяет, пересекается ли интервал [start, end) хотя бы с одним слотом.
+
+        Args:
+            start: Начало интервала.
+            end: Конец интервала.
+
+        Returns:
+            bool: True, если есть пересечение.
+        """
+        # Слоты с началом раньше end; пересечение есть, если наибольшее их окончание
+        # позже start. Слоты одной доски могут пересекаться, поэтому окончания не
+        # отсортированы - используются префиксные максимумы
+        stop = bisect_left(self.starts, to_epoch_minutes(end, round_up=True))
+        if not stop:
+            return False
+        if self._max_ends is None:
+            self._max_ends = array('q', accumulate(self.ends, max))
+        return self._max_ends[stop - 1] > to_epoch_minutes(start)
+
+
+class SlotSource(ABC):
+    """Источник временных слотов участников (досок)."""
+
+    @abstractmethod
+    def load_time_slots(self, board_name: str) -> List[TimeSlot]:
+        """
+        Загружает временные слоты участника.
+
+        Args:
+            board_name: Название доски (расписания) участника.
+
+        Returns:
+            List[TimeSlot]: Список временных слотов.
+        """
+
+    @abstractmethod
+    def list_boards(self) -> List[str]:
+        """Возвращает названия всех доступных досок (расписаний)."""
+
+
+class YouGileSlotSource(SlotSource):
+    """Источник слотов из задач досок проекта расписания в YouGile."""
+
+    def __init__(self, integrator):
+        """
+        Инициализация источника.
+
+        Args:
+            integrator: Экземпляр ScheduleIntegrator.
+        """
+        self.integrator = integrator
+        self.logger = logging.getLogger('ScheduleAnalyzer')
+
+    def _get_board_id(self, board_name: str) -> Optional[str]:
+        """Получение ID доски по её названию."""
+        for board in self.integrator.schedule_boards:
+            if board.title == board_name:
+                return board.id
+        self.logger.warning(f"Доска '{board_name}' не найдена")
+        return None
+
+    def list_boards(self) -> List[str]:
+        """Возвращает названия досок проекта расписания."""
+        self.integrator.get_schedule_boards()
+        return [board.title for board in self.integrator.schedule_boards]
+
+    def load_time_slots(self, board_name: str) -> List[TimeSlot]:
+        """
+        Загружает временные слоты из задач указанной доски.
+
+        Args:
+            board_name: Название доски для загрузки слотов.
+
+        Returns:
+            List[TimeSlot]: Список временных слотов.
+        """
+        self.integrator.get_schedule_boards()
+        board_id = self._get_board_id(board_name)
+        if not board_id:
+            return []
+        # Загружаем задачи только анализируемой доски
+        self.integrator.get_schedule_tasks([board_id])
+
+        # Фильтруем задачи по доске
+        column_ids = {c.id for c in self.integrator.schedule_columns if c.board_id == board_id}
+        time_slots = []
+
+        for task in self.integrator.schedule_tasks:
+            if task.column_id not in column_ids:
+                continue
+
+            try:
+                if not hasattr(task, 'deadline') or not task.deadline:
+                    continue
+
+                deadline = task.deadline
+                if not isinstance(deadline, dict):
+                    continue
+
+                start_timestamp = deadline.get('startDate')
+                end_timestamp = deadline.get('deadline')
+                if not start_timestamp or not end_timestamp:
+                    continue
+
+                start_dt = datetime.fromtimestamp(start_timestamp / 1000)
+                end_dt = datetime.fromtimestamp(end_timestamp / 1000)
+
+                time_slot = TimeSlot(
+                    start=start_dt,
+                    end=end_dt,
+                    title=task.title,
+                    description=getattr(task, 'description', ''),
+                    board_name=board_name
+                )
+                time_slots.append(time_slot)
+
+            except Exception as e:
+                self.logger.warning(f"Ошибка при обработке задачи '{task.title}': {e}")
+
+        return time_slots
+
+
+class LocalSlotSource(SlotSource):
+    """
+    Локальный источник слотов из расписаний в формате MPEIRuzParser.
+
+    Расписания передаются напрямую (результат MPEIRuzParser.parse) или
+    читаются из каталога с JSON-файлами, сохранёнными парсером.
+    """
+
+    SCHEDULE_TYPES = ('group', 'teacher', 'room')
+
+    # Суффикс диапазона дат в именах файлов выгрузки парсера за период
+    # (schedule_{тип}_{название}_{ДД_ММ_ГГГГ}-{ДД_ММ_ГГГГ}.json)
+    DATE_RANGE_SUFFIX = re.compile(r'_\d{2}_\d{2}_\d{4}-\d{2}_\d{2}_\d{4}$')
+
+    def __init__(self, schedules: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 json_dir: Optional[str] = None, year: Optional[int] = None):
+        """
+        Инициализация источника.
+
+        Args:
+            schedules: Словарь название доски -> расписание (список дней с занятиями).
+            json_dir: Каталог с JSON-файлами расписаний.
+            year: Год первого дня расписания (по умолчанию текущий).
+        """
+        self.logger = logging.getLogger('ScheduleAnalyzer')
+        self.json_dir = json_dir
+        self.year = year or datetime.now().year
+        self._schedules: Dict[str, List[Dict[str, Any]]] = {}
+        # Расписания из JSON-файлов: доска -> (путь, время изменения, расписание)
+        self._file_schedules: Dict[str, Tuple[str, float, List[Dict[str, Any]]]] = {}
+        for board_name, schedule_data in (schedules or {}).items():
+            self.add_schedule(board_name, schedule_data)
+
+    def add_schedule(self, board_name: str, schedule_data: List[Dict[str, Any]]) -> None:
+        """
+        Добавляет расписание участника.
+
+        Args:
+            board_name: Название доски (расписания).
+            schedule_data: Список дней с занятиями в формате MPEIRuzParser.
+        """
+        self._schedules[board_name] = schedule_data
+
+    def list_boards(self) -> List[str]:
+        """Возвращает названия переданных расписаний и расписаний из каталога."""
+        boards = list(self._schedules)
+        if self.json_dir and os.path.isdir(self.json_dir):
+            for filename in sorted(os.listdir(self.json_dir)):
+                name = self._board_name_from_file(filename)
+                if name and name not in boards:
+                    boards.append(name)
+        return boards
+
+    def _board_name_from_file(self, filename: str) -> Optional[str]:
+        """Извлекает название расписания из имени JSON-файла парсера."""
+        if not filename.endswith('.json'):
+            return None
+        stem = filename[:-len('.json')]
+        for schedule_type in self.SCHEDULE_TYPES:
+            prefix = f"schedule_{schedule_type}_"
+            if stem.startswith(prefix):
+                return self.DATE_RANGE_SUFFIX.sub('', stem[len(prefix):])
+        return stem
+
+    def _find_json_file(self, board_name: str) -> Optional[str]:
+        """
+        Ищет JSON-файл расписания по названию доски.
+
+        Подходят файлы schedule_{тип}_{название}.json, {название}.json и файлы
+        выгрузки за период schedule_{тип}_{название}_{даты}.json; из нескольких
+        выбирается изменённый последним.
+        """
+        if not self.json_dir or not os.path.isdir(self.json_dir):
+            return None
+        names = {board_name, board_name.replace(' ', '_')}
+        candidates = []
+        for filename in os.listdir(self.json_dir):
+            if not filename.endswith('.json'):
+                continue
+            stem = filename[:-len('.json')]
+            if stem in names or (stem.startswith('schedule_') and self._board_name_from_file(filename) in names):
+                path = os.path.join(self.json_dir, filename)
+                if os.path.isfile(path):
+                    candidates.append(path)
+        return max(candidates, key=os.path.getmtime) if candidates else None
+
+    def _get_schedule(self, board_name: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Возвращает расписание участника из памяти или JSON-файла.
+
+        Прочитанный файл кэшируется вместе со временем изменения и читается
+        заново, если парсер перезаписал его (или сохранил новый файл доски).
+        """
+        if board_name in self._schedules:
+            return self._schedules[board_name]
+        path = self._find_json_file(board_name)
+        if not path:
+            self._file_schedules.pop(board_name, None)
+            return None
+        mtime = os.path.getmtime(path)
+        cached = self._file_schedules.get(board_name)
+        if cached and cached[0] == path and cached[1] == mtime:
+            return cached[2]
+        with open(path, encoding='utf-8') as f:
+            schedule_data = json.load(f)
+        self._file_schedules[board_name] = (path, mtime, schedule_data)
+        return schedule_data
+
+    def load_time_slots(self, board_name: str) -> List[TimeSlot]:
+        """
+        Загружает временные слоты из расписания участника.
+
+        Дни обрабатываются в порядке недель; при переходе через декабрь год
+        увеличивается, поэтому осенний семестр корректно продолжается в январе.
+
+        Args:
+            board_name: Название доски (расписания).
+
+        Returns:
+            List[TimeSlot]: Список временных слотов.
+        """
+        schedule_data = self._get_schedule(board_name)
+        if schedule_data is None:
+            self.logger.warning(f"Расписание '{board_name}' не найдено")
+            return []
+
+        time_slots = []
+        year = self.year
+        last_month = None
+        for day in sorted(schedule_data, key=lambda d: d.get('week') or 0):
+            day_str = day.get('day', '')
+            for lesson in day.get('lessons', []):
+                subject = (lesson.get('subject') or '').strip()
+                if not subject:
+                    continue
+                try:
+                    start_dt, end_dt = parse_lesson_time(day_str, lesson.get('time', ''), year)
+                    if last_month is not None and start_dt.month < last_month:
+                        year += 1
+                        start_dt, end_dt = parse_lesson_time(day_str, lesson.get('time', ''), year)
+                    last_month = start_dt.month
+                except Exception as e:
+                    self.logger.warning(f"Ошибка парсинга времени '{day_str} {lesson.get('time')}': {e}")
+                    continue
+
+                time_slots.append(TimeSlot(
+                    start=start_dt,
+                    end=end_dt,
+                    title=subject,
+                    description="\n".join(
+                        f"{k}: {v}" for k, v in [
+                            ("Тип", lesson.get('type')),
+                            ("Аудитория", lesson.get('room')),
+                            ("Преподаватель", lesson.get('teacher')),
+                            ("Время", lesson.get('time'))
+                        ] if v
+                    ),
+                    board_name=board_name
+                ))
+
+        return time_slots
+
+
+class InMemorySlotSource(SlotSource):
+    """Источник слотов из готовых списков TimeSlot (синтетические расписания, бенчмарки)."""
+
+    def __init__(self, time_slots: Optional[Dict[str, List[TimeSlot]]] = None):
+        """
+        Инициализация источника.
+
+        Args:
+            time_slots: Словарь название доски -> список временных слотов.
+        """
+        self._time_slots: Dict[str, List[TimeSlot]] = dict(time_slots or {})
+
+    def set_time_slots(self, board_name: str, time_slots: List[TimeSlot]) -> None:
+        """
+        Задаёт временные слоты доски (заменяя прежние).
+
+        Args:
+            board_name: Название доски (расписания).
+            time_slots: Список временных слотов.
+        """
+        self._time_slots[board_name] = list(time_slots)
+
+    def list_boards(self) -> List[str]:
+        """Возвращает названия всех досок источника."""
+        return list(self._time_slots)
+
+    def load_time_slots(self, board_name: str) -> List[TimeSlot]:
+        """
+        Возвращает временные слоты доски.
+
+        Args:
+            board_name: Название доски.
+
+        Returns:
+            List[TimeSlot]: Список временных слотов (пустой, если доски нет).
+        """
+        return list(self._time_slots.get(board_name, []))
@@ -0,0 +1,152 @@
+"""
+Замеры этапов анализа расписания.
+
+StageTimer накапливает длительности этапов (авторизация, загрузка данных YouGile,
+загрузка слотов, построение деревьев, поиск, оценка, запись результатов) и
+счётчики (кандидаты, запросы к дереву, вызовы API). Выключенный таймер
+ничего не замеряет, поэтому анализатор вызывает его без проверок.
+Дополнительно таймер может снять профиль cProfile в файл: профилируются
+функции, выполненные через run (в том потоке, где они работают).
+"""
+
+import cProfile
+import logging
+import os
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Any, Optional, Iterator, List, Callable
+
+logger = logging.getLogger('ScheduleAnalyzer')
+
+
+class StageTimer:
+    """Накопитель длительностей этапов и счётчиков одного запроса анализа."""
+
+    def __init__(self, enabled: bool = True, profile_path: Optional[str] = None):
+        """
+        Инициализация таймера.
+
+        Args:
+            enabled: Замерять этапы и вести счётчики.
+            profile_path: Файл для профиля cProfile (None - без профилирования).
+        """
+        self.enabled = enabled
+        self.profile_path = profile_path
+        self.stages: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.total_seconds: Optional[float] = None
+        self._started: Optional[float] = None
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def __enter__(self) -> 'StageTimer':
+        """Начинает замер запроса и, если задан файл, создаёт профиль."""
+        self._started = perf_counter()
+        if self.profile_path:
+            self._profiler = cProfile.Profile()
+        return self
+
+    def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Выполняет функцию, при профилировании - под профилировщиком.
+
+        Профилировщик включается в потоке вызова, поэтому функцию можно
+        выполнять в пуле потоков, не блокируя цикл событий.
+
+        Args:
+            func: Функция.
+            *args: Позиционные аргументы.
+            **kwargs: Именованные аргументы.
+
+        Returns:
+            Результат функции.
+        """
+        profiler = self._profiler
+        if profiler is None:
+            return func(*args, **kwargs)
+        try:
+            profiler.enable()
+        except ValueError as e:
+            # В потоке уже работает другой профилировщик
+            logger.warning(f"Профилирование недоступно: {e}")
+            return func(*args, **kwargs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        """Завершает замер запроса и сохраняет профиль."""
+        self.total_seconds = perf_counter() - self._started
+        if self._profiler is not None:
+            self._profiler.disable()
+            try:
+                directory = os.path.dirname(self.profile_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._profiler.dump_stats(self.profile_path)
+                logger.info(f"Профиль анализа сохранён: {self.profile_path}")
+            except OSError as e:
+                logger.error(f"Ошибка при сохранении профиля: {e}")
+                self.profile_path = None
+            self._profiler = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Замеряет этап (вложенные этапы учитываются и в объемлющем).
+
+        Args:
+            name: Название этапа.
+        """
+        if not self.enabled:
+            yield
+            return
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - started)
+
+    def add(self, name: str, seconds: float, calls: int = 1) -> None:
+        """
+        Добавляет длительность к этапу.
+
+        Args:
+            name: Название этапа.
+            seconds: Длительность (секунды).
+            calls: Количество выполнений этапа.
+        """
+        if not self.enabled:
+            return
+        totals = self.stages.setdefault(name, [0.0, 0])
+        totals[0] += seconds
+        totals[1] += calls
+
+    def count(self, name: str, value: int = 1) -> None:
+        """
+        Увеличивает счётчик.
+
+        Args:
+            name: Название счётчика.
+            value: Приращение.
+        """
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Возвращает замеры в формате ответа API.
+
+        Returns:
+            Dict[str, Any]: Общее время, этапы (секунды и количество выполнений),
+                счётчики и файл профиля.
+        """
+        return {
+            "total_seconds": round(self.total_seconds, 6) if self.total_seconds is not None else None,
+            "stages": {
+                name: {"seconds": round(seconds, 6), "calls": calls}
+                for name, (seconds, calls) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+            "profile_file": self.profile_path
+        }
@@ -0,0 +1,158 @@
+"""
+Календарь рабочих и нерабочих дней для поиска окон.
+
+Праздники РФ загружаются лениво по годам и кэшируются на весь процесс, поэтому
+анализаторы, создаваемые на каждый запрос, не загружают их повторно. Поверх
+праздников применяются переопределения академического календаря МЭИ: сессии
+и каникулы (нерабочие дни) и перенесённые рабочие дни.
+"""
+
+import json
+import logging
+import threading
+from datetime import date, timedelta
+from typing import Dict, FrozenSet, Iterable, Set, Tuple
+
+import holidays
+
+logger = logging.getLogger('ScheduleAnalyzer')
+
+# Праздники РФ по годам, общие для всех анализаторов процесса
+_RU_HOLIDAYS_BY_YEAR: Dict[int, FrozenSet[date]] = {}
+_RU_HOLIDAYS_LOCK = threading.Lock()
+
+
+def get_ru_holidays(year: int) -> FrozenSet[date]:
+    """
+    Возвращает праздничные дни России за год (с кэшированием на процесс).
+
+    Args:
+        year: Год.
+
+    Returns:
+        FrozenSet[date]: Праздничные дни года.
+    """
+    year_holidays = _RU_HOLIDAYS_BY_YEAR.get(year)
+    if year_holidays is None:
+        with _RU_HOLIDAYS_LOCK:
+            year_holidays = _RU_HOLIDAYS_BY_YEAR.get(year)
+            if year_holidays is None:
+                try:
+                    year_holidays = frozenset(holidays.RU(years=year).keys())
+                except Exception as e:
+                    logger.error(f"Ошибка при загрузке праздников за {year} год: {e}")
+                    year_holidays = frozenset()
+                _RU_HOLIDAYS_BY_YEAR[year] = year_holidays
+    return year_holidays
+
+
+def _parse_date(value) -> date:
+    """Преобразует дату из строки ISO (или возвращает date как есть)."""
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class WorkCalendar:
+    """
+    Календарь нерабочих дней: выходные, праздники РФ и переопределения
+    академического календаря.
+
+    Дни из days_off (сессии, каникулы) считаются праздничными, дни из
+    working_days (перенесённые рабочие дни) - рабочими, даже если выпадают
+    на выходной или праздник.
+    """
+
+    def __init__(self, weekend_days: Iterable[int] = (5, 6), days_off: Iterable[date] = (),
+                 working_days: Iterable[date] = (), session_periods: Iterable[Tuple[date, date]] = ()):
+        """
+        Инициализация календаря.
+
+        Args:
+            weekend_days: Дни недели выходных (0=понедельник).
+            days_off: Дополнительные нерабочие дни.
+            working_days: Перенесённые рабочие дни.
+            session_periods: Периоды сессий и каникул (начало, конец включительно).
+        """
+        self.weekend_days: Set[int] = set(weekend_days)
+        self.days_off: Set[date] = set(days_off)
+        self.working_days: Set[date] = set(working_days)
+        for period_start, period_end in session_periods:
+            day = period_start
+            while day <= period_end:
+                self.days_off.add(day)
+                day += timedelta(days=1)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'WorkCalendar':
+        """
+        Создаёт календарь из словаря переопределений.
+
+        Формат: {"weekend_days": [5, 6], "days_off": ["2026-01-12", ...],
+        "working_days": ["2025-11-01", ...], "session_periods": [["2026-01-10", "2026-01-31"], ...]}.
+
+        Args:
+            data: Словарь переопределений.
+
+        Returns:
+            WorkCalendar: Календарь.
+        """
+        return cls(
+            weekend_days=data.get("weekend_days", (5, 6)),
+            days_off=[_parse_date(d) for d in data.get("days_off", [])],
+            working_days=[_parse_date(d) for d in data.get("working_days", [])],
+            session_periods=[(_parse_date(s), _parse_date(e)) for s, e in data.get("session_periods", [])]
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> 'WorkCalendar':
+        """
+        Загружает календарь из JSON-файла переопределений (формат from_dict).
+
+        Args:
+            path: Путь к JSON-файлу.
+
+        Returns:
+            WorkCalendar: Календарь.
+        """
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def is_holiday(self, day: date) -> bool:
+        """Проверяет, является ли день праздничным или нерабочим по академическому календарю."""
+        if day in self.working_days:
+            return False
+        return day in self.days_off or day in get_ru_holidays(day.year)
+
+    def is_weekend(self, day: date) -> bool:
+        """Проверяет, является ли день выходным (с учётом перенесённых рабочих дней)."""
+        return day.weekday() in self.weekend_days and day not in self.working_days
+
+    def is_working_day(self, day: date) -> bool:
+        """Проверяет, является ли день рабочим."""
+        return not self.is_weekend(day) and not self.is_holiday(day)
+
+    def excluded_days(self, start_date: date, end_date: date,
+                      include_holidays: bool, include_weekends: bool) -> Set[date]:
+        """
+        Возвращает множество дней диапазона, которые пропускаются при поиске.
+
+        Args:
+            start_date: Начальная дата.
+            end_date: Конечная дата (включительно).
+            include_holidays: Включать праздничные дни.
+            include_weekends: Включать выходные дни.
+
+        Returns:
+            Set[date]: Пропускаемые дни.
+        """
+        excluded = set()
+        if include_holidays and include_weekends:
+            return excluded
+
+        day = start_date
+        while day <= end_date:
+            if (not include_holidays and self.is_holiday(day)) or \
+               (not include_weekends and self.is_weekend(day)):
+                excluded.add(day)
+            day += timedelta(days=1)
+        return excluded
+
@@ -2,6 +2,15 @@
 Модуль парсинга расписания БАРС МЭИ
 """
 
-from .parser import MPEIRuzParser
+from .schedule_format import MONTH_MAP, parse_lesson_time
 
-__all__ = ['MPEIRuzParser']
+__all__ = ['MPEIRuzParser', 'MONTH_MAP', 'parse_lesson_time']
+
+
+def __getattr__(name):
+    # Парсер (и Selenium) загружается при первом обращении, чтобы разбор
+    # формата расписания был доступен без браузерных зависимостей
+    if name == 'MPEIRuzParser':
+        from .parser import MPEIRuzParser
+        return MPEIRuzParser
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,38 @@
+"""
+Формат расписания MPEIRuzParser.
+
+Разбор даты дня ("Понедельник, 29 декабря") и времени занятия ("09:20-10:55")
+общий для интеграции с YouGile и локального анализа расписаний. Модуль не
+зависит от Selenium, поэтому импортируется без загрузки парсера.
+"""
+
+from datetime import datetime
+from typing import Tuple
+
+MONTH_MAP = {
+    "января": 1, "февраля": 2, "марта": 3, "апреля": 4, "мая": 5, "июня": 6,
+    "июля": 7, "августа": 8, "сентября": 9, "октября": 10, "ноября": 11, "декабря": 12
+}
+
+
+def parse_lesson_time(day_str: str, time_str: str, year: int) -> Tuple[datetime, datetime]:
+    """
+    Преобразование даты дня и времени занятия в начало и конец занятия.
+
+    Args:
+        day_str: День в формате парсера, например "Понедельник, 29 декабря".
+        time_str: Время занятия, например "09:20-10:55".
+        year: Год дня (в формате парсера год не указывается).
+
+    Returns:
+        Tuple[datetime, datetime]: Начало и конец занятия.
+
+    Raises:
+        ValueError, KeyError, IndexError: Некорректная дата или время.
+    """
+    day, month_name = day_str.split(',')[1].strip().split()
+    month = MONTH_MAP[month_name.lower()]
+    start_time, end_time = time_str.split('-')
+    start_dt = datetime(year, month, int(day), *map(int, start_time.strip().split(':')))
+    end_dt = datetime(year, month, int(day), *map(int, end_time.strip().split(':')))
+    return start_dt, end_dt
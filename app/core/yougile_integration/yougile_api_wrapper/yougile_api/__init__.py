@@ -7,7 +7,16 @@ YouGile API Client
 """
 
 from .client import YouGileClient
-from .exceptions import YouGileApiError, YouGileAuthError, YouGileNotFoundError
+from .async_client import AsyncYouGileClient
+from .exceptions import (
+    YouGileApiError, YouGileAuthError, YouGileNotFoundError,
+    YouGileRateLimitError, YouGileServerError, YouGileConnectionError
+)
+from .retry import RetryPolicy
 
-__all__ = ['YouGileClient', 'YouGileApiError', 'YouGileAuthError', 'YouGileNotFoundError']
+__all__ = [
+    'YouGileClient', 'AsyncYouGileClient', 'RetryPolicy',
+    'YouGileApiError', 'YouGileAuthError', 'YouGileNotFoundError',
+    'YouGileRateLimitError', 'YouGileServerError', 'YouGileConnectionError'
+]
 __version__ = '0.1.0'
@@ -0,0 +1,202 @@
+"""
+Асинхронный клиент для работы с YouGile API.
+"""
+import asyncio
+import httpx
+from typing import Dict, Any, Optional, List, Union, Callable
+from .exceptions import (
+    YouGileApiError, YouGileAuthError, YouGileNotFoundError,
+    YouGileRateLimitError, YouGileServerError, YouGileConnectionError
+)
+from .retry import RetryPolicy, RETRYABLE_SERVER_STATUSES, parse_retry_after
+
+# Ресурсы общие с синхронным клиентом: их методы возвращают результат
+# request, который у асинхронного клиента нужно дождаться (await)
+from .resources.auth import AuthResource
+from .resources.boards import BoardsResource
+from .resources.chat_messages import ChatMessagesResource
+from .resources.columns import ColumnsResource
+from .resources.departments import DepartmentsResource
+from .resources.employees import EmployeesResource
+from .resources.companies import CompaniesResource
+from .resources.files import AsyncFilesResource
+from .resources.group_chats import GroupChatsResource
+from .resources.project_roles import ProjectRolesResource
+from .resources.projects import ProjectsResource
+from .resources.sprint_stickers import SprintStickersResource
+from .resources.sprint_sticker_states import SprintStickerStatesResource
+from .resources.string_stickers import StringStickersResource
+from .resources.string_sticker_states import StringStickerStatesResource
+from .resources.tasks import TasksResource
+from .resources.webhooks import WebhooksResource
+
+
+class AsyncYouGileClient:
+    """Асинхронный клиент для работы с YouGile API на httpx с пулом соединений."""
+
+    BASE_URL = "https://ru.yougile.com/api-v2"
+
+    def __init__(self, token: Optional[str] = None, login: Optional[str] = None, password: Optional[str] = None,
+                 timeout: float = 30.0, connect_timeout: float = 10.0, max_connections: int = 20,
+                 max_keepalive_connections: int = 10, http2: bool = False,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 on_auth_error: Optional[Callable[[str], None]] = None):
+        """
+        Инициализация клиента.
+
+        Args:
+            token: Токен для аутентификации
+            login: Логин
+            password: Пароль
+            timeout: Таймаут чтения, записи и ожидания соединения из пула (секунды)
+            connect_timeout: Таймаут установки соединения (секунды)
+            max_connections: Максимальное количество соединений
+            max_keepalive_connections: Количество соединений, сохраняемых открытыми
+            http2: Использовать HTTP/2 (требуется пакет httpx[http2])
+            retry_policy: Политика повторов запросов (по умолчанию RetryPolicy())
+            on_auth_error: Обработчик отклонённого сервером токена (получает токен)
+        """
+        self.token = token
+        self.login = login
+        self.password = password
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.on_auth_error = on_auth_error
+        self.session = httpx.AsyncClient(
+            base_url=self.BASE_URL,
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections
+            ),
+            http2=http2
+        )
+        # Количество выполненных запросов к API (для замеров)
+        self.request_count = 0
+
+        # Инициализация ресурсов
+        self.auth = AuthResource(self)
+        self.boards = BoardsResource(self)
+        self.chat_messages = ChatMessagesResource(self)
+        self.columns = ColumnsResource(self)
+        self.departments = DepartmentsResource(self)
+        self.employees = EmployeesResource(self)
+        self.companies = CompaniesResource(self)
+        self.files = AsyncFilesResource(self)
+        self.group_chats = GroupChatsResource(self)
+        self.project_roles = ProjectRolesResource(self)
+        self.projects = ProjectsResource(self)
+        self.sprint_stickers = SprintStickersResource(self)
+        self.sprint_sticker_states = SprintStickerStatesResource(self)
+        self.string_stickers = StringStickersResource(self)
+        self.string_sticker_states = StringStickerStatesResource(self)
+        self.tasks = TasksResource(self)
+        self.webhooks = WebhooksResource(self)
+
+    async def __aenter__(self) -> 'AsyncYouGileClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Закрыть соединения клиента."""
+        await self.session.aclose()
+
+    async def request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                      json: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Выполнить запрос к API.
+
+        Временные ошибки (429, 5xx, сетевые) повторяются согласно retry_policy.
+
+        Args:
+            method: HTTP метод
+            endpoint: Эндпоинт API
+            params: Параметры запроса
+            json: Данные для отправки в формате JSON
+
+        Returns:
+            dict или list: Ответ от API
+
+        Raises:
+            YouGileApiError: При ошибке API
+            YouGileAuthError: При ошибке аутентификации
+            YouGileNotFoundError: Если ресурс не найден
+            YouGileRateLimitError: При превышении лимита запросов после всех повторов
+            YouGileServerError: При ошибке сервера после всех повторов
+        """
+        # Подготовка заголовков
+        headers = {
+            "Content-Type": "application/json"
+        }
+
+        # Добавляем токен в заголовок Authorization, если он есть
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        attempt = 0
+        waited = 0.0
+        while True:
+            try:
+                return await self._send(method, endpoint, params, json, headers)
+            except YouGileApiError as e:
+                delay = self.retry_policy.get_delay(method, e, attempt, waited)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                waited += delay
+                attempt += 1
+
+    async def _send(self, method: str, endpoint: str, params: Optional[Dict[str, Any]],
+                    json: Optional[Dict[str, Any]], headers: Dict[str, str]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Выполнить одну попытку запроса."""
+        self.request_count += 1
+        try:
+            response = await self.session.request(method, endpoint, params=params, json=json, headers=headers)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            status = e.response.status_code
+            if status == 401:
+                if self.token and self.on_auth_error:
+                    self.on_auth_error(self.token)
+                raise YouGileAuthError("Ошибка аутентификации", status)
+            elif status == 404:
+                raise YouGileNotFoundError("Ресурс не найден", status)
+            elif status == 429:
+                raise YouGileRateLimitError("Превышен лимит запросов", status, parse_retry_after(e.response.headers))
+            elif status in RETRYABLE_SERVER_STATUSES:
+                raise YouGileServerError(f"Ошибка сервера: {e.response.text}", status, parse_retry_after(e.response.headers))
+            else:
+                raise YouGileApiError(f"Ошибка API: {e.response.text}", status)
+        except httpx.HTTPError as e:
+            raise YouGileConnectionError(f"Ошибка запроса: {str(e)}")
+        except ValueError:
+            raise YouGileApiError("Некорректный ответ от API")
+
+    def set_token(self, token: str) -> None:
+        """
+        Установить токен для аутентификации.
+
+        Args:
+            token: Токен для аутентификации
+        """
+        self.token = token
+
+    def set_login(self, login: str) -> None:
+        """
+        Установить логин для аутентификации.
+
+        Args:
+            login: Логин для аутентификации
+        """
+        self.login = login
+
+    def set_password(self, password: str) -> None:
+        """
+        Установить пароль для аутентификации.
+
+        Args:
+            password: Пароль для аутентификации
+        """
+        self.password = password
@@ -1,9 +1,14 @@
 """
 Клиент для работы с YouGile API.
 """
+import time
 import requests
-from typing import Dict, Any, Optional, List, Union
-from .exceptions import YouGileApiError, YouGileAuthError, YouGileNotFoundError
+from typing import Dict, Any, Optional, List, Union, Callable
+from .exceptions import (
+    YouGileApiError, YouGileAuthError, YouGileNotFoundError,
+    YouGileRateLimitError, YouGileServerError, YouGileConnectionError
+)
+from .retry import RetryPolicy, RETRYABLE_SERVER_STATUSES, parse_retry_after
 
 # Импорт ресурсов
 from .resources.auth import AuthResource
@@ -30,17 +35,25 @@ class YouGileClient:
     
     BASE_URL = "https://ru.yougile.com/api-v2"
     
-    def __init__(self, token: Optional[str] = None, login: Optional[str] = None, password: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, login: Optional[str] = None, password: Optional[str] = None,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 on_auth_error: Optional[Callable[[str], None]] = None):
         """
         Инициализация клиента.
         
         Args:
             token: Токен для аутентификации
+            retry_policy: Политика повторов запросов (по умолчанию RetryPolicy())
+            on_auth_error: Обработчик отклонённого сервером токена (получает токен)
         """
         self.token = token
         self.login = login
         self.password = password
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.on_auth_error = on_auth_error
         self.session = requests.Session()
+        # Количество выполненных запросов к API (для замеров)
+        self.request_count = 0
         
         # Инициализация ресурсов
         self.auth = AuthResource(self)
@@ -65,6 +78,8 @@ class YouGileClient:
                 json: Optional[Dict[str, Any]] = None) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
         """
         Выполнить запрос к API.
+
+        Временные ошибки (429, 5xx, сетевые) повторяются согласно retry_policy.
         
         Args:
             method: HTTP метод
@@ -79,6 +94,8 @@ class YouGileClient:
             YouGileApiError: При ошибке API
             YouGileAuthError: При ошибке аутентификации
             YouGileNotFoundError: Если ресурс не найден
+            YouGileRateLimitError: При превышении лимита запросов после всех повторов
+            YouGileServerError: При ошибке сервера после всех повторов
         """
         url = f"{self.BASE_URL}{endpoint}"
         
@@ -91,19 +108,43 @@ class YouGileClient:
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
 
+        attempt = 0
+        waited = 0.0
+        while True:
+            try:
+                return self._send(method, url, params, json, headers)
+            except YouGileApiError as e:
+                delay = self.retry_policy.get_delay(method, e, attempt, waited)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                waited += delay
+                attempt += 1
+
+    def _send(self, method: str, url: str, params: Optional[Dict[str, Any]], json: Optional[Dict[str, Any]],
+              headers: Dict[str, str]) -> Union[Dict[str, Any], List[Dict[str, Any]]]:
+        """Выполнить одну попытку запроса."""
+        self.request_count += 1
         try:
             response = self.session.request(method, url, params=params, json=json, headers=headers)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.HTTPError as e:
-            if response.status_code == 401:
-                raise YouGileAuthError("Ошибка аутентификации")
-            elif response.status_code == 404:
-                raise YouGileNotFoundError("Ресурс не найден")
+            status = response.status_code
+            if status == 401:
+                if self.token and self.on_auth_error:
+                    self.on_auth_error(self.token)
+                raise YouGileAuthError("Ошибка аутентификации", status)
+            elif status == 404:
+                raise YouGileNotFoundError("Ресурс не найден", status)
+            elif status == 429:
+                raise YouGileRateLimitError("Превышен лимит запросов", status, parse_retry_after(response.headers))
+            elif status in RETRYABLE_SERVER_STATUSES:
+                raise YouGileServerError(f"Ошибка сервера: {response.text}", status, parse_retry_after(response.headers))
             else:
-                raise YouGileApiError(f"Ошибка API: {response.text}")
+                raise YouGileApiError(f"Ошибка API: {response.text}", status)
         except requests.exceptions.RequestException as e:
-            raise YouGileApiError(f"Ошибка запроса: {str(e)}")
+            raise YouGileConnectionError(f"Ошибка запроса: {str(e)}")
         except ValueError:
             raise YouGileApiError("Некорректный ответ от API")
             
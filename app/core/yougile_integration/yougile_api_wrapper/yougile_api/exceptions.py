@@ -1,10 +1,15 @@
 """
 Исключения для работы с YouGile API.
 """
+from typing import Optional
+
 
 class YouGileApiError(Exception):
     """Базовое исключение для ошибок API."""
-    pass
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
 
 class YouGileAuthError(YouGileApiError):
     """Исключение для ошибок аутентификации."""
@@ -17,3 +22,22 @@ class YouGileNotFoundError(YouGileApiError):
 class YouGileValidationError(YouGileApiError):
     """Исключение для ошибок валидации данных."""
     pass
+
+class YouGileRetryableError(YouGileApiError):
+    """Базовое исключение для временных ошибок, после которых запрос можно повторить."""
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message, status_code)
+        self.retry_after = retry_after
+
+class YouGileRateLimitError(YouGileRetryableError):
+    """Исключение для превышения лимита запросов (429 Too Many Requests)."""
+    pass
+
+class YouGileServerError(YouGileRetryableError):
+    """Исключение для ошибок сервера (5xx)."""
+    pass
+
+class YouGileConnectionError(YouGileRetryableError):
+    """Исключение для сетевых ошибок и таймаутов."""
+    pass
@@ -9,7 +9,7 @@ from .columns import ColumnsResource
 from .departments import DepartmentsResource
 from .employees import EmployeesResource
 from .companies import CompaniesResource
-from .files import FilesResource
+from .files import FilesResource, AsyncFilesResource
 from .group_chats import GroupChatsResource
 from .project_roles import ProjectRolesResource
 from .projects import ProjectsResource
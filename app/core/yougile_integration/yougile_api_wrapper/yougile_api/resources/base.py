@@ -1,7 +1,34 @@
 """
 Базовый класс для всех ресурсов API.
 """
-from typing import Dict, Any, Optional, List, Union
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Union, Callable, Iterator, AsyncIterator, Tuple
+
+# Максимальный размер страницы списка в YouGile API
+MAX_PAGE_SIZE = 1000
+
+
+def _page_items(response: Union[Dict[str, Any], List[Dict[str, Any]]], page_size: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Разобрать страницу списка.
+
+    Args:
+        response: Ответ API ({"paging": {...}, "content": [...]} или список)
+        page_size: Запрошенный размер страницы
+
+    Returns:
+        tuple: Объекты страницы и признак наличия следующей страницы
+    """
+    if isinstance(response, list):
+        return response, False
+    items = response.get('content') or []
+    paging = response.get('paging') or {}
+    has_next = paging.get('next')
+    if has_next is None:
+        has_next = len(items) >= page_size
+    return items, bool(has_next) and bool(items)
 
 
 class BaseResource:
@@ -31,6 +58,88 @@ class CRUDResourceMixin:
             list: Список объектов
         """
         return self._client.request('GET', self._base_url, params=params)
+
+    def iterate(self, page_size: int = MAX_PAGE_SIZE, prefetch: int = 0,
+                call: Optional[Callable[..., Any]] = None, **params) -> Iterator[Dict[str, Any]]:
+        """
+        Получить все объекты списка постранично.
+
+        Страницы запрашиваются по мере чтения (по смещению, пока в ответе
+        paging.next). При prefetch > 0 следующие страницы запрашиваются
+        заранее параллельно; после последней страницы может быть выполнено
+        до prefetch лишних запросов.
+
+        Args:
+            page_size: Размер страницы (не больше 1000)
+            prefetch: Количество страниц, запрашиваемых заранее
+            call: Обёртка вызова метода API: call(method, **kwargs)
+                (например, с ограничением частоты запросов)
+            **params: Параметры запроса (фильтры метода list)
+
+        Yields:
+            dict: Объекты списка
+        """
+        call = call or (lambda method, **kwargs: method(**kwargs))
+        page_size = min(page_size, MAX_PAGE_SIZE)
+
+        if prefetch <= 0:
+            offset = 0
+            while True:
+                items, has_next = _page_items(call(self.list, limit=page_size, offset=offset, **params), page_size)
+                yield from items
+                if not has_next:
+                    return
+                offset += page_size
+
+        with ThreadPoolExecutor(max_workers=prefetch + 1) as pool:
+            pending = deque()
+            offset = 0
+            for _ in range(prefetch + 1):
+                pending.append(pool.submit(call, self.list, limit=page_size, offset=offset, **params))
+                offset += page_size
+            try:
+                while pending:
+                    items, has_next = _page_items(pending.popleft().result(), page_size)
+                    yield from items
+                    if not has_next:
+                        return
+                    pending.append(pool.submit(call, self.list, limit=page_size, offset=offset, **params))
+                    offset += page_size
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    async def aiterate(self, page_size: int = MAX_PAGE_SIZE, prefetch: int = 0,
+                       **params) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Получить все объекты списка постранично (для асинхронного клиента).
+
+        Args:
+            page_size: Размер страницы (не больше 1000)
+            prefetch: Количество страниц, запрашиваемых заранее
+            **params: Параметры запроса (фильтры метода list)
+
+        Yields:
+            dict: Объекты списка
+        """
+        page_size = min(page_size, MAX_PAGE_SIZE)
+        pending = deque()
+        offset = 0
+        for _ in range(max(prefetch, 0) + 1):
+            pending.append(asyncio.ensure_future(self.list(limit=page_size, offset=offset, **params)))
+            offset += page_size
+        try:
+            while pending:
+                items, has_next = _page_items(await pending.popleft(), page_size)
+                for item in items:
+                    yield item
+                if not has_next:
+                    return
+                pending.append(asyncio.ensure_future(self.list(limit=page_size, offset=offset, **params)))
+                offset += page_size
+        finally:
+            for task in pending:
+                task.cancel()
         
     def create(self, **data) -> Dict[str, Any]:
         """
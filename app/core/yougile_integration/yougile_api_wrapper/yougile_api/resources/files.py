@@ -39,3 +39,33 @@ class FilesResource(BaseResource):
         # Возвращаем URL загруженного файла
         return response.text
 
+
+class AsyncFilesResource(FilesResource):
+    """Ресурс для работы с файлами для асинхронного клиента."""
+
+    async def upload(self, file_data: BinaryIO, file_name: Optional[str] = None) -> str:
+        """
+        Загрузить файл.
+
+        Args:
+            file_data: Данные файла
+            file_name: Имя файла
+
+        Returns:
+            str: URL загруженного файла
+        """
+        files = {'file': (file_name, file_data) if file_name else ('file', file_data)}
+
+        # Подготовка заголовков
+        headers = {}
+
+        # Добавляем токен в заголовок Authorization, если он есть
+        if self._client.token:
+            headers["Authorization"] = f"Bearer {self._client.token}"
+
+        response = await self._client.session.post(self._base_url, files=files, headers=headers)
+        response.raise_for_status()
+
+        # Возвращаем URL загруженного файла
+        return response.text
+
@@ -0,0 +1,116 @@
+"""
+Политика повторов запросов к YouGile API.
+"""
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Mapping, Optional, FrozenSet
+
+from .exceptions import (
+    YouGileApiError, YouGileRateLimitError, YouGileServerError, YouGileConnectionError
+)
+
+# Ответы сервера, после которых запрос имеет смысл повторить
+RETRYABLE_SERVER_STATUSES = frozenset({500, 502, 503, 504})
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Получить рекомендуемую сервером задержку из заголовков ответа.
+
+    Поддерживаются Retry-After (секунды или HTTP-дата) и заголовки сброса
+    лимита X-RateLimit-Reset / RateLimit-Reset (секунды или Unix-время).
+
+    Args:
+        headers: Заголовки ответа
+
+    Returns:
+        float: Задержка в секундах или None, если сервер её не указал
+    """
+    value = headers.get('Retry-After')
+    if value:
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError, IndexError):
+                pass
+
+    for name in ('X-RateLimit-Reset', 'RateLimit-Reset'):
+        value = headers.get(name)
+        if not value:
+            continue
+        try:
+            reset = float(value)
+        except ValueError:
+            continue
+        # Большие значения - момент сброса в Unix-времени, малые - секунды до сброса
+        return max(0.0, reset - time.time()) if reset > 1e9 else max(0.0, reset)
+    return None
+
+
+class RetryPolicy:
+    """
+    Политика повторов запросов.
+
+    Превышение лимита (429) повторяется для любых запросов: сервер их не
+    выполнял. Ошибки сервера и сетевые ошибки повторяются только для
+    идемпотентных методов, иначе повтор POST может создать дубликат.
+    Задержка берётся из подсказки сервера (Retry-After) или растёт
+    экспоненциально со случайным разбросом; суммарное ожидание одного
+    запроса ограничено бюджетом.
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, min_delay: float = 0.5,
+                 max_delay: float = 30.0, budget: float = 60.0,
+                 idempotent_methods: FrozenSet[str] = frozenset({'GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS'})):
+        """
+        Инициализация политики.
+
+        Args:
+            max_retries: Максимальное количество повторов одного запроса
+            base_delay: Базовая задержка экспоненциального роста (секунды)
+            min_delay: Минимальная задержка перед повтором (секунды)
+            max_delay: Максимальная задержка без подсказки сервера (секунды)
+            budget: Максимальное суммарное ожидание повторов одного запроса (секунды)
+            idempotent_methods: Методы, которые можно повторять после ошибок сервера и сети
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.idempotent_methods = idempotent_methods
+
+    def get_delay(self, method: str, error: YouGileApiError, attempt: int, waited: float) -> Optional[float]:
+        """
+        Получить задержку перед повтором запроса.
+
+        Args:
+            method: HTTP метод
+            error: Ошибка последней попытки
+            attempt: Номер повтора (с нуля)
+            waited: Суммарное ожидание предыдущих повторов (секунды)
+
+        Returns:
+            float: Задержка в секундах или None, если запрос повторять не нужно
+        """
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, YouGileRateLimitError):
+            pass
+        elif isinstance(error, (YouGileServerError, YouGileConnectionError)):
+            if method.upper() not in self.idempotent_methods:
+                return None
+        else:
+            return None
+
+        if error.retry_after is not None:
+            delay = max(error.retry_after, self.min_delay)
+        else:
+            delay = random.uniform(self.min_delay, max(self.min_delay, min(self.max_delay, self.base_delay * 2 ** attempt)))
+        if waited + delay > self.budget:
+            return None
+        return delay
@@ -0,0 +1,374 @@
+"""
+Общий для запросов кэш сущностей YouGile.
+
+Кэши интегратора живут вместе с ним, то есть один запрос. EntityCache хранит
+проекты, доски, колонки, задачи, сотрудников и стикеры между запросами
+одного пользователя компании (данные, видимые его ключу API): интеграторы, созданные с entity_cache, работают с его словарями
+и не запрашивают уже загруженные части данных повторно. Актуальность
+поддерживается событиями вебхуков YouGile (apply_event), а при их отсутствии
+- полной перезагрузкой после истечения ttl. При оформленной подписке на
+вебхуки кэш перезагружается только после истечения resync_ttl (на случай
+пропущенных событий). Кэш можно сохранять в SQLite, чтобы он переживал
+перезапуск сервиса.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from yougile_integration.yougile_api_wrapper.yougile_api.models import (
+    Project, Board, Column, Task, Employee, StringSticker
+)
+
+logger = logging.getLogger(__name__)
+
+# Вид сущности -> (атрибут кэша, модель)
+ENTITY_KINDS = {
+    'projects': ('projects', Project),
+    'boards': ('boards', Board),
+    'columns': ('columns', Column),
+    'tasks': ('tasks', Task),
+    'employees': ('employees', Employee),
+    'string_stickers': ('string_stickers', StringSticker),
+}
+
+# Префикс события вебхука -> вид сущности
+EVENT_KINDS = {
+    'project': 'projects',
+    'board': 'boards',
+    'column': 'columns',
+    'task': 'tasks',
+}
+
+# Вид сущности -> (поле родителя в данных события, вид родителя)
+PARENT_FIELDS = {
+    'boards': ('projectId', 'projects'),
+    'columns': ('boardId', 'boards'),
+    'tasks': ('columnId', 'columns'),
+}
+
+# События, на которые подписывается кэш
+WEBHOOK_EVENTS = ['project-*', 'board-*', 'column-*', 'task-*']
+
+
+class EntityCache:
+    """Потокобезопасный кэш сущностей пользователя компании YouGile."""
+
+    def __init__(self, ttl: float = 300.0, db_path: Optional[str] = None, resync_ttl: float = 86400.0):
+        """
+        Инициализация кэша.
+
+        Args:
+            ttl: Время до полной перезагрузки данных без вебхуков (секунды, 0 - без ограничения).
+            db_path: Файл SQLite для сохранения кэша (None - только в памяти).
+            resync_ttl: Время до полной перезагрузки данных, обновляемых вебхуками
+                (секунды, 0 - без ограничения).
+        """
+        self.ttl = ttl
+        self.resync_ttl = resync_ttl
+        self.db_path = db_path
+        self.lock = threading.RLock()
+
+        # Словари заменяются целиком при clear(), поэтому интеграторы
+        # получают ссылки на них под блокировкой (см. bind)
+        self.projects: Dict[str, Project] = {}
+        self.boards: Dict[str, Board] = {}
+        self.columns: Dict[str, Column] = {}
+        self.tasks: Dict[str, Task] = {}
+        self.employees: Dict[str, Employee] = {}
+        self.string_stickers: Dict[str, StringSticker] = {}
+        # Загруженные части данных (см. ScheduleIntegrator._fetch_scope)
+        self.fetched_scopes = set()
+        self.loaded_at = time.time()
+        # Подписка на вебхуки оформлена (обновления приходят событиями)
+        self.webhooks_subscribed = False
+
+    def _ttl(self, webhooks_subscribed: bool) -> float:
+        """Срок хранения данных: resync_ttl, если их обновляют вебхуки, иначе ttl."""
+        return self.resync_ttl if webhooks_subscribed else self.ttl
+
+    def is_expired(self) -> bool:
+        """Проверка истечения срока хранения данных."""
+        ttl = self._ttl(self.webhooks_subscribed)
+        return bool(ttl) and time.time() - self.loaded_at >= ttl
+
+    def clear(self):
+        """
+        Очистка кэша для полной перезагрузки.
+
+        Словари не очищаются на месте, а заменяются новыми (копирование при
+        записи): интеграторы, уже работающие со старыми словарями, доводят
+        анализ или синхронизацию на прежних данных и не видят пустую доску
+        посреди работы. Новые интеграторы получают новые словари.
+        """
+        with self.lock:
+            for attr, _ in ENTITY_KINDS.values():
+                setattr(self, attr, {})
+            self.fetched_scopes = set()
+            self.loaded_at = time.time()
+        logger.info("Кэш сущностей YouGile очищен для перезагрузки")
+
+    def refresh_if_expired(self) -> bool:
+        """
+        Очистка кэша после истечения ttl.
+
+        Returns:
+            bool: Кэш был очищен.
+        """
+        with self.lock:
+            if not self.is_expired():
+                return False
+            self.clear()
+            return True
+
+    def bind(self) -> Dict[str, Any]:
+        """
+        Получение текущих словарей кэша для интегратора.
+
+        Кэш с истёкшим ttl предварительно очищается. Ссылки берутся под
+        блокировкой, поэтому интегратор получает согласованный набор словарей,
+        который не будет очищен, пока он с ним работает.
+
+        Returns:
+            Dict[str, Any]: Словари сущностей по видам и множество fetched_scopes.
+        """
+        with self.lock:
+            self.refresh_if_expired()
+            refs: Dict[str, Any] = {kind: getattr(self, attr) for kind, (attr, _) in ENTITY_KINDS.items()}
+            refs['fetched_scopes'] = self.fetched_scopes
+            return refs
+
+    def apply_event(self, event: str, payload: Dict[str, Any]) -> bool:
+        """
+        Применение события вебхука YouGile к кэшу.
+
+        Созданные, изменённые и перемещённые сущности заменяются в кэше
+        данными события (поля, отсутствующие в событии, сохраняются),
+        удалённые - удаляются. События приходят по всей компании, поэтому
+        новая сущность добавляется, только если в кэше есть её родитель
+        (колонка задачи, доска колонки, проект доски), а сущность,
+        перемещённая к незагруженному родителю, удаляется из кэша: кэш не
+        получает объекты, которых пользователь не видел.
+
+        Args:
+            event: Название события, например task-updated.
+            payload: Данные сущности из события.
+
+        Returns:
+            bool: Событие применено (сущность поддерживается кэшем).
+        """
+        kind = EVENT_KINDS.get(event.split('-', 1)[0])
+        entity_id = payload.get('id') if isinstance(payload, dict) else None
+        if not kind or not entity_id:
+            return False
+
+        attr, model_class = ENTITY_KINDS[kind]
+        with self.lock:
+            cache_dict = getattr(self, attr)
+            if event.endswith('-deleted') or payload.get('deleted'):
+                cache_dict.pop(entity_id, None)
+                self._persist(kind, entity_id, None)
+                return True
+            current = cache_dict.get(entity_id)
+            parent_field, parent_kind = PARENT_FIELDS.get(kind, (None, None))
+            parent_id = payload.get(parent_field) if parent_field else None
+            parent_known = bool(parent_id) and parent_id in getattr(self, ENTITY_KINDS[parent_kind][0])
+            if current is None and not parent_known:
+                return False
+            if current is not None and parent_id and not parent_known:
+                cache_dict.pop(entity_id, None)
+                self._persist(kind, entity_id, None)
+                return True
+            data = current.model_dump(by_alias=True, exclude_none=True) if current else {}
+            data.update(payload)
+            try:
+                obj = model_class.model_validate(data)
+            except Exception as e:
+                logger.error(f"Некорректные данные события {event}: {e}")
+                return False
+            cache_dict[entity_id] = obj
+            self._persist(kind, entity_id, obj)
+        return True
+
+    def _connect(self) -> sqlite3.Connection:
+        """Соединение с файлом кэша (создаёт таблицы при необходимости)."""
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.db_path)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS entities (kind TEXT, id TEXT, data TEXT, PRIMARY KEY (kind, id))"
+        )
+        connection.execute("CREATE TABLE IF NOT EXISTS scopes (scope TEXT PRIMARY KEY)")
+        connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        return connection
+
+    def _persist(self, kind: str, entity_id: str, obj):
+        """Сохранение (или удаление при obj=None) одной сущности в файле кэша."""
+        if not self.db_path:
+            return
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    if obj is None:
+                        connection.execute("DELETE FROM entities WHERE kind = ? AND id = ?", (kind, entity_id))
+                    else:
+                        connection.execute(
+                            "INSERT OR REPLACE INTO entities (kind, id, data) VALUES (?, ?, ?)",
+                            (kind, entity_id, obj.model_dump_json(by_alias=True, exclude_none=True))
+                        )
+            finally:
+                connection.close()
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении кэша сущностей: {e}")
+
+    def save(self):
+        """Сохранение всего кэша в файл SQLite."""
+        if not self.db_path:
+            return
+        try:
+            with self.lock:
+                rows = [
+                    (kind, entity_id, obj.model_dump_json(by_alias=True, exclude_none=True))
+                    for kind, (attr, _) in ENTITY_KINDS.items()
+                    for entity_id, obj in list(getattr(self, attr).items())
+                ]
+                scopes = [(json.dumps(list(scope)),) for scope in list(self.fetched_scopes)]
+                connection = self._connect()
+                try:
+                    with connection:
+                        connection.execute("DELETE FROM entities")
+                        connection.execute("DELETE FROM scopes")
+                        connection.executemany("INSERT INTO entities (kind, id, data) VALUES (?, ?, ?)", rows)
+                        connection.executemany("INSERT INTO scopes (scope) VALUES (?)", scopes)
+                        connection.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+                            ('loaded_at', str(self.loaded_at)),
+                            ('webhooks_subscribed', '1' if self.webhooks_subscribed else '0')
+                        ])
+                finally:
+                    connection.close()
+        except Exception as e:
+            logger.error(f"Ошибка при сохранении кэша сущностей: {e}")
+
+    def load(self) -> bool:
+        """
+        Загрузка кэша из файла SQLite.
+
+        Данные загружаются по тому же правилу срока хранения, что и в памяти:
+        данные, которые обновлялись вебхуками, - если загружены не раньше чем
+        resync_ttl назад, остальные - если не раньше чем ttl назад. Если
+        подписка на вебхуки после перезапуска не оформится, кэш с более
+        старыми данными будет перезагружен при первом использовании (bind).
+
+        Returns:
+            bool: Кэш загружен.
+        """
+        if not self.db_path or not os.path.isfile(self.db_path):
+            return False
+        try:
+            connection = self._connect()
+            try:
+                meta = dict(connection.execute("SELECT key, value FROM meta").fetchall())
+                if 'loaded_at' not in meta:
+                    return False
+                loaded_at = float(meta['loaded_at'])
+                ttl = self._ttl(meta.get('webhooks_subscribed') == '1')
+                if ttl and time.time() - loaded_at >= ttl:
+                    return False
+                entities = connection.execute("SELECT kind, id, data FROM entities").fetchall()
+                scopes = connection.execute("SELECT scope FROM scopes").fetchall()
+            finally:
+                connection.close()
+
+            with self.lock:
+                for kind, entity_id, data in entities:
+                    if kind in ENTITY_KINDS:
+                        attr, model_class = ENTITY_KINDS[kind]
+                        getattr(self, attr)[entity_id] = model_class.model_validate_json(data)
+                self.fetched_scopes.update(tuple(json.loads(scope)) for scope, in scopes)
+                self.loaded_at = loaded_at
+            logger.info(f"Кэш сущностей загружен из {self.db_path}: {len(entities)} объектов")
+            return True
+        except Exception as e:
+            logger.error(f"Ошибка при загрузке кэша сущностей: {e}")
+            return False
+
+    def subscribe_webhooks(self, client, url: str) -> bool:
+        """
+        Подписка на события YouGile для обновления кэша.
+
+        Существующие подписки на тот же URL не дублируются.
+
+        Args:
+            client: Клиент YouGile API с ключом компании.
+            url: Адрес приёмника вебхуков.
+
+        Returns:
+            bool: Подписка оформлена.
+        """
+        try:
+            existing = client.webhooks.list(url=url)
+            if isinstance(existing, dict):
+                existing = existing.get('content', [])
+            subscribed = {w.get('event') for w in existing
+                          if w.get('url') == url and not w.get('deleted') and not w.get('disabled')}
+            for event in WEBHOOK_EVENTS:
+                if event not in subscribed:
+                    client.webhooks.create(url=url, event=event)
+            self.webhooks_subscribed = True
+            logger.info(f"Оформлена подписка на вебхуки YouGile: {url}")
+        except Exception as e:
+            logger.error(f"Ошибка при подписке на вебхуки: {e}")
+        return self.webhooks_subscribed
+
+
+_caches: Dict[Tuple[str, str], EntityCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_entity_cache(company_id: str, user: str, ttl: float = 300.0, db_path: Optional[str] = None,
+                     resync_ttl: float = 86400.0) -> EntityCache:
+    """
+    Получение общего для запросов пользователя кэша сущностей.
+
+    Кэш ведётся отдельно для каждого пользователя компании: сущности,
+    загруженные с ключом одного пользователя, не видны другим. При первом
+    обращении кэш загружается из db_path, если файл есть и данные в нём
+    не старше срока хранения (см. EntityCache.load).
+
+    Args:
+        company_id: ID компании YouGile.
+        user: Пользователь (логин), чьим ключом загружаются данные.
+        ttl: Время до полной перезагрузки данных без вебхуков (секунды).
+        db_path: Файл SQLite для сохранения кэша (None - только в памяти).
+        resync_ttl: Время до полной перезагрузки данных, обновляемых вебхуками (секунды).
+
+    Returns:
+        EntityCache: Кэш пользователя.
+    """
+    with _caches_lock:
+        cache = _caches.get((company_id, user))
+        if cache is None:
+            cache = EntityCache(ttl=ttl, db_path=db_path, resync_ttl=resync_ttl)
+            cache.load()
+            _caches[(company_id, user)] = cache
+        return cache
+
+
+def find_entity_caches(company_id: str) -> List[EntityCache]:
+    """Получение существующих кэшей сущностей компании (всех пользователей) без создания."""
+    with _caches_lock:
+        return [cache for (company, _), cache in _caches.items() if company == company_id]
+
+
+def save_entity_caches():
+    """Сохранение всех кэшей сущностей процесса в их файлы SQLite."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.save()
@@ -3,15 +3,17 @@
 """
 
 import logging
-from datetime import datetime
 import time
-import random
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 from yougile_integration.yougile_api_wrapper.yougile_api import YouGileClient
 from yougile_integration.yougile_api_wrapper.yougile_api.models import (
     Project, Board, Column, Task, Employee, StringSticker
 )
+from yougile_integration.yougile_integrator.rate_limiter import TokenBucket, get_rate_limiter, YOUGILE_REQUESTS_PER_MINUTE
+from yougile_integration.yougile_integrator.entity_cache import EntityCache
+from schedule_parser.schedule_format import parse_lesson_time
 
 
 class ScheduleIntegrator:
@@ -21,31 +23,41 @@ class ScheduleIntegrator:
     Управляет проектами, досками, колонками, задачами и стикерами на основе данных расписания.
     """
 
-    def __init__(self, client: YouGileClient, max_retries=5, base_delay=10, max_delay=60):
+    def __init__(self, client: YouGileClient, requests_per_minute: int = YOUGILE_REQUESTS_PER_MINUTE,
+                 max_workers: int = 4, rate_limiter: Optional[TokenBucket] = None, page_prefetch: int = 0,
+                 entity_cache: Optional[EntityCache] = None, company_id: Optional[str] = None):
         """
         Инициализация интегратора.
 
         Args:
-            client: Клиент YouGile API.
-            max_retries: Максимальное количество повторных попыток при ошибке API.
-            base_delay: Базовая задержка между запросами в секундах.
-            max_delay: Максимальная задержка между запросами в секундах.
+            client: Клиент YouGile API (повторяет временные ошибки согласно своей retry_policy).
+            requests_per_minute: Допустимое количество запросов к API в минуту.
+            max_workers: Количество потоков для массовой записи (1 - последовательно).
+            rate_limiter: Ограничитель частоты запросов (по умолчанию общий для компании).
+            page_prefetch: Количество страниц списков, запрашиваемых заранее параллельно.
+            entity_cache: Общий для запросов кэш сущностей компании (по умолчанию - кэш только этого интегратора).
+            company_id: ID компании ключа для общего ограничителя частоты (без него ограничитель ведётся по ключу API).
         """
         self.logger = logging.getLogger('ScheduleIntegrator')
         self._setup_logging()
 
         self.client = client
-        self.max_retries = max_retries
-        self.base_delay = base_delay
-        self.max_delay = max_delay
-
-        # Кэши для данных
-        self._projects_cache = {}
-        self._boards_cache = {}
-        self._columns_cache = {}
-        self._tasks_cache = {}
-        self._employees_cache = {}
-        self._stickers_cache = {}
+        self.max_workers = max(1, max_workers)
+        self.page_prefetch = max(0, page_prefetch)
+        self.rate_limiter = rate_limiter or get_rate_limiter(company_id or client.token, requests_per_minute)
+
+        # Кэши для данных: собственные или словари общего кэша сущностей
+        self.entity_cache = entity_cache or EntityCache()
+        caches = self.entity_cache.bind()
+        self._projects_cache = caches['projects']
+        self._boards_cache = caches['boards']
+        self._columns_cache = caches['columns']
+        self._tasks_cache = caches['tasks']
+        self._employees_cache = caches['employees']
+        self._stickers_cache = caches['string_stickers']
+        # Загруженные части данных: данные запрашиваются по мере необходимости
+        # с фильтрами на стороне сервера (проект, доска), а не по всей компании
+        self._fetched_scopes = caches['fetched_scopes']
 
         self.schedule_project = None
         self.schedule_boards = []
@@ -56,7 +68,12 @@ class ScheduleIntegrator:
         self.analyze_columns = []
         self.analyze_tasks = []
 
-        self._setup_attributes()
+        # Индексы для поиска без перебора списков: колонка по (доска, название),
+        # неделя по ID колонки, ID состояния по (стикер, название)
+        self._columns_by_title: Dict[Tuple[str, str], Column] = {}
+        self._column_weeks: Dict[str, int] = {}
+        self._sticker_states: Dict[Tuple[str, str], Optional[str]] = {}
+        self._indexed_sticker_states: Dict[str, int] = {}
 
     def _setup_logging(self):
         """Настройка логирования."""
@@ -68,16 +85,12 @@ class ScheduleIntegrator:
         if not self.logger.handlers:
             self.logger.addHandler(console_handler)
 
-    def _setup_attributes(self):
-        self.get_projects()
-        self.get_boards()
-        self.get_columns()
-        self.get_tasks()
-        self.get_string_stickers()
-
     def _api_call_with_retry(self, api_method, *args, **kwargs):
         """
-        Выполнение API-запроса с повторами при ошибке Too Many Requests.
+        Выполнение API-запроса с ограничением частоты.
+
+        Повторы после 429, ошибок сервера и сети выполняет клиент
+        (YouGileClient.retry_policy) с учётом Retry-After.
 
         Args:
             api_method: Метод API для вызова.
@@ -87,72 +100,219 @@ class ScheduleIntegrator:
         Returns:
             Результат API-запроса.
         """
-        retries = 0
-        while retries <= self.max_retries:
-            try:
-                if retries > 0:
-                    delay = min(self.base_delay * (2 ** retries) + random.uniform(0, 1), self.max_delay)
-                    self.logger.info(f"Повторная попытка {retries}/{self.max_retries} через {delay:.2f} сек...")
-                    time.sleep(delay)
-                return api_method(*args, **kwargs)
-            except Exception as e:
-                if "Too Many Requests" in str(e) or "429" in str(e):
-                    retries += 1
-                    if retries > self.max_retries:
-                        raise
-                else:
-                    raise
+        self.rate_limiter.acquire()
+        return api_method(*args, **kwargs)
+
+    def _fetch_and_cache(self, resource, cache_dict, model_class, key='id', **params):
+        """
+        Получение данных из API и кэширование.
 
-    def _fetch_and_cache(self, api_method, cache_dict, model_class, key='id', limit=None):
-        """Получение данных из API и кэширование."""
+        Все страницы списка читаются потоком (resource.iterate), объекты
+        попадают в кэш по мере получения страниц.
+
+        Returns:
+            Загруженные объекты или None при ошибке.
+        """
         try:
-            params = {} if limit is None else {'limit': limit}
-            response = self._api_call_with_retry(api_method, **params)
             items = []
-            if 'content' in response:
-                for item in response['content']:
-                    obj = model_class.model_validate(item)
-                    cache_dict[obj.__getattribute__(key)] = obj
-                    items.append(obj)
+            for item in resource.iterate(prefetch=self.page_prefetch, call=self._api_call_with_retry, **params):
+                obj = model_class.model_validate(item)
+                cache_dict[obj.__getattribute__(key)] = obj
+                items.append(obj)
             return items
         except Exception as e:
             self.logger.error(f"Ошибка при получении данных: {e}")
-            return []
+            return None
+
+    def _fetch_scope(self, scope: tuple, resource, cache_dict, model_class, **params):
+        """
+        Однократная загрузка части данных в кэш.
+
+        Args:
+            scope: Ключ загружаемой части, например ('tasks', board_id).
+            resource: Ресурс API.
+            cache_dict: Кэш для сущностей этого типа.
+            model_class: Модель сущности.
+            **params: Фильтры запроса (project_id, board_id, ...).
+        """
+        if scope in self._fetched_scopes:
+            return
+        if self._fetch_and_cache(resource, cache_dict, model_class, **params) is not None:
+            self._fetched_scopes.add(scope)
+
+    def _create_and_cache(self, api_method, cache_dict, model_class, **fields):
+        """
+        Создание сущности и кэширование её модели без повторного запроса.
+
+        API возвращает при создании только ID, поэтому модель собирается из
+        переданных полей и полученного ID.
+
+        Args:
+            api_method: Метод API создания.
+            cache_dict: Кэш для сущностей этого типа.
+            model_class: Модель сущности.
+            **fields: Поля создаваемой сущности.
+
+        Returns:
+            Модель созданной сущности или None, если ID не получен.
+        """
+        create_response = self._api_call_with_retry(api_method, **fields)
+        entity_id = create_response.get('id')
+        if not entity_id:
+            return None
+        entity = model_class.model_validate({**fields, 'id': entity_id})
+        cache_dict[entity_id] = entity
+        return entity
+
+    def create_task(self, **task_data) -> Optional[Task]:
+        """
+        Создание задачи с добавлением в кэш.
+
+        Args:
+            **task_data: Поля задачи (title, column_id, deadline, stickers, description).
+
+        Returns:
+            Task: Созданная задача или None, если ID не получен.
+        """
+        return self._create_and_cache(self.client.tasks.create, self._tasks_cache, Task, **task_data)
+
+    def _run_parallel(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Выполнение функции для элементов пулом потоков.
+
+        Одновременно выполняется не больше max_workers вызовов, частоту
+        запросов к API ограничивает rate_limiter.
+
+        Args:
+            func: Функция одного элемента.
+            items: Элементы.
+
+        Returns:
+            List[Any]: Результаты в порядке элементов.
+        """
+        if self.max_workers <= 1 or len(items) <= 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as pool:
+            return list(pool.map(func, items))
+
+    def _create_tasks(self, tasks_data: List[Dict[str, Any]]) -> int:
+        """
+        Массовое создание задач.
+
+        Задачи одной колонки создаются последовательно, чтобы сохранить их
+        порядок на доске, колонки обрабатываются параллельно.
+
+        Args:
+            tasks_data: Поля создаваемых задач.
+
+        Returns:
+            int: Количество созданных задач.
+        """
+        columns_tasks: Dict[str, List[Dict[str, Any]]] = {}
+        for task_data in tasks_data:
+            columns_tasks.setdefault(task_data.get('column_id'), []).append(task_data)
+
+        def create_column_tasks(column_tasks: List[Dict[str, Any]]) -> int:
+            created = 0
+            for task_data in column_tasks:
+                try:
+                    if self.create_task(**task_data):
+                        created += 1
+                    else:
+                        self.logger.error(f"Не получен ID задачи '{task_data.get('title')}'")
+                except Exception as e:
+                    self.logger.error(f"Ошибка при создании задачи '{task_data.get('title')}': {e}")
+            return created
+
+        return sum(self._run_parallel(create_column_tasks, list(columns_tasks.values())))
+
+    def _refresh_sticker(self, sticker_id: str) -> StringSticker:
+        """Повторное получение стикера из API с обновлением кэша."""
+        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=sticker_id)
+        sticker = StringSticker.model_validate(sticker_data)
+        self._stickers_cache[sticker.id] = sticker
+        self.schedule_stickers = [sticker if s.id == sticker.id else s for s in self.schedule_stickers]
+        self._index_sticker_states(sticker)
+        return sticker
+
+    def _index_sticker_states(self, sticker: StringSticker):
+        """Добавление состояний стикера в индекс (ID None - состояние ещё без ID)."""
+        states = sticker.states or []
+        for state in states:
+            self._sticker_states[(sticker.id, state.get('name'))] = state.get('id')
+        self._indexed_sticker_states[sticker.id] = len(states)
+
+    def _get_sticker_state_id(self, sticker: StringSticker, state_name: str) -> Optional[str]:
+        """
+        Получение ID состояния стикера по названию.
+
+        ID состояний, созданных вместе со стикером, назначает сервер и не
+        возвращает при создании: стикер запрашивается один раз при первом
+        обращении к такому состоянию.
+
+        Args:
+            sticker: Стикер.
+            state_name: Название состояния.
+
+        Returns:
+            Optional[str]: ID состояния или None, если состояния нет.
+        """
+        key = (sticker.id, state_name)
+        # Стикер индексируется заново, если его состояния изменились
+        if self._indexed_sticker_states.get(sticker.id) != len(sticker.states or []):
+            self._index_sticker_states(sticker)
+        if key not in self._sticker_states:
+            return None
+        if not self._sticker_states[key]:
+            self._refresh_sticker(sticker.id)
+        return self._sticker_states.get(key)
+
+    def _add_sticker_state(self, sticker: StringSticker, name: str, color: str):
+        """Создание состояния стикера с добавлением в кэшированный стикер."""
+        state_response = self._api_call_with_retry(
+            self.client.string_sticker_states.create,
+            sticker_id=sticker.id,
+            name=name,
+            color=color
+        )
+        state = {'name': name, 'color': color}
+        if state_response.get('id'):
+            state['id'] = state_response['id']
+        if sticker.states is None:
+            sticker.states = []
+        sticker.states.append(state)
+        if self._indexed_sticker_states.get(sticker.id) == len(sticker.states) - 1:
+            self._sticker_states[(sticker.id, name)] = state.get('id')
+            self._indexed_sticker_states[sticker.id] = len(sticker.states)
 
     def get_projects(self) -> List[Project]:
-        """Получение списка проектов из кэша или API."""
-        if not self._projects_cache:
-            self._fetch_and_cache(self.client.projects.list, self._projects_cache, Project)
+        """Получение списка всех проектов компании из кэша или API."""
+        self._fetch_scope(('projects',), self.client.projects, self._projects_cache, Project)
         return list(self._projects_cache.values())
 
     def get_boards(self) -> List[Board]:
-        """Получение списка досок из кэша или API."""
-        if not self._boards_cache:
-            self._fetch_and_cache(self.client.boards.list, self._boards_cache, Board, limit=1000)
+        """Получение списка всех досок компании из кэша или API."""
+        self._fetch_scope(('boards',), self.client.boards, self._boards_cache, Board)
         return list(self._boards_cache.values())
 
     def get_columns(self) -> List[Column]:
-        """Получение списка колонок из кэша или API."""
-        if not self._columns_cache:
-            self._fetch_and_cache(self.client.columns.list, self._columns_cache, Column, limit=1000)
+        """Получение списка всех колонок компании из кэша или API."""
+        self._fetch_scope(('columns',), self.client.columns, self._columns_cache, Column)
         return list(self._columns_cache.values())
 
     def get_tasks(self) -> List[Task]:
-        """Получение списка задач из кэша или API."""
-        if not self._tasks_cache:
-            self._fetch_and_cache(self.client.tasks.list, self._tasks_cache, Task, limit=1000)
+        """Получение списка всех задач компании из кэша или API."""
+        self._fetch_scope(('tasks',), self.client.tasks, self._tasks_cache, Task)
         return list(self._tasks_cache.values())
 
     def get_employees(self) -> List[Employee]:
         """Получение списка сотрудников из кэша или API."""
-        if not self._employees_cache:
-            self._fetch_and_cache(self.client.employees.list, self._employees_cache, Employee)
+        self._fetch_scope(('employees',), self.client.employees, self._employees_cache, Employee)
         return list(self._employees_cache.values())
 
     def get_string_stickers(self) -> List[StringSticker]:
         """Получение списка стикеров из кэша или API."""
-        if not self._stickers_cache:
-            self._fetch_and_cache(self.client.string_stickers.list, self._stickers_cache, StringSticker)
+        self._fetch_scope(('string_stickers',), self.client.string_stickers, self._stickers_cache, StringSticker)
         return list(self._stickers_cache.values())
 
     def _get_admin_id(self) -> Optional[str]:
@@ -173,20 +333,16 @@ class ScheduleIntegrator:
                     return None
 
                 self.logger.info(f"Создание проекта: {project_title}")
-                create_response = self._api_call_with_retry(
-                    self.client.projects.create,
+                project = self._create_and_cache(
+                    self.client.projects.create, self._projects_cache, Project,
                     title=project_title,
                     users={admin_id: "admin"}
                 )
-                project_id = create_response.get('id')
-                if not project_id:
+                if not project:
                     self.logger.error("Не получен ID созданного проекта")
                     return None
-
-                # Получаем полные данные проекта
-                project_data = self._api_call_with_retry(self.client.projects.get, id=project_id)
-                self.schedule_project = Project.model_validate(project_data)
-                self._projects_cache[self.schedule_project.id] = self.schedule_project
+                self.schedule_project = project
+                self._fetched_scopes.add(('boards', project.id))
                 self.logger.info(f"Проект создан: {self.schedule_project.title} (ID: {self.schedule_project.id})")
             return self.schedule_project
         except Exception as e:
@@ -196,9 +352,10 @@ class ScheduleIntegrator:
     def get_schedule_project(self, project_title: Optional[str] = 'Учебное расписание') -> Optional[Project]:
         """Получение проекта расписания."""
         try:
-            projects = self.get_projects()
+            self._fetch_scope(('projects', project_title), self.client.projects, self._projects_cache, Project,
+                              title=project_title)
             self.schedule_project = next(
-                (p for p in projects if p.title == project_title and not getattr(p, 'deleted', False)),
+                (p for p in list(self._projects_cache.values()) if p.title == project_title and not getattr(p, 'deleted', False)),
                 None
             )
             if self.schedule_project:
@@ -213,37 +370,67 @@ class ScheduleIntegrator:
     def get_schedule_boards(self) -> List[Board]:
         """Получение досок проекта расписания."""
         try:
+            if not self.schedule_project:
+                self.get_schedule_project()
             if not self.schedule_project:
                 self.logger.warning("Проект расписания не найден")
                 return []
-            boards = self.get_boards()
-            self.schedule_boards = [b for b in boards if b.project_id == self.schedule_project.id and not getattr(b, 'deleted', False)]
+            project_id = self.schedule_project.id
+            self._fetch_scope(('boards', project_id), self.client.boards, self._boards_cache, Board, project_id=project_id)
+            self.schedule_boards = [b for b in list(self._boards_cache.values()) if b.project_id == project_id and not getattr(b, 'deleted', False)]
             self.logger.info(f"Найдено досок: {len(self.schedule_boards)}")
             return self.schedule_boards
         except Exception as e:
             self.logger.error(f"Ошибка при получении досок: {e}")
             return []
 
-    def get_schedule_columns(self) -> List[Column]:
-        """Получение колонок проекта расписания."""
+    def get_schedule_columns(self, board_ids: Optional[List[str]] = None) -> List[Column]:
+        """
+        Получение колонок проекта расписания.
+
+        Колонки запрашиваются по доскам и только для указанных досок;
+        schedule_columns содержит все уже загруженные колонки досок проекта.
+
+        Args:
+            board_ids: ID досок, колонки которых нужны (None - все доски проекта).
+        """
         try:
             self.get_schedule_boards()
-            columns = self.get_columns()
-            board_ids = {b.id for b in self.schedule_boards}
-            self.schedule_columns = [c for c in columns if c.board_id in board_ids and not getattr(c, 'deleted', False)]
+            for board in self.schedule_boards:
+                if board_ids is None or board.id in board_ids:
+                    self._fetch_scope(('columns', board.id), self.client.columns, self._columns_cache, Column,
+                                      board_id=board.id)
+            project_board_ids = {b.id for b in self.schedule_boards}
+            self.schedule_columns = [c for c in list(self._columns_cache.values())
+                                     if c.board_id in project_board_ids and not getattr(c, 'deleted', False)]
+            self._columns_by_title = {}
+            self._column_weeks = {}
+            for column in self.schedule_columns:
+                self._index_column(column)
             self.logger.info(f"Найдено колонок: {len(self.schedule_columns)}")
             return self.schedule_columns
         except Exception as e:
             self.logger.error(f"Ошибка при получении колонок: {e}")
             return []
 
-    def get_schedule_tasks(self) -> List[Task]:
-        """Получение задач проекта расписания."""
+    def get_schedule_tasks(self, board_ids: Optional[List[str]] = None) -> List[Task]:
+        """
+        Получение задач проекта расписания.
+
+        Задачи запрашиваются по доскам и только для указанных досок;
+        schedule_tasks содержит все уже загруженные задачи досок проекта.
+
+        Args:
+            board_ids: ID досок, задачи которых нужны (None - все доски проекта).
+        """
         try:
-            self.get_schedule_columns()
-            tasks = self.get_tasks()
+            self.get_schedule_columns(board_ids)
+            for board in self.schedule_boards:
+                if board_ids is None or board.id in board_ids:
+                    self._fetch_scope(('tasks', board.id), self.client.tasks, self._tasks_cache, Task,
+                                      board_id=board.id)
             column_ids = {c.id for c in self.schedule_columns}
-            self.schedule_tasks = [t for t in tasks if t.column_id in column_ids and not getattr(t, 'deleted', False)]
+            self.schedule_tasks = [t for t in list(self._tasks_cache.values()) if t.column_id in column_ids and not getattr(t, 'deleted', False)]
             self.logger.info(f"Найдено задач: {len(self.schedule_tasks)}")
             return self.schedule_tasks
         except Exception as e:
@@ -282,21 +469,16 @@ class ScheduleIntegrator:
                 "custom": custom_stickers
             }
 
-            create_response = self._api_call_with_retry(
-                self.client.boards.create,
+            new_board = self._create_and_cache(
+                self.client.boards.create, self._boards_cache, Board,
                 title=schedule_name,
                 project_id=project_id,
                 stickers=stickers
             )
-            board_id = create_response.get('id')
-            if not board_id:
+            if not new_board:
                 self.logger.error("Не получен ID созданной доски")
                 return None
-
-            # Получаем полные данные доски
-            board_data = self._api_call_with_retry(self.client.boards.get, id=board_id)
-            new_board = Board.model_validate(board_data)
-            self._boards_cache[new_board.id] = new_board
+            self._fetched_scopes.update({('columns', new_board.id), ('tasks', new_board.id)})
             self.get_schedule_boards()
             self.logger.info(f"Доска создана: {new_board.title} (ID: {new_board.id})")
             return new_board
@@ -338,55 +520,31 @@ class ScheduleIntegrator:
                             })
 
                 if type_states:
-                    type_sticker_response = self._api_call_with_retry(
-                        self.client.string_stickers.create,
+                    # ID состояний запрашиваются позже, при первом обращении к ним
+                    self._create_and_cache(
+                        self.client.string_stickers.create, self._stickers_cache, StringSticker,
                         name='Тип занятия',
                         states=type_states,
                         icon='bookmark'
                     )
 
-                    type_sticker_id = type_sticker_response.get('id')
-                    if type_sticker_id:
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=type_sticker_id)
-                        sticker_id = sticker_data.get('id')
-                        # Получаем полные данные стикера
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=sticker_id)
-                        sticker = StringSticker.model_validate(sticker_data)
-                        self._stickers_cache[sticker.id] = sticker
-
                 if room_states:
-                    room_sticker_response = self._api_call_with_retry(
-                        self.client.string_stickers.create,
+                    # ID состояний запрашиваются позже, при первом обращении к ним
+                    self._create_and_cache(
+                        self.client.string_stickers.create, self._stickers_cache, StringSticker,
                         name='Аудитория',
                         states=room_states,
                         icon='key'
                     )
 
-                    room_sticker_id = room_sticker_response.get('id')
-                    if room_sticker_id:
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=room_sticker_id)
-                        sticker_id = sticker_data.get('id')
-                        # Получаем полные данные стикера
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=sticker_id)
-                        sticker = StringSticker.model_validate(sticker_data)
-                        self._stickers_cache[sticker.id] = sticker
-
                 if teacher_states:
-                    teacher_sticker_response = self._api_call_with_retry(
-                        self.client.string_stickers.create,
+                    # ID состояний запрашиваются позже, при первом обращении к ним
+                    self._create_and_cache(
+                        self.client.string_stickers.create, self._stickers_cache, StringSticker,
                         name='Преподаватель',
                         states=teacher_states,
                         icon='user'
                     )
-
-                    teacher_sticker_id = teacher_sticker_response.get('id')
-                    if teacher_sticker_id:
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=teacher_sticker_id)
-                        sticker_id = sticker_data.get('id')
-                        # Получаем полные данные стикера
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=sticker_id)
-                        sticker = StringSticker.model_validate(sticker_data)
-                        self._stickers_cache[sticker.id] = sticker
             self.get_schedule_stickers()
             self.logger.info(f"Создано стикеров: {len(self.schedule_stickers)}")
         except Exception as e:
@@ -410,41 +568,17 @@ class ScheduleIntegrator:
                     lesson_type = lesson.get('type', '').strip()
                     if lesson_type and lesson_type not in type_sticker_states_names:
                         type_sticker_states_names.append(lesson_type)
-                        type_sticker_state_response = self._api_call_with_retry(
-                            self.client.string_sticker_states.create,
-                            sticker_id=type_sticker.id,
-                            name=lesson_type,
-                            color="#FF0000"
-                        )
-                        # Обновляем кэш стикера после добавления нового состояния
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=type_sticker.id)
-                        self._stickers_cache[type_sticker.id] = StringSticker.model_validate(sticker_data)
+                        self._add_sticker_state(type_sticker, lesson_type, "#FF0000")
 
                     room = lesson.get('room', '').strip()
                     if room and room not in room_sticker_states_names:
                         room_sticker_states_names.append(room)
-                        room_sticker_state_response = self._api_call_with_retry(
-                            self.client.string_sticker_states.create,
-                            sticker_id=room_sticker.id,
-                            name=room,
-                            color="#FF0000"
-                        )
-                        # Обновляем кэш стикера после добавления нового состояния
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=room_sticker.id)
-                        self._stickers_cache[room_sticker.id] = StringSticker.model_validate(sticker_data)
+                        self._add_sticker_state(room_sticker, room, "#FF0000")
 
                     teacher = lesson.get('teacher', '').strip()
                     if teacher and teacher not in teacher_sticker_states_names:
                         teacher_sticker_states_names.append(teacher)
-                        teacher_sticker_state_response = self._api_call_with_retry(
-                            self.client.string_sticker_states.create,
-                            sticker_id=teacher_sticker.id,
-                            name=teacher,
-                            color="#FF0000"
-                        )
-                        # Обновляем кэш стикера после добавления нового состояния
-                        sticker_data = self._api_call_with_retry(self.client.string_stickers.get, id=teacher_sticker.id)
-                        self._stickers_cache[teacher_sticker.id] = StringSticker.model_validate(sticker_data)
+                        self._add_sticker_state(teacher_sticker, teacher, "#FF0000")
             self.get_schedule_stickers()
         except Exception as e:
             self.logger.error(f"Ошибка при обновлении стикеров: {e}")
@@ -453,124 +587,241 @@ class ScheduleIntegrator:
         """Создание колонок для недель."""
         try:
             self.logger.info("Создание колонок для недель")
+            self.get_schedule_columns([board_id])
             weeks = sorted({d.get('week') for d in schedule_data if d.get('week') is not None})
             for week in weeks:
                 title = f"Неделя {week}"
-                if not any(c.board_id == board_id and c.title == title for c in self.schedule_columns):
-                    create_response = self._api_call_with_retry(
-                        self.client.columns.create,
+                if (board_id, title) not in self._columns_by_title:
+                    column = self._create_and_cache(
+                        self.client.columns.create, self._columns_cache, Column,
                         title=title,
                         board_id=board_id,
                         color=(week % 16) + 1
                     )
-                    column_id = create_response.get('id')
-                    if not column_id:
+                    if not column:
                         self.logger.error(f"Не получен ID колонки '{title}'")
                         continue
-                    # Получаем полные данные колонки
-                    column_data = self._api_call_with_retry(self.client.columns.get, id=column_id)
-                    column = Column.model_validate(column_data)
-                    self._columns_cache[column.id] = column
-            self.get_schedule_columns()
+                    self._index_column(column)
+            self.get_schedule_columns([board_id])
             self.logger.info(f"Всего колонок: {len(self.schedule_columns)}")
             return self.schedule_columns
         except Exception as e:
             self.logger.error(f"Ошибка при создании колонок: {e}")
             return []
 
+    @staticmethod
+    def _column_week(title: str) -> Optional[int]:
+        """Номер недели из названия колонки ("Неделя N") или None."""
+        if "Неделя" not in title:
+            return None
+        parts = title.split()
+        return int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+
+    def _index_column(self, column: Column):
+        """Добавление колонки в индексы по названию и неделе."""
+        self._columns_by_title[(column.board_id, column.title)] = column
+        week = self._column_week(column.title)
+        if week is not None:
+            self._column_weeks[column.id] = week
+
     def _get_column_by_week(self, week: int, board_id: str) -> Optional[Column]:
         """Получение колонки по номеру недели."""
-        for column in self.schedule_columns:
-            if column.board_id == board_id and column.title == f"Неделя {week}":
-                return column
+        column = self._columns_by_title.get((board_id, f"Неделя {week}"))
+        if column:
+            return column
         self.logger.warning(f"Колонка для недели {week} не найдена")
         return None
 
     def _parse_timestamp(self, date_str: str, time_str: str) -> tuple[int, int]:
         """Преобразование даты и времени в timestamp."""
         try:
-            month_map = {
-                "января": 1, "февраля": 2, "марта": 3, "апреля": 4, "мая": 5, "июня": 6,
-                "июля": 7, "августа": 8, "сентября": 9, "октября": 10, "ноября": 11, "декабря": 12
-            }
-            year = 2025
-            day, month_name = date_str.split(',')[1].strip().split()
-            month = month_map[month_name]
-            start_time, end_time = time_str.split('-')
-            start_dt = datetime(year, month, int(day), *map(int, start_time.split(':')))
-            end_dt = datetime(year, month, int(day), *map(int, end_time.split(':')))
+            start_dt, end_dt = parse_lesson_time(date_str, time_str, year=2025)
             return int(start_dt.timestamp() * 1000), int(end_dt.timestamp() * 1000)
         except Exception as e:
             self.logger.error(f"Ошибка парсинга времени '{date_str} {time_str}': {e}")
             current = int(time.time() * 1000)
             return current, current + 3600000
 
+    def _build_schedule_tasks_data(self, schedule_data: List[Dict[str, Any]], board_id: str) -> List[Dict[str, Any]]:
+        """Формирование полей задач для занятий расписания."""
+        tasks_data = []
+        for day in schedule_data:
+            week = day.get('week')
+            column = self._get_column_by_week(week, board_id)
+            if not column:
+                continue
+            for lesson in day.get('lessons', []):
+                subject = lesson.get('subject', '').strip()
+                if not subject:
+                    continue
+                # Формируем стикеры
+                custom_stickers = {}
+                lesson_values = {
+                    'Тип занятия': lesson.get('type', '').strip(),
+                    'Аудитория': lesson.get('room', '').strip(),
+                    'Преподаватель': lesson.get('teacher', '').strip()
+                }
+
+                if not self.schedule_stickers:
+                    self.get_schedule_stickers()
+
+                for sticker in self.schedule_stickers:
+                    value = lesson_values.get(sticker.name, '')
+                    state_id = self._get_sticker_state_id(sticker, value) if value else None
+                    custom_stickers[sticker.id] = state_id or "-"
+                start_ts, end_ts = self._parse_timestamp(day.get('day', ''), lesson.get('time', ''))
+                task_data = {
+                    "title": subject,
+                    "column_id": column.id,
+                    "deadline": {"deadline": end_ts, "startDate": start_ts, "withTime": True},
+                    "stickers": custom_stickers,
+                    "description": "\n".join(
+                        f"{k}: {v}" for k, v in [
+                            ("Тип", lesson.get('type')),
+                            ("Аудитория", lesson.get('room')),
+                            ("Преподаватель", lesson.get('teacher')),
+                            ("Время", lesson.get('time'))
+                        ] if v
+                    )
+                }
+                tasks_data.append(task_data)
+        return tasks_data
+
     def create_schedule_tasks(self, schedule_data: List[Dict[str, Any]], board_id: str) -> List[Task]:
         """Создание задач для занятий."""
         try:
             self.logger.info("Создание задач для занятий")
-            created_tasks = 0
-            for day in schedule_data:
-                week = day.get('week')
-                column = self._get_column_by_week(week, board_id)
-                if not column:
-                    continue
-                for lesson in day.get('lessons', []):
-                    subject = lesson.get('subject', '').strip()
-                    if not subject:
-                        continue
-                    # Формируем стикеры
-                    custom_stickers = {}
-                    lesson_values = {
-                        'Тип занятия': lesson.get('type', '').strip(),
-                        'Аудитория': lesson.get('room', '').strip(),
-                        'Преподаватель': lesson.get('teacher', '').strip()
-                    }
-
-                    if not self.schedule_stickers:
-                        self.get_schedule_stickers()
-
-                    for sticker in self.schedule_stickers:
-                        value = lesson_values.get(sticker.name, '')
-                        if value:
-                            state = next((st for st in sticker.states if st.get('name') == value), None)
-                            custom_stickers[sticker.id] = state.get('id') if state else "-"
-                        else:
-                            custom_stickers[sticker.id] = "-"
-                    start_ts, end_ts = self._parse_timestamp(day.get('day', ''), lesson.get('time', ''))
-                    task_data = {
-                        "title": subject,
-                        "column_id": column.id,
-                        "deadline": {"deadline": end_ts, "startDate": start_ts, "withTime": True},
-                        "stickers": custom_stickers,
-                        "description": "\n".join(
-                            f"{k}: {v}" for k, v in [
-                                ("Тип", lesson.get('type')),
-                                ("Аудитория", lesson.get('room')),
-                                ("Преподаватель", lesson.get('teacher')),
-                                ("Время", lesson.get('time'))
-                            ] if v
-                        )
-                    }
-                    create_response = self._api_call_with_retry(self.client.tasks.create, **task_data)
-                    task_id = create_response.get('id')
-                    if not task_id:
-                        self.logger.error(f"Не получен ID задачи '{subject}'")
-                        continue
-                    # Получаем полные данные задачи
-                    task_data = self._api_call_with_retry(self.client.tasks.get, id=task_id)
-                    task = Task.model_validate(task_data)
-                    self._tasks_cache[task.id] = task
-                    created_tasks += 1
-            self.get_schedule_tasks()
+            tasks_data = self._build_schedule_tasks_data(schedule_data, board_id)
+            created_tasks = self._create_tasks(tasks_data)
+            self.get_schedule_tasks([board_id])
             self.logger.info(f"Создано задач: {created_tasks}")
             return self.schedule_tasks
         except Exception as e:
             self.logger.error(f"Ошибка при создании задач: {e}")
             return []
 
-    def integrate_schedule(self, schedule_data: List[Dict[str, Any]], schedule_name: str, project_title: Optional[str] = 'Учебное расписание') -> bool:
-        """Интеграция расписания в YouGile."""
+    @staticmethod
+    def _task_key(column_id: Optional[str], deadline: Optional[Dict[str, Any]], title: Optional[str]) -> tuple:
+        """Ключ сопоставления задачи и занятия: неделя (колонка), дата и время (начало и конец), предмет."""
+        deadline = deadline or {}
+        return column_id, deadline.get('startDate'), deadline.get('deadline'), (title or '').strip()
+
+    @staticmethod
+    def _task_changes(task: Task, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Поля задачи, отличающиеся от данных занятия.
+
+        Пустые значения стикеров ("-") и отсутствующие стикеры считаются равными.
+
+        Returns:
+            Dict[str, Any]: Поля для обновления (пустой словарь, если задача актуальна).
+        """
+        changes = {}
+        if (task.description or '') != task_data.get('description', ''):
+            changes['description'] = task_data.get('description', '')
+
+        def filled(stickers):
+            return {k: v for k, v in (stickers or {}).items() if v and v != '-'}
+
+        if filled(task.stickers) != filled(task_data.get('stickers')):
+            changes['stickers'] = task_data.get('stickers')
+        if bool((task.deadline or {}).get('withTime')) != bool(task_data['deadline'].get('withTime')):
+            changes['deadline'] = task_data['deadline']
+        return changes
+
+    def _delete_task(self, task: Task) -> bool:
+        """Удаление задачи с отметкой в кэше."""
+        try:
+            self._api_call_with_retry(self.client.tasks.update, id=task.id, deleted=True)
+            task.deleted = True
+            return True
+        except Exception as e:
+            self.logger.error(f"Ошибка при удалении задачи '{task.title}': {e}")
+            return False
+
+    def sync_schedule_tasks(self, schedule_data: List[Dict[str, Any]], board_id: str) -> Dict[str, int]:
+        """
+        Синхронизация задач доски с расписанием.
+
+        Существующие задачи сопоставляются с занятиями по ключу (неделя, дата,
+        время, предмет). Создаются задачи только для новых занятий, изменяются
+        задачи с другим описанием или стикерами, удаляются задачи занятий,
+        которых нет в расписании. Повторная синхронизация без изменений не
+        выполняет запросов на запись.
+
+        Args:
+            schedule_data: Данные расписания.
+            board_id: ID доски расписания.
+
+        Returns:
+            Dict[str, int]: Количество созданных, изменённых и удалённых задач.
+        """
+        result = {"created": 0, "updated": 0, "deleted": 0}
+        try:
+            self.logger.info("Синхронизация задач с расписанием")
+            self.get_schedule_tasks([board_id])
+            column_ids = {c.id for c in self.schedule_columns if c.board_id == board_id}
+            existing: Dict[tuple, List[Task]] = {}
+            for task in self.schedule_tasks:
+                if task.column_id in column_ids:
+                    existing.setdefault(self._task_key(task.column_id, task.deadline, task.title), []).append(task)
+
+            # Сначала задачи, совпадающие полностью: одинаковые предмет и время
+            # бывают у подгрупп с разными аудиториями и преподавателями
+            unmatched = []
+            for task_data in self._build_schedule_tasks_data(schedule_data, board_id):
+                candidates = existing.get(self._task_key(task_data['column_id'], task_data['deadline'], task_data['title']), [])
+                task = next((t for t in candidates if not self._task_changes(t, task_data)), None)
+                if task:
+                    candidates.remove(task)
+                else:
+                    unmatched.append(task_data)
+
+            to_create, to_update = [], []
+            for task_data in unmatched:
+                candidates = existing.get(self._task_key(task_data['column_id'], task_data['deadline'], task_data['title']), [])
+                if candidates:
+                    task = candidates.pop(0)
+                    to_update.append((task, self._task_changes(task, task_data)))
+                else:
+                    to_create.append(task_data)
+            to_delete = [task for tasks in existing.values() for task in tasks]
+
+            def update_task(item) -> bool:
+                task, changes = item
+                try:
+                    self._api_call_with_retry(self.client.tasks.update, id=task.id, **changes)
+                    for field, value in changes.items():
+                        setattr(task, field, value)
+                    return True
+                except Exception as e:
+                    self.logger.error(f"Ошибка при обновлении задачи '{task.title}': {e}")
+                    return False
+
+            result["updated"] = sum(self._run_parallel(update_task, to_update))
+            result["deleted"] = sum(self._run_parallel(self._delete_task, to_delete))
+            result["created"] = self._create_tasks(to_create)
+            self.get_schedule_tasks([board_id])
+            self.logger.info(
+                f"Задач создано: {result['created']}, изменено: {result['updated']}, удалено: {result['deleted']}"
+            )
+            return result
+        except Exception as e:
+            self.logger.error(f"Ошибка при синхронизации задач: {e}")
+            return result
+
+    def integrate_schedule(self, schedule_data: List[Dict[str, Any]], schedule_name: str,
+                           project_title: Optional[str] = 'Учебное расписание', sync_tasks: bool = True) -> bool:
+        """
+        Интеграция расписания в YouGile.
+
+        Args:
+            schedule_data: Данные расписания.
+            schedule_name: Название расписания (доски).
+            project_title: Название проекта.
+            sync_tasks: Изменять только отличающиеся задачи существующей доски
+                (False - удалить все задачи доски и создать заново).
+        """
         try:
             self.logger.info(f"Интеграция расписания: {schedule_name}")
             self.schedule_project = self.get_schedule_project(project_title) or self.create_schedule_project(project_title)
@@ -578,14 +829,17 @@ class ScheduleIntegrator:
                 return False
             self.get_schedule_boards()
             board = next((b for b in self.schedule_boards if b.title == schedule_name), None)
-            if board:
+            if board and not sync_tasks:
                 self._clean_up_board(board.id)
-            else:
+            elif not board:
                 board = self.create_schedule_board(schedule_data, schedule_name, self.schedule_project.id)
             if not board:
                 return False
             self.create_schedule_columns(schedule_data, board.id)
-            self.create_schedule_tasks(schedule_data, board.id)
+            if sync_tasks:
+                self.sync_schedule_tasks(schedule_data, board.id)
+            else:
+                self.create_schedule_tasks(schedule_data, board.id)
             self.logger.info(f"Интеграция '{schedule_name}' завершена")
             return True
         except Exception as e:
@@ -595,11 +849,10 @@ class ScheduleIntegrator:
     def _clean_up_board(self, board_id: str):
         """Очистка задач на доске."""
         try:
-            self.get_schedule_tasks()
-            for task in self.schedule_tasks:
-                if task.column_id in {c.id for c in self.schedule_columns if c.board_id == board_id}:
-                    self._api_call_with_retry(self.client.tasks.update, id=task.id, deleted=True)
-                    self._tasks_cache[task.id].deleted = True
+            self.get_schedule_tasks([board_id])
+            column_ids = {c.id for c in self.schedule_columns if c.board_id == board_id}
+            board_tasks = [task for task in self.schedule_tasks if task.column_id in column_ids]
+            self._run_parallel(self._delete_task, board_tasks)
         except Exception as e:
             self.logger.error(f"Ошибка при очистке доски: {e}")
 
@@ -624,7 +877,7 @@ class ScheduleIntegrator:
             self.get_analyze_board(board_name)
             if not self.analyze_board:
                 return []
-            self.get_schedule_columns()
+            self.get_schedule_columns([self.analyze_board.id])
             self.analyze_columns = [c for c in self.schedule_columns if c.board_id == self.analyze_board.id and not getattr(c, 'deleted', False)]
             self.logger.info(f"Найдено колонок анализа: {len(self.analyze_columns)}")
             return self.analyze_columns
@@ -638,7 +891,7 @@ class ScheduleIntegrator:
             self.get_analyze_columns()
             if not self.analyze_board:
                 return []
-            self.get_schedule_tasks()
+            self.get_schedule_tasks([self.analyze_board.id])
             column_ids = {c.id for c in self.analyze_columns}
             self.analyze_tasks = [t for t in self.schedule_tasks if t.column_id in column_ids and not getattr(t, 'deleted', False)]
             self.logger.info(f"Найдено задач анализа: {len(self.analyze_tasks)}")
@@ -667,20 +920,16 @@ class ScheduleIntegrator:
                     "repeat": False,
                     "custom": custom_stickers
                 }
-                create_response = self._api_call_with_retry(
-                    self.client.boards.create,
+                self.analyze_board = self._create_and_cache(
+                    self.client.boards.create, self._boards_cache, Board,
                     title=analyze_board_name,
                     project_id=self.schedule_project.id,
                     stickers=stickers
                 )
-                board_id = create_response.get('id')
-                if not board_id:
+                if not self.analyze_board:
                     self.logger.error("Не получен ID созданной доски")
                     return None
-                # Получаем полные данные доски
-                board_data = self._api_call_with_retry(self.client.boards.get, id=board_id)
-                self.analyze_board = Board.model_validate(board_data)
-                self._boards_cache[self.analyze_board.id] = self.analyze_board
+                self._fetched_scopes.update({('columns', self.analyze_board.id), ('tasks', self.analyze_board.id)})
                 self.get_schedule_boards()
                 self.logger.info(f"Доска создана: {self.analyze_board.title} (ID: {self.analyze_board.id})")
             else:
@@ -697,23 +946,19 @@ class ScheduleIntegrator:
             self.get_analyze_columns()
             titles = [f"Неделя {w}" for w in range(22)] + ["Найденные окна"]
             for title in titles:
-                if not any(c.title == title and c.board_id == board_id for c in self.analyze_columns):
+                if (board_id, title) not in self._columns_by_title:
                     week = int(title.split()[1]) if "Неделя" in title else 13
-                    create_response = self._api_call_with_retry(
-                        self.client.columns.create,
+                    column = self._create_and_cache(
+                        self.client.columns.create, self._columns_cache, Column,
                         title=title,
                         board_id=board_id,
                         color=(week % 16) + 1
                     )
-                    column_id = create_response.get('id')
-                    if not column_id:
+                    if not column:
                         self.logger.error(f"Не получен ID колонки '{title}'")
                         continue
-                    # Получаем полные данные колонки
-                    column_data = self._api_call_with_retry(self.client.columns.get, id=column_id)
-                    column = Column.model_validate(column_data)
-                    self._columns_cache[column.id] = column
-            self.get_schedule_columns()
+                    self._index_column(column)
+            self.get_schedule_columns([board_id])
             self.logger.info(f"Всего колонок: {len(self.schedule_columns)}")
             return self.schedule_columns
         except Exception as e:
@@ -724,10 +969,10 @@ class ScheduleIntegrator:
         """Создание задач для анализа."""
         try:
             self.logger.info("Создание задач анализа")
-            created_tasks = 0
+            tasks_data = []
             self.get_schedule_tasks()
             for task in self.schedule_tasks:
-                week = next((int(c.title.split()[1]) for c in self.schedule_columns if c.id == task.column_id and "Неделя" in c.title), None)
+                week = self._column_weeks.get(task.column_id)
                 if week is not None:
                     column = self._get_column_by_week(week, board_id)
                     if column:
@@ -738,17 +983,9 @@ class ScheduleIntegrator:
                             task_data["stickers"] = task.stickers
                         if task.description:
                             task_data["description"] = task.description
-                        create_response = self._api_call_with_retry(self.client.tasks.create, **task_data)
-                        task_id = create_response.get('id')
-                        if not task_id:
-                            self.logger.error(f"Не получен ID задачи '{task.title}'")
-                            continue
-                        # Получаем полные данные задачи
-                        task_data = self._api_call_with_retry(self.client.tasks.get, id=task_id)
-                        task = Task.model_validate(task_data)
-                        self._tasks_cache[task.id] = task
-                        created_tasks += 1
-            self.get_schedule_tasks()
+                        tasks_data.append(task_data)
+            created_tasks = self._create_tasks(tasks_data)
+            self.get_schedule_tasks([board_id])
             self.logger.info(f"Создано задач: {created_tasks}")
             return self.schedule_tasks
         except Exception as e:
@@ -770,15 +1007,15 @@ class ScheduleIntegrator:
                 self.create_schedule_analyzing_board()
             if not self.analyze_board:
                 return
-            self.get_schedule_tasks()
-            board = next((b for b in self.schedule_boards if board_name == b.title), None)
+            board = next((b for b in self.get_schedule_boards() if board_name == b.title), None)
             if not board:
                 return
+            self.get_schedule_tasks([board.id, self.analyze_board.id])
             column_ids = {c.id for c in self.schedule_columns if c.board_id == board.id}
-            copied_count = 0
+            tasks_data = []
             for task in self.schedule_tasks:
                 if task.column_id in column_ids:
-                    week = next((int(c.title.split()[1]) for c in self.schedule_columns if c.id == task.column_id and "Неделя" in c.title), None)
+                    week = self._column_weeks.get(task.column_id)
                     if week is not None:
                         column = self._get_column_by_week(week, self.analyze_board.id)
                         if column:
@@ -791,17 +1028,9 @@ class ScheduleIntegrator:
                                 task_data["deadline"] = task.deadline
                             if hasattr(task, 'stickers') and task.stickers:
                                 task_data["stickers"] = task.stickers
-                            create_response = self._api_call_with_retry(self.client.tasks.create, **task_data)
-                            task_id = create_response.get('id')
-                            if not task_id:
-                                self.logger.error(f"Не получен ID задачи '{task.title}'")
-                                continue
-                            # Получаем полные данные задачи
-                            task_data = self._api_call_with_retry(self.client.tasks.get, id=task_id)
-                            task = Task.model_validate(task_data)
-                            self._tasks_cache[task.id] = task
-                            copied_count += 1
-            self.get_schedule_tasks()
+                            tasks_data.append(task_data)
+            copied_count = self._create_tasks(tasks_data)
+            self.get_schedule_tasks([self.analyze_board.id])
             self.logger.info(f"Скопировано задач: {copied_count}")
         except Exception as e:
             self.logger.error(f"Ошибка при копировании задач: {e}")
\ No newline at end of file
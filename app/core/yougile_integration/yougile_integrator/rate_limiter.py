@@ -0,0 +1,80 @@
+"""
+Ограничение частоты запросов к YouGile API.
+
+YouGile допускает не более 50 запросов в минуту на компанию. TokenBucket
+выдаёт разрешения на запросы с постоянной скоростью, поэтому интегратор
+работает на допустимой частоте, не дожидаясь ошибок 429. Ограничитель общий
+для всех потоков и интеграторов процесса, работающих с одной компанией
+(в том числе с ключами разных пользователей компании).
+"""
+
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+YOUGILE_REQUESTS_PER_MINUTE = 50
+
+
+class TokenBucket:
+    """Потокобезопасный ограничитель частоты запросов (token bucket)."""
+
+    def __init__(self, requests_per_minute: int = YOUGILE_REQUESTS_PER_MINUTE, burst: int = 5):
+        """
+        Инициализация ограничителя.
+
+        Скорость пополнения выбирается так, чтобы с учётом начального запаса
+        в любом окне 60 секунд было не больше requests_per_minute запросов
+        (burst + скорость * 60 <= requests_per_minute).
+
+        Args:
+            requests_per_minute: Допустимое количество запросов в минуту.
+            burst: Количество запросов, которые можно выполнить без ожидания.
+        """
+        self.capacity = max(1, min(burst, requests_per_minute - 1))
+        self.rate = max(requests_per_minute - self.capacity, 1) / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Получение разрешения на запрос с ожиданием.
+
+        Разрешения выдаются в порядке обращения: каждый вызов резервирует
+        токен сразу и ждёт, пока тот накопится.
+
+        Returns:
+            float: Время ожидания (секунды).
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+_limiters: Dict[Tuple[Optional[str], int], TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: Optional[str], requests_per_minute: int = YOUGILE_REQUESTS_PER_MINUTE) -> TokenBucket:
+    """
+    Получение общего для процесса ограничителя.
+
+    Args:
+        key: ID компании YouGile (лимит действует на компанию); без него - ключ API.
+        requests_per_minute: Допустимое количество запросов в минуту.
+
+    Returns:
+        TokenBucket: Ограничитель компании.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get((key, requests_per_minute))
+        if limiter is None:
+            limiter = TokenBucket(requests_per_minute)
+            _limiters[(key, requests_per_minute)] = limiter
+        return limiter
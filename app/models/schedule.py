@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Union, Dict
 from datetime import date, datetime, time
 from enum import Enum
 
+from app.core.schedule_analyzer.constants import DEFAULT_TOP_K
+
 
 class ScheduleParseRequest(BaseModel):
     name: str = Field(..., description="Название группы, аудитории или имя преподавателя")
@@ -38,6 +40,7 @@ class WindowType(Enum):
     """Типы окон для поиска."""
     COMMON_WINDOW = "common_window"
     SPLIT_WINDOW = "split_window"
+    RECURRING_WINDOW = "recurring_window"
 
 
 class Window(BaseModel):
@@ -49,6 +52,8 @@ class Window(BaseModel):
     description: str
     participants: Optional[List[str]] = None
     days_count: int = 1
+    score: Optional[float] = None
+    room: Optional[str] = None
 
 
 class CommonWindowSearchParameters(BaseModel):
@@ -70,17 +75,35 @@ class CommonWindowSearchParameters(BaseModel):
     weight_start_time: float = Field(default=1.0, ge=0, description="Вес критерия времени начала")
     weight_total_idle: float = Field(default=1.0, ge=0, description="Вес критерия суммарного простоя")
     weight_max_gap: float = Field(default=1.0, ge=0, description="Вес критерия максимального промежутка")
+    top_k: int = Field(default=DEFAULT_TOP_K, ge=1, le=50, description="Количество лучших окон (лучшее и альтернативы)")
+    optimization_mode: str = Field(
+        default="participants", pattern="^(participants|min_conflict)$",
+        description="Режим поиска: participants - перебор подмножеств участников, min_conflict - окна с наименьшим числом занятых участников"
+    )
+    participant_weights: Optional[Dict[str, float]] = Field(
+        None, description="Вес конфликта участников для режима min_conflict (по умолчанию 1.0)"
+    )
 
 
 class CommonWindowRequest(BaseModel):
     """Объединенный запрос для поиска общего окна."""
     # Данные YouGile
-    login: str = Field(..., description="Логин YouGile")
-    password: str = Field(..., description="Пароль YouGile")
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
     project_title: str = Field(default="Учебное расписание", description="Название проекта")
 
+    # Источник расписаний
+    source: str = Field("yougile", pattern="^(yougile|local)$", description="Источник расписаний: доски YouGile или локальные расписания парсера")
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Расписания участников для локального источника (иначе JSON-файлы парсера)")
+    schedule_year: Optional[int] = Field(None, ge=2000, le=2100, description="Год начала локальных расписаний (по умолчанию текущий)")
+
     # Параметры поиска
     search_parameters: CommonWindowSearchParameters = Field(..., description="Параметры поиска общего окна")
+    dry_run: bool = Field(default=False, description="Только найти окна, не записывая результаты на доску анализа YouGile")
+
+    # Отладка производительности
+    debug_timing: bool = Field(default=False, description="Вернуть в ответе длительности этапов анализа и счётчики")
+    profile: bool = Field(default=False, description="Сохранить профиль cProfile запроса в каталог профилей")
 
 
 class SplitWindowSearchParameters(BaseModel):
@@ -104,17 +127,160 @@ class SplitWindowSearchParameters(BaseModel):
     weight_start_time: float = Field(default=1.0, ge=0, description="Вес критерия времени начала")
     weight_total_idle: float = Field(default=1.0, ge=0, description="Вес критерия суммарного простоя")
     weight_max_gap: float = Field(default=1.0, ge=0, description="Вес критерия максимального промежутка")
+    top_k: int = Field(default=DEFAULT_TOP_K, ge=1, le=50, description="Количество лучших окон (лучшее и альтернативы)")
 
 
 class SplitWindowRequest(BaseModel):
     """Запрос для поиска сплит-окна."""
     # Данные YouGile
-    login: str = Field(..., description="Логин YouGile")
-    password: str = Field(..., description="Пароль YouGile")
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
     project_title: str = Field(default="Учебное расписание", description="Название проекта")
 
+    # Источник расписаний
+    source: str = Field("yougile", pattern="^(yougile|local)$", description="Источник расписаний: доски YouGile или локальные расписания парсера")
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Расписания участников для локального источника (иначе JSON-файлы парсера)")
+    schedule_year: Optional[int] = Field(None, ge=2000, le=2100, description="Год начала локальных расписаний (по умолчанию текущий)")
+
     # Параметры поиска
     search_parameters: SplitWindowSearchParameters = Field(..., description="Параметры поиска сплит-окна")
+    dry_run: bool = Field(default=False, description="Только найти окна, не записывая результаты на доску анализа YouGile")
+
+    # Отладка производительности
+    debug_timing: bool = Field(default=False, description="Вернуть в ответе длительности этапов анализа и счётчики")
+    profile: bool = Field(default=False, description="Сохранить профиль cProfile запроса в каталог профилей")
+
+
+class RecurringWindowSearchParameters(BaseModel):
+    """Параметры поиска еженедельного окна."""
+    start_date: date = Field(..., description="Начальная дата поиска")
+    end_date: date = Field(..., description="Конечная дата поиска")
+    required_duration: float = Field(..., gt=0, description="Минимальная продолжительность окна в часах")
+    participants: List[str] = Field(..., min_items=1, description="Список участников (названия досок)")
+    earliest_start_time: time = Field(default=time(hour=7, minute=0), description="Начало рабочего времени")
+    latest_end_time: time = Field(default=time(hour=23, minute=0), description="Конец рабочего времени")
+    min_gap_hours: float = Field(default=0.0, ge=0, description="Минимальный промежуток между занятиями в часах")
+    include_holidays: bool = Field(default=False, description="Включать праздничные дни")
+    include_weekends: bool = Field(default=False, description="Включать выходные дни")
+    top_k: int = Field(default=DEFAULT_TOP_K, ge=1, le=50, description="Количество лучших (самых длинных) окон")
+
+
+class RecurringWindowRequest(BaseModel):
+    """Запрос для поиска еженедельного окна."""
+    # Данные YouGile
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
+    project_title: str = Field(default="Учебное расписание", description="Название проекта")
+
+    # Источник расписаний
+    source: str = Field("yougile", pattern="^(yougile|local)$", description="Источник расписаний: доски YouGile или локальные расписания парсера")
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Расписания участников для локального источника (иначе JSON-файлы парсера)")
+    schedule_year: Optional[int] = Field(None, ge=2000, le=2100, description="Год начала локальных расписаний (по умолчанию текущий)")
+
+    # Параметры поиска
+    search_parameters: RecurringWindowSearchParameters = Field(..., description="Параметры поиска еженедельного окна (результаты на доску анализа не записываются)")
+
+    # Отладка производительности
+    debug_timing: bool = Field(default=False, description="Вернуть в ответе длительности этапов анализа и счётчики")
+    profile: bool = Field(default=False, description="Сохранить профиль cProfile запроса в каталог профилей")
+
+
+class RoomWindowSearchParameters(BaseModel):
+    """Параметры поиска общего окна со свободной аудиторией."""
+    start_date: date = Field(..., description="Начальная дата поиска")
+    end_date: date = Field(..., description="Конечная дата поиска")
+    required_duration: float = Field(..., gt=0, description="Требуемая продолжительность окна в часах")
+    participants: List[str] = Field(..., min_items=1, description="Список участников (названия досок)")
+    rooms: List[str] = Field(..., min_items=1, description="Пул аудиторий (названия расписаний аудиторий) в порядке предпочтения")
+    earliest_start_time: time = Field(default=time(hour=7, minute=0), description="Начало рабочего времени")
+    latest_end_time: time = Field(default=time(hour=23, minute=0), description="Конец рабочего времени")
+    min_gap_hours: float = Field(default=0.0, ge=0, description="Минимальный промежуток между занятиями в часах")
+    minimize_start_time: bool = Field(default=True, description="Минимизировать время начала")
+    minimize_total_idle: bool = Field(default=True, description="Минимизировать суммарное время простоя")
+    minimize_max_gap: bool = Field(default=True, description="Минимизировать максимальный промежуток")
+    include_holidays: bool = Field(default=False, description="Включать праздничные дни")
+    include_weekends: bool = Field(default=False, description="Включать выходные дни")
+    weight_start_time: float = Field(default=1.0, ge=0, description="Вес критерия времени начала")
+    weight_total_idle: float = Field(default=1.0, ge=0, description="Вес критерия суммарного простоя")
+    weight_max_gap: float = Field(default=1.0, ge=0, description="Вес критерия максимального промежутка")
+    top_k: int = Field(default=DEFAULT_TOP_K, ge=1, le=50, description="Количество лучших окон (лучшее и альтернативы)")
+
+
+class RoomWindowRequest(BaseModel):
+    """Запрос для поиска общего окна со свободной аудиторией."""
+    # Данные YouGile
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
+    project_title: str = Field(default="Учебное расписание", description="Название проекта")
+
+    # Источник расписаний
+    source: str = Field("yougile", pattern="^(yougile|local)$", description="Источник расписаний: доски YouGile или локальные расписания парсера")
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Расписания участников и аудиторий для локального источника (иначе JSON-файлы парсера)")
+    schedule_year: Optional[int] = Field(None, ge=2000, le=2100, description="Год начала локальных расписаний (по умолчанию текущий)")
+
+    # Параметры поиска
+    search_parameters: RoomWindowSearchParameters = Field(..., description="Параметры поиска окна с аудиторией")
+    dry_run: bool = Field(default=False, description="Только найти окна, не записывая результаты на доску анализа YouGile")
+
+    # Отладка производительности
+    debug_timing: bool = Field(default=False, description="Вернуть в ответе длительности этапов анализа и счётчики")
+    profile: bool = Field(default=False, description="Сохранить профиль cProfile запроса в каталог профилей")
+
+
+class BatchWindowQuery(BaseModel):
+    """Один запрос поиска окна в составе пакета."""
+    query_id: Optional[str] = Field(None, description="Идентификатор запроса для сопоставления с ответом")
+    type: WindowType = Field(..., description="Тип окна")
+    search_parameters: Union[CommonWindowSearchParameters, SplitWindowSearchParameters, RecurringWindowSearchParameters] = Field(
+        ..., description="Параметры поиска общего окна, сплит-окна или еженедельного окна"
+    )
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Запрос пакетного анализа: много запросов поиска окон за один проход."""
+    # Данные YouGile
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
+    project_title: str = Field(default="Учебное расписание", description="Название проекта")
+
+    # Источник расписаний
+    source: str = Field("yougile", pattern="^(yougile|local)$", description="Источник расписаний: доски YouGile или локальные расписания парсера")
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Расписания участников для локального источника (иначе JSON-файлы парсера)")
+    schedule_year: Optional[int] = Field(None, ge=2000, le=2100, description="Год начала локальных расписаний (по умолчанию текущий)")
+
+    # Запросы
+    queries: List[BatchWindowQuery] = Field(..., min_length=1, max_length=100, description="Запросы поиска окон")
+
+    # Отладка производительности
+    debug_timing: bool = Field(default=False, description="Вернуть в ответе длительности этапов анализа и счётчики")
+    profile: bool = Field(default=False, description="Сохранить профиль cProfile запроса в каталог профилей")
+
+
+class StandingQueryRequest(BaseModel):
+    """Запрос регистрации постоянного поиска окна, результат которого обновляется при изменении досок."""
+    # Данные YouGile
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
+    project_title: str = Field(default="Учебное расписание", description="Название проекта")
+
+    # Источник расписаний
+    source: str = Field("yougile", pattern="^(yougile|local)$", description="Источник расписаний: доски YouGile или локальные расписания парсера")
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Расписания участников для локального источника (иначе JSON-файлы парсера)")
+    schedule_year: Optional[int] = Field(None, ge=2000, le=2100, description="Год начала локальных расписаний (по умолчанию текущий)")
+
+    # Запрос
+    query: BatchWindowQuery = Field(..., description="Запрос поиска окна")
+
+
+class StandingQueryRefreshRequest(BaseModel):
+    """Запрос обновления досок постоянного поиска окна."""
+    # Данные YouGile
+    login: Optional[str] = Field(None, description="Логин YouGile (обязателен для источника yougile, тот же, что при регистрации)")
+    password: Optional[str] = Field(None, description="Пароль YouGile (обязателен для источника yougile)")
+
+    # Изменения
+    schedules: Optional[Dict[str, List[ScheduleDay]]] = Field(None, description="Новые расписания досок для локального источника")
+    boards: Optional[List[str]] = Field(None, description="Доски для перечитывания (по умолчанию все доски запроса)")
 
 
 class WindowResponse(BaseModel):
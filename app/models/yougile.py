@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from .schedule import ScheduleDay
 
 class YouGileIntegrateRequest(BaseModel):
@@ -8,9 +8,17 @@ class YouGileIntegrateRequest(BaseModel):
     schedule_data: List[ScheduleDay] = Field(..., description="Данные расписания")
     schedule_name: str = Field(..., description="Название расписания")
     project_title: str = Field("Учебное расписание", description="Название проекта")
+    sync_tasks: bool = Field(True, description="Изменять только отличающиеся задачи (False - пересоздать все задачи доски)")
 
 class YouGileIntegrateResponse(BaseModel):
     success: bool
     message: str
     data: Optional[dict] = None
 
+class YouGileWebhookEvent(BaseModel):
+    event: str = Field(..., description="Название события YouGile, например task-updated")
+    payload: Dict[str, Any] = Field(default_factory=dict, description="Данные сущности события")
+
+class YouGileWebhookResponse(BaseModel):
+    success: bool
+    message: str
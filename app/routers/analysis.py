@@ -1,18 +1,22 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, BackgroundTasks
 from typing import Optional
-from app.models.schedule import SplitWindowRequest, WindowResponse, CommonWindowRequest
+from app.models.schedule import (
+    SplitWindowRequest, WindowResponse, CommonWindowRequest, BatchAnalysisRequest, RecurringWindowRequest,
+    RoomWindowRequest, StandingQueryRequest, StandingQueryRefreshRequest
+)
 from app.services.schedule_analyzer import ScheduleAnalyzerService
 
 router = APIRouter(prefix="/api/v1/schedule/analyze", tags=["analysis"])
 schedule_analyzer_service = ScheduleAnalyzerService()
 
 @router.post("/common-window", response_model=WindowResponse)
-async def find_common_window(request: CommonWindowRequest):
+async def find_common_window(request: CommonWindowRequest, background_tasks: BackgroundTasks):
     """
     Поиск общего окна для нескольких расписаний.
+    Запись результатов в YouGile выполняется в фоне после ответа (dry_run отключает её).
     """
     try:
-        result = await schedule_analyzer_service.find_common_window_service(request)
+        result = await schedule_analyzer_service.find_common_window_service(request, background_tasks)
         if not result.success:
             raise HTTPException(status_code=400, detail=result.message)
         return result
@@ -20,14 +24,104 @@ async def find_common_window(request: CommonWindowRequest):
         raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
 
 @router.post("/split-window", response_model=WindowResponse)
-async def find_split_window(request: SplitWindowRequest):
+async def find_split_window(request: SplitWindowRequest, background_tasks: BackgroundTasks):
     """
     Поиск сплит окна с заданной общей продолжительностью.
+    Запись результатов в YouGile выполняется в фоне после ответа (dry_run отключает её).
     """
     try:
-        result = await schedule_analyzer_service.find_split_window(request)
+        result = await schedule_analyzer_service.find_split_window(request, background_tasks)
         if not result.success:
             raise HTTPException(status_code=400, detail=result.message)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+@router.post("/recurring-window", response_model=WindowResponse)
+async def find_recurring_window(request: RecurringWindowRequest, background_tasks: BackgroundTasks):
+    """
+    Поиск еженедельного окна: интервал дня недели, свободный у всех участников каждую неделю.
+    Запись результатов в YouGile выполняется в фоне после ответа (dry_run отключает её).
+    """
+    try:
+        result = await schedule_analyzer_service.find_recurring_window(request, background_tasks)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+@router.post("/room-window", response_model=WindowResponse)
+async def find_room_window(request: RoomWindowRequest, background_tasks: BackgroundTasks):
+    """
+    Поиск общего окна участников вместе со свободной аудиторией из пула расписаний аудиторий.
+    Запись результатов в YouGile выполняется в фоне после ответа (dry_run отключает её).
+    """
+    try:
+        result = await schedule_analyzer_service.find_room_window(request, background_tasks)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+@router.post("/batch", response_model=WindowResponse)
+async def analyze_batch(request: BatchAnalysisRequest):
+    """
+    Пакетный поиск окон: много запросов (разные длительности, участники, диапазоны дат)
+    выполняются за один проход, результаты возвращаются вместе.
+    """
+    try:
+        result = await schedule_analyzer_service.analyze_batch(request)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+@router.post("/standing", response_model=WindowResponse)
+async def register_standing_query(request: StandingQueryRequest):
+    """
+    Регистрация постоянного запроса поиска окна.
+    Результат хранится в сервисе и пересчитывается по дням при обновлении досок.
+    """
+    try:
+        result = await schedule_analyzer_service.register_standing_query(request)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+@router.get("/standing/{standing_query_id}", response_model=WindowResponse)
+async def get_standing_query(standing_query_id: str):
+    """
+    Текущий результат постоянного запроса без пересчёта.
+    """
+    result = schedule_analyzer_service.get_standing_query(standing_query_id)
+    if not result.success:
+        raise HTTPException(status_code=404, detail=result.message)
+    return result
+
+@router.post("/standing/{standing_query_id}/refresh", response_model=WindowResponse)
+async def refresh_standing_query(standing_query_id: str, request: StandingQueryRefreshRequest):
+    """
+    Перечитывание досок постоянного запроса и пересчёт затронутых дней.
+    """
+    try:
+        result = await schedule_analyzer_service.refresh_standing_query(standing_query_id, request)
+        if not result.success:
+            raise HTTPException(status_code=400, detail=result.message)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+
+@router.delete("/standing/{standing_query_id}", response_model=WindowResponse)
+async def remove_standing_query(standing_query_id: str):
+    """
+    Удаление постоянного запроса.
+    """
+    result = schedule_analyzer_service.remove_standing_query(standing_query_id)
+    if not result.success:
+        raise HTTPException(status_code=404, detail=result.message)
+    return result
@@ -20,7 +20,10 @@ async def health_check():
             "analysis_window_by_width": "/api/v1/schedule/analyze/window-by-width",
             "analysis_window_by_width_and_length": "/api/v1/schedule/analyze/window-by-width-and-length",
             "analysis_window_by_volume": "/api/v1/schedule/analyze/window-by-volume",
-            "analysis_common_window": "/api/v1/schedule/analyze/common-window"
+            "analysis_common_window": "/api/v1/schedule/analyze/common-window",
+            "analysis_recurring_window": "/api/v1/schedule/analyze/recurring-window",
+            "analysis_room_window": "/api/v1/schedule/analyze/room-window",
+            "analysis_batch": "/api/v1/schedule/analyze/batch"
         }
     }
 
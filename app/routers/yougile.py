@@ -1,8 +1,11 @@
+from typing import Optional
 from fastapi import APIRouter, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from app.models.yougile import (
-    YouGileIntegrateRequest, YouGileIntegrateResponse
+    YouGileIntegrateRequest, YouGileIntegrateResponse, YouGileWebhookEvent, YouGileWebhookResponse
 )
 from app.services.yougile_service import YouGileService
+from app.services.yougile_cache import apply_webhook_event
 
 router = APIRouter(prefix="/api/v1/yougile", tags=["yougile"])
 yougile_service = YouGileService()
@@ -27,3 +30,23 @@ async def integrate_schedule(request: YouGileIntegrateRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
 
+
+@router.post("/webhook/{company_id}", response_model=YouGileWebhookResponse)
+async def receive_webhook(company_id: str, request: YouGileWebhookEvent, token: Optional[str] = None):
+    """
+    Приём событий YouGile для обновления общего кэша сущностей
+
+    - **company_id**: ID компании YouGile
+    - **token**: Токен вебхука (YOUGILE_WEBHOOK_SECRET)
+    - **event**: Название события (task-created, column-updated, ...)
+    - **payload**: Данные сущности
+    """
+    try:
+        accepted, message = await run_in_threadpool(
+            apply_webhook_event, company_id, token, request.event, request.payload
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Внутренняя ошибка сервера: {str(e)}")
+    if not accepted:
+        raise HTTPException(status_code=403, detail=message)
+    return YouGileWebhookResponse(success=True, message=message)
@@ -1,92 +1,377 @@
 import sys
 import os
+import uuid
 import logging
+import threading
+from collections import OrderedDict
+from fastapi import BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
+from datetime import datetime
+from typing import Optional, Tuple, Dict, Any, List
 
 # Добавляем путь к модулям прототипа
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
 
 from yougile_integration.yougile_api_wrapper.yougile_api import YouGileClient
-from yougile_integration.yougile_integrator.integrator import ScheduleIntegrator
-from schedule_analyzer.analyzer import ScheduleAnalyzer
-from app.models.schedule import SplitWindowRequest, WindowResponse, CommonWindowRequest
+from schedule_analyzer.analyzer import ScheduleAnalyzer, Window
+from schedule_analyzer.slot_sources import LocalSlotSource, YouGileSlotSource
+from schedule_analyzer.parallel import shutdown_process_pool
+from schedule_analyzer.work_calendar import WorkCalendar
+from schedule_analyzer.timing import StageTimer
+from app.models.schedule import (
+    SplitWindowRequest, WindowResponse, CommonWindowRequest, BatchAnalysisRequest,
+    CommonWindowSearchParameters, SplitWindowSearchParameters, WindowType,
+    RecurringWindowRequest, RecurringWindowSearchParameters, RoomWindowRequest, RoomWindowSearchParameters,
+    BatchWindowQuery, StandingQueryRequest, StandingQueryRefreshRequest
+)
 from app.models.yougile import YouGileIntegrateRequest
+from app.config import settings
+from app.services.yougile_auth import get_api_key, invalidate_api_key
+from app.services.yougile_cache import create_integrator
 
 logger = logging.getLogger(__name__)
 
+
+def shutdown_analysis_pool() -> None:
+    """Остановка общего пула процессов поиска окон при остановке сервиса"""
+    shutdown_process_pool()
+
+
 class ScheduleAnalyzerService:
     """Сервис для анализа расписания"""
 
     def __init__(self):
-        pass
+        self._calendar: Optional[WorkCalendar] = None
+        # Постоянные запросы: ID -> анализатор с зарегистрированным запросом,
+        # блокировка анализатора, источник и логин владельца
+        self._standing_queries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._standing_lock = threading.Lock()
 
-    async def find_common_window_service(self, request: CommonWindowRequest) -> WindowResponse:
+    def _get_calendar(self) -> WorkCalendar:
         """
-        Поиск общего окна для одного/нескольких расписаний
+        Календарь нерабочих дней, общий для всех запросов сервиса
+
+        Переопределения академического календаря читаются из файла,
+        указанного в настройках, при первом обращении.
+
+        Returns:
+            WorkCalendar: Календарь нерабочих дней
+        """
+        if self._calendar is None:
+            if settings.academic_calendar_file and os.path.isfile(settings.academic_calendar_file):
+                self._calendar = WorkCalendar.from_file(settings.academic_calendar_file)
+                logger.info(f"Загружен академический календарь: {settings.academic_calendar_file}")
+            else:
+                self._calendar = WorkCalendar()
+        return self._calendar
+
+    async def _create_client(self, login: str, password: str) -> Tuple[Optional[YouGileClient], Optional[str]]:
+        """
+        Создание клиента YouGile с токеном доступа
+
+        Ключ берётся из общего кэша ключей или запрашивается асинхронным
+        клиентом, не блокируя цикл событий. Отклонённый сервером ключ
+        удаляется из кэша.
 
         Args:
-            request: Объединенный запрос с данными YouGile и параметрами поиска
+            login: Логин YouGile
+            password: Пароль YouGile
 
         Returns:
-            WindowResponse: Результат поиска
+            Tuple: Клиент (или None) и сообщение об ошибке (или None)
         """
-        try:
-            # Создаем клиент YouGile
-            client = YouGileClient(login=request.login, password=request.password)
+        token, error = await get_api_key(login, password)
+        if not token:
+            return None, error
+        return YouGileClient(token=token, login=login, password=password, on_auth_error=invalidate_api_key), None
 
-            # Получаем токен
-            companies = client.auth.get_companies(request.login, request.password)
-            if not companies.get('content'):
-                return WindowResponse(
-                    success=False,
-                    message="Не удалось получить список компаний"
-                )
+    async def _run_blocking(self, timer: StageTimer, func, *args, **kwargs):
+        """
+        Выполнение блокирующей работы (запросы интегратора, поиск окон) в пуле потоков
 
-            company_id = companies['content'][0].get('id')
-            keys = client.auth.get_keys(request.login, request.password, company_id)
-            if not keys:
-                key = client.auth.create_key(request.login, request.password, company_id)
-                keys = [key] if key else []
+        При профилировании cProfile включается внутри рабочего потока
+        (StageTimer.run), поэтому цикл событий не блокируется.
 
-            if not keys:
-                return WindowResponse(
-                    success=False,
-                    message="Не удалось получить ключи доступа"
-                )
+        Args:
+            timer: Таймер запроса
+            func: Функция
+            *args: Позиционные аргументы
+            **kwargs: Именованные аргументы
+
+        Returns:
+            Результат функции
+        """
+        return await run_in_threadpool(timer.run, func, *args, **kwargs)
+
+    def _create_timer(self, request) -> StageTimer:
+        """
+        Создание таймера этапов для запроса анализа
+
+        Этапы замеряются при debug_timing, при profile профиль cProfile
+        сохраняется в каталог профилей.
 
-            token = keys[0].get('key')
-            client.set_token(token)
-
-            # Создаем интегратор и анализатор
-            integrator = ScheduleIntegrator(client)
-            analyzer = ScheduleAnalyzer(integrator)
-
-            # Извлекаем параметры поиска
-            params = request.search_parameters
-
-            # Формируем конфигурацию алгоритма
-            algorithm_config = {
-                "type": "common_window",
-                "start_date": params.start_date,
-                "end_date": params.end_date,
-                "required_duration": params.required_duration,
-                "participants": params.participants,
-                "earliest_start_time": params.earliest_start_time,
-                "latest_end_time": params.latest_end_time,
-                "min_gap_hours": params.min_gap_hours,
-                "include_holidays": params.include_holidays,
-                "include_weekends": params.include_weekends,
-                "maximize_participants": params.maximize_participants,
-                "minimize_start_time": params.minimize_start_time,
-                "minimize_total_idle": params.minimize_total_idle,
-                "minimize_max_gap": params.minimize_max_gap,
-                "weight_participants": params.weight_participants,
-                "weight_start_time": params.weight_start_time,
-                "weight_total_idle": params.weight_total_idle,
-                "weight_max_gap": params.weight_max_gap
+        Args:
+            request: Запрос с флагами debug_timing и profile
+
+        Returns:
+            StageTimer: Таймер запроса
+        """
+        profile_path = None
+        if request.profile:
+            profile_path = os.path.join(settings.profiles_dir, f"analysis_{datetime.now():%Y%m%d_%H%M%S_%f}.prof")
+        return StageTimer(enabled=request.debug_timing, profile_path=profile_path)
+
+    def _timing_data(self, request, timer: StageTimer, analyzer: ScheduleAnalyzer) -> Dict[str, Any]:
+        """
+        Замеры запроса для добавления в данные ответа
+
+        Args:
+            request: Запрос с флагами debug_timing и profile
+            timer: Таймер запроса
+            analyzer: Анализатор запроса
+
+        Returns:
+            Dict[str, Any]: {"timing": ...} или пустой словарь, если замеры не запрошены
+        """
+        if not request.debug_timing and not request.profile:
+            return {}
+        if analyzer.integrator:
+            timer.count("api_calls", analyzer.integrator.client.request_count)
+        return {"timing": timer.to_dict()}
+
+    async def _create_analyzer(self, request, timer: Optional[StageTimer] = None) -> Tuple[Optional[ScheduleAnalyzer], Optional[str]]:
+        """
+        Создание анализатора для источника расписаний из запроса
+
+        Для источника local слоты берутся из переданных расписаний или JSON-файлов
+        парсера, обращений к YouGile не выполняется.
+
+        Args:
+            request: Запрос с данными YouGile и источником расписаний
+            timer: Таймер этапов запроса
+
+        Returns:
+            Tuple: Анализатор (или None) и сообщение об ошибке (или None)
+        """
+        timer = timer or StageTimer(enabled=False)
+        if request.source == "local":
+            schedules = {
+                name: [day.model_dump() for day in days]
+                for name, days in (request.schedules or {}).items()
             }
+            slot_source = LocalSlotSource(schedules, json_dir=settings.json_schedules_dir, year=request.schedule_year)
+            return ScheduleAnalyzer(None, slot_source=slot_source, calendar=self._get_calendar(), timer=timer), None
+
+        if not request.login or not request.password:
+            return None, "Для источника yougile необходимо указать логин и пароль"
+
+        with timer.stage("auth"):
+            client, error = await self._create_client(request.login, request.password)
+        if not client:
+            return None, error
+
+        with timer.stage("yougile_fetch"):
+            integrator = await self._run_blocking(timer, create_integrator, client, request.login)
+        return ScheduleAnalyzer(integrator, calendar=self._get_calendar(), timer=timer), None
+
+    def _run_analysis(self, analyzer: ScheduleAnalyzer, request, algorithm_config: Dict[str, Any],
+                      background_tasks: Optional[BackgroundTasks] = None) -> List[Window]:
+        """
+        Выполнение одного алгоритма без изменений в YouGile
 
-            # Выполняем анализ расписания
-            found_windows = analyzer.analyze_schedule([algorithm_config], board_names=params.participants)
+        Запись результатов на доску анализа (если источник yougile и не задан dry_run)
+        выполняется отдельным шагом: в фоне после ответа или синхронно, если
+        фоновые задачи недоступны или запрошены замеры этапов (чтобы запись
+        вошла в замеры).
+
+        Args:
+            analyzer: Анализатор расписания
+            request: Запрос с источником расписаний и флагом dry_run
+            algorithm_config: Конфигурация алгоритма
+            background_tasks: Фоновые задачи FastAPI
+
+        Returns:
+            List[Window]: Найденные окна
+        """
+        participants = algorithm_config["participants"]
+        found_windows = analyzer.analyze_schedule([algorithm_config], board_names=participants, dry_run=True)
+
+        # Еженедельное окно не соответствует одной датированной задаче, поэтому не записывается
+        if algorithm_config["type"] == "recurring_window":
+            return found_windows
+        if request.source == "yougile" and not request.dry_run and found_windows:
+            if background_tasks is not None and not request.debug_timing:
+                background_tasks.add_task(analyzer.publish_results, participants, found_windows[:1])
+            else:
+                analyzer.publish_results(participants, found_windows[:1])
+        return found_windows
+
+    def _common_window_config(self, params: CommonWindowSearchParameters) -> Dict[str, Any]:
+        """Формирование конфигурации алгоритма поиска общего окна"""
+        return {
+            "type": "min_conflict_window" if params.optimization_mode == "min_conflict" else "common_window",
+            "start_date": params.start_date,
+            "end_date": params.end_date,
+            "required_duration": params.required_duration,
+            "participants": params.participants,
+            "earliest_start_time": params.earliest_start_time,
+            "latest_end_time": params.latest_end_time,
+            "min_gap_hours": params.min_gap_hours,
+            "include_holidays": params.include_holidays,
+            "include_weekends": params.include_weekends,
+            "maximize_participants": params.maximize_participants,
+            "minimize_start_time": params.minimize_start_time,
+            "minimize_total_idle": params.minimize_total_idle,
+            "minimize_max_gap": params.minimize_max_gap,
+            "weight_participants": params.weight_participants,
+            "weight_start_time": params.weight_start_time,
+            "weight_total_idle": params.weight_total_idle,
+            "weight_max_gap": params.weight_max_gap,
+            "participant_weights": params.participant_weights,
+            "top_k": params.top_k,
+            "workers": settings.analysis_workers
+        }
+
+    def _split_window_config(self, params: SplitWindowSearchParameters) -> Dict[str, Any]:
+        """Формирование конфигурации алгоритма поиска сплит-окна"""
+        return {
+            "type": "split_window",
+            "start_date": params.start_date,
+            "end_date": params.end_date,
+            "total_duration": params.total_duration,
+            "min_segment_duration": params.min_segment_duration,
+            "max_segments": params.max_segments,
+            "participants": params.participants,
+            "earliest_start_time": params.earliest_start_time,
+            "latest_end_time": params.latest_end_time,
+            "min_gap_hours": params.min_gap_hours,
+            "include_holidays": params.include_holidays,
+            "include_weekends": params.include_weekends,
+            "maximize_participants": params.maximize_participants,
+            "minimize_start_time": params.minimize_start_time,
+            "minimize_total_idle": params.minimize_total_idle,
+            "minimize_max_gap": params.minimize_max_gap,
+            "weight_participants": params.weight_participants,
+            "weight_start_time": params.weight_start_time,
+            "weight_total_idle": params.weight_total_idle,
+            "weight_max_gap": params.weight_max_gap,
+            "top_k": params.top_k,
+            "workers": settings.analysis_workers
+        }
+
+    def _recurring_window_config(self, params: RecurringWindowSearchParameters) -> Dict[str, Any]:
+        """Формирование конфигурации алгоритма поиска еженедельного окна"""
+        return {
+            "type": "recurring_window",
+            "start_date": params.start_date,
+            "end_date": params.end_date,
+            "required_duration": params.required_duration,
+            "participants": params.participants,
+            "earliest_start_time": params.earliest_start_time,
+            "latest_end_time": params.latest_end_time,
+            "min_gap_hours": params.min_gap_hours,
+            "include_holidays": params.include_holidays,
+            "include_weekends": params.include_weekends,
+            "top_k": params.top_k
+        }
+
+    def _room_window_config(self, params: RoomWindowSearchParameters) -> Dict[str, Any]:
+        """Формирование конфигурации алгоритма поиска окна со свободной аудиторией"""
+        return {
+            "type": "room_window",
+            "start_date": params.start_date,
+            "end_date": params.end_date,
+            "required_duration": params.required_duration,
+            "participants": params.participants,
+            "rooms": params.rooms,
+            "earliest_start_time": params.earliest_start_time,
+            "latest_end_time": params.latest_end_time,
+            "min_gap_hours": params.min_gap_hours,
+            "minimize_start_time": params.minimize_start_time,
+            "minimize_total_idle": params.minimize_total_idle,
+            "minimize_max_gap": params.minimize_max_gap,
+            "include_holidays": params.include_holidays,
+            "include_weekends": params.include_weekends,
+            "weight_start_time": params.weight_start_time,
+            "weight_total_idle": params.weight_total_idle,
+            "weight_max_gap": params.weight_max_gap,
+            "top_k": params.top_k
+        }
+
+    def _query_config(self, query: BatchWindowQuery) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Формирование конфигурации алгоритма для запроса пакета или постоянного запроса
+
+        Args:
+            query: Запрос поиска окна
+
+        Returns:
+            Tuple: Конфигурация (или None) и сообщение об ошибке (или None)
+        """
+        params = query.search_parameters
+        if query.type == WindowType.SPLIT_WINDOW:
+            if not isinstance(params, SplitWindowSearchParameters):
+                return None, f"Некорректные параметры сплит-окна в запросе {query.query_id}"
+            return self._split_window_config(params), None
+        if query.type == WindowType.RECURRING_WINDOW:
+            # Параметры еженедельного окна совпадают с частью параметров общего окна,
+            # поэтому при разборе запроса они могут прийти как параметры общего окна
+            if not isinstance(params, (RecurringWindowSearchParameters, CommonWindowSearchParameters)):
+                return None, f"Некорректные параметры еженедельного окна в запросе {query.query_id}"
+            params = RecurringWindowSearchParameters(
+                **params.model_dump(include=set(RecurringWindowSearchParameters.model_fields))
+            )
+            return self._recurring_window_config(params), None
+        if not isinstance(params, CommonWindowSearchParameters):
+            return None, f"Некорректные параметры общего окна в запросе {query.query_id}"
+        return self._common_window_config(params), None
+
+    def _window_to_dict(self, window: Window) -> Dict[str, Any]:
+        """Преобразование найденного окна в формат ответа"""
+        return {
+            "start": window.start.isoformat(),
+            "end": window.end.isoformat(),
+            "duration_hours": window.duration_hours,
+            "window_type": window.window_type.value,
+            "description": window.description,
+            "participants": window.participants,
+            "days_count": window.days_count,
+            "score": window.score,
+            "room": window.room
+        }
+
+    async def find_common_window_service(self, request: CommonWindowRequest,
+                                         background_tasks: Optional[BackgroundTasks] = None) -> WindowResponse:
+        """
+        Поиск общего окна для одного/нескольких расписаний
+
+        Args:
+            request: Объединенный запрос с данными YouGile и параметрами поиска
+            background_tasks: Фоновые задачи для записи результатов в YouGile
+
+        Returns:
+            WindowResponse: Результат поиска
+        """
+        try:
+            # Замеры этапов и профилирование (по запросу)
+            timer = self._create_timer(request)
+            with timer:
+                # Создаем анализатор для выбранного источника расписаний
+                analyzer, error = await self._create_analyzer(request, timer)
+                if not analyzer:
+                    return WindowResponse(success=False, message=error)
+
+                # Извлекаем параметры поиска
+                params = request.search_parameters
+
+                # Формируем конфигурацию алгоритма
+                algorithm_config = self._common_window_config(params)
+
+                # Выполняем анализ расписания
+                found_windows = await self._run_blocking(
+                    timer, self._run_analysis, analyzer, request, algorithm_config, background_tasks
+                )
+            timing = self._timing_data(request, timer, analyzer)
 
             if not found_windows:
                 return WindowResponse(
@@ -95,23 +380,13 @@ class ScheduleAnalyzerService:
                     data={
                         "project_title": request.project_title,
                         "analysis_result": [],
-                        "found_windows_count": 0
+                        "found_windows_count": 0,
+                        **timing
                     }
                 )
 
             # Преобразуем найденные окна в формат ответа
-            windows_data = []
-            for window in found_windows:
-                window_data = {
-                    "start": window.start.isoformat(),
-                    "end": window.end.isoformat(),
-                    "duration_hours": window.duration_hours,
-                    "window_type": window.window_type.value,
-                    "description": window.description,
-                    "participants": window.participants,
-                    "days_count": window.days_count
-                }
-                windows_data.append(window_data)
+            windows_data = [self._window_to_dict(window) for window in found_windows]
 
             return WindowResponse(
                 success=True,
@@ -125,7 +400,8 @@ class ScheduleAnalyzerService:
                         "end_date": params.end_date.isoformat(),
                         "required_duration": params.required_duration,
                         "participants": params.participants
-                    }
+                    },
+                    **timing
                 }
             )
 
@@ -136,98 +412,412 @@ class ScheduleAnalyzerService:
                 message=f"Ошибка при поиске общего окна: {str(e)}"
             )
 
-    async def find_split_window(self, request: SplitWindowRequest) -> WindowResponse:
+    async def find_split_window(self, request: SplitWindowRequest,
+                                background_tasks: Optional[BackgroundTasks] = None) -> WindowResponse:
         """
         Поиск сплит окна заданной общей продолжительностью
 
         Args:
             request: Запрос на поиск сплит-окна
+            background_tasks: Фоновые задачи для записи результатов в YouGile
 
         Returns:
             WindowResponse: Результат поиска
         """
         try:
-            # Создаем клиент YouGile
-            client = YouGileClient(login=request.login, password=request.password)
-
-            # Получаем токен
-            companies = client.auth.get_companies(request.login, request.password)
-            if not companies.get('content'):
-                return WindowResponse(
-                    success=False,
-                    message="Не удалось получить список компаний"
+            # Замеры этапов и профилирование (по запросу)
+            timer = self._create_timer(request)
+            with timer:
+                # Создаем анализатор для выбранного источника расписаний
+                analyzer, error = await self._create_analyzer(request, timer)
+                if not analyzer:
+                    return WindowResponse(success=False, message=error)
+
+                # Извлекаем параметры поиска
+                params = request.search_parameters
+
+                # Формируем конфигурацию алгоритма для сплит-окна
+                algorithm_config = self._split_window_config(params)
+
+                # Выполняем анализ расписания
+                found_windows = await self._run_blocking(
+                    timer, self._run_analysis, analyzer, request, algorithm_config, background_tasks
                 )
+            timing = self._timing_data(request, timer, analyzer)
+            windows_data = [self._window_to_dict(window) for window in found_windows]
+
+            return WindowResponse(
+                success=True,
+                message=f"Найдено окон: {len(found_windows)}" if found_windows else "Сплит-окно не найдено",
+                data={
+                    "project_title": request.project_title,
+                    "analysis_result": windows_data,
+                    "found_windows_count": len(found_windows),
+                    "search_parameters": {
+                        "start_date": params.start_date.isoformat(),
+                        "end_date": params.end_date.isoformat(),
+                        "total_duration": params.total_duration,
+                        "participants": params.participants
+                    },
+                    **timing
+                }
+            )
 
-            company_id = companies['content'][0].get('id')
-            keys = client.auth.get_keys(request.login, request.password, company_id)
-            if not keys:
-                key = client.auth.create_key(request.login, request.password, company_id)
-                keys = [key] if key else []
+        except Exception as e:
+            logger.error(f"Ошибка при поиске сплит-окна: {e}")
+            return WindowResponse(
+                success=False,
+                message=f"Ошибка при поиске сплит-окна: {str(e)}"
+            )
 
-            if not keys:
-                return WindowResponse(
-                    success=False,
-                    message="Не удалось получить ключи доступа"
-                )
+    async def find_recurring_window(self, request: RecurringWindowRequest,
+                                    background_tasks: Optional[BackgroundTasks] = None) -> WindowResponse:
+        """
+        Поиск еженедельного окна: один и тот же интервал дня недели, свободный каждую неделю
 
-            token = keys[0].get('key')
-            client.set_token(token)
-
-            # Создаем интегратор и анализатор
-            integrator = ScheduleIntegrator(client)
-            analyzer = ScheduleAnalyzer(integrator)
-
-            # Извлекаем параметры поиска
-            params = request.search_parameters
-
-            # Формируем конфигурацию алгоритма для сплит-окна
-            algorithm_config = {
-                "type": "split_window",
-                "start_date": params.start_date,
-                "end_date": params.end_date,
-                "total_duration": params.total_duration,
-                "min_segment_duration": params.min_segment_duration,
-                "max_segments": params.max_segments,
-                "participants": params.participants,
-                "earliest_start_time": params.earliest_start_time,
-                "latest_end_time": params.latest_end_time,
-                "min_gap_hours": params.min_gap_hours,
-                "include_holidays": params.include_holidays,
-                "include_weekends": params.include_weekends,
-                "maximize_participants": params.maximize_participants,
-                "minimize_start_time": params.minimize_start_time,
-                "minimize_total_idle": params.minimize_total_idle,
-                "minimize_max_gap": params.minimize_max_gap,
-                "weight_participants": params.weight_participants,
-                "weight_start_time": params.weight_start_time,
-                "weight_total_idle": params.weight_total_idle,
-                "weight_max_gap": params.weight_max_gap
-            }
+        Args:
+            request: Запрос на поиск еженедельного окна
+            background_tasks: Фоновые задачи для записи результатов в YouGile
 
-            # Выполняем анализ расписания
-            found_windows = analyzer.analyze_schedule([algorithm_config], board_names=params.participants)
+        Returns:
+            WindowResponse: Результат поиска
+        """
+        try:
+            # Замеры этапов и профилирование (по запросу)
+            timer = self._create_timer(request)
+            with timer:
+                # Создаем анализатор для выбранного источника расписаний
+                analyzer, error = await self._create_analyzer(request, timer)
+                if not analyzer:
+                    return WindowResponse(success=False, message=error)
+
+                # Извлекаем параметры поиска
+                params = request.search_parameters
+
+                # Формируем конфигурацию алгоритма для еженедельного окна
+                algorithm_config = self._recurring_window_config(params)
+
+                # Выполняем анализ расписания
+                found_windows = await self._run_blocking(
+                    timer, self._run_analysis, analyzer, request, algorithm_config, background_tasks
+                )
+            timing = self._timing_data(request, timer, analyzer)
+            windows_data = [self._window_to_dict(window) for window in found_windows]
 
-            # Поскольку метод find_split_window в анализаторе еще не реализован,
-            # возвращаем соответствующее сообщение
             return WindowResponse(
-                success=False,
-                message="Алгоритм поиска сплит-окна еще не реализован в ScheduleAnalyzer",
+                success=True,
+                message=f"Найдено окон: {len(found_windows)}" if found_windows else "Еженедельное окно не найдено",
                 data={
                     "project_title": request.project_title,
-                    "analysis_result": [],
-                    "found_windows_count": 0,
+                    "analysis_result": windows_data,
+                    "found_windows_count": len(found_windows),
                     "search_parameters": {
                         "start_date": params.start_date.isoformat(),
                         "end_date": params.end_date.isoformat(),
-                        "total_duration": params.total_duration,
+                        "required_duration": params.required_duration,
                         "participants": params.participants
-                    }
+                    },
+                    **timing
                 }
             )
 
         except Exception as e:
-            logger.error(f"Ошибка при поиске сплит-окна: {e}")
+            logger.error(f"Ошибка при поиске еженедельного окна: {e}")
             return WindowResponse(
                 success=False,
-                message=f"Ошибка при поиске сплит-окна: {str(e)}"
-            )
\ No newline at end of file
+                message=f"Ошибка при поиске еженедельного окна: {str(e)}"
+            )
+
+    async def find_room_window(self, request: RoomWindowRequest,
+                               background_tasks: Optional[BackgroundTasks] = None) -> WindowResponse:
+        """
+        Поиск общего окна участников вместе со свободной аудиторией из пула
+
+        Args:
+            request: Запрос на поиск окна с аудиторией
+            background_tasks: Фоновые задачи для записи результатов в YouGile
+
+        Returns:
+            WindowResponse: Результат поиска (пары окно - аудитория)
+        """
+        try:
+            # Замеры этапов и профилирование (по запросу)
+            timer = self._create_timer(request)
+            with timer:
+                # Создаем анализатор для выбранного источника расписаний
+                analyzer, error = await self._create_analyzer(request, timer)
+                if not analyzer:
+                    return WindowResponse(success=False, message=error)
+
+                # Извлекаем параметры поиска
+                params = request.search_parameters
+
+                # Формируем конфигурацию алгоритма для окна с аудиторией
+                algorithm_config = self._room_window_config(params)
+
+                # Выполняем анализ расписания
+                found_windows = await self._run_blocking(
+                    timer, self._run_analysis, analyzer, request, algorithm_config, background_tasks
+                )
+            timing = self._timing_data(request, timer, analyzer)
+            windows_data = [self._window_to_dict(window) for window in found_windows]
+
+            return WindowResponse(
+                success=True,
+                message=f"Найдено окон: {len(found_windows)}" if found_windows else "Окно со свободной аудиторией не найдено",
+                data={
+                    "project_title": request.project_title,
+                    "analysis_result": windows_data,
+                    "found_windows_count": len(found_windows),
+                    "search_parameters": {
+                        "start_date": params.start_date.isoformat(),
+                        "end_date": params.end_date.isoformat(),
+                        "required_duration": params.required_duration,
+                        "participants": params.participants,
+                        "rooms": params.rooms
+                    },
+                    **timing
+                }
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка при поиске окна с аудиторией: {e}")
+            return WindowResponse(
+                success=False,
+                message=f"Ошибка при поиске окна с аудиторией: {str(e)}"
+            )
+
+    async def analyze_batch(self, request: BatchAnalysisRequest) -> WindowResponse:
+        """
+        Пакетный поиск окон: все запросы выполняются за один проход по расписаниям
+
+        Args:
+            request: Запрос с набором запросов поиска окон
+
+        Returns:
+            WindowResponse: Результаты по каждому запросу в исходном порядке
+        """
+        try:
+            # Замеры этапов и профилирование (по запросу)
+            timer = self._create_timer(request)
+            with timer:
+                # Создаем анализатор для выбранного источника расписаний
+                analyzer, error = await self._create_analyzer(request, timer)
+                if not analyzer:
+                    return WindowResponse(success=False, message=error)
+
+                # Формируем конфигурации алгоритмов
+                algorithm_configs = []
+                for query in request.queries:
+                    algorithm_config, error = self._query_config(query)
+                    if not algorithm_config:
+                        return WindowResponse(success=False, message=error)
+                    algorithm_configs.append(algorithm_config)
+
+                # Выполняем все запросы за один проход
+                batch_results = await self._run_blocking(timer, analyzer.analyze_batch, algorithm_configs)
+            timing = self._timing_data(request, timer, analyzer)
+
+            results = []
+            for query, found_windows in zip(request.queries, batch_results):
+                results.append({
+                    "query_id": query.query_id,
+                    "type": query.type.value,
+                    "analysis_result": [self._window_to_dict(window) for window in found_windows],
+                    "found_windows_count": len(found_windows)
+                })
+
+            return WindowResponse(
+                success=True,
+                message=f"Обработано запросов: {len(results)}",
+                data={
+                    "project_title": request.project_title,
+                    "results": results,
+                    "queries_count": len(results),
+                    **timing
+                }
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка при пакетном анализе: {e}")
+            return WindowResponse(
+                success=False,
+                message=f"Ошибка при пакетном анализе: {str(e)}"
+            )
+
+    def _standing_query_data(self, standing_query_id: str, entry: Dict[str, Any],
+                             found_windows: List[Window]) -> Dict[str, Any]:
+        """Данные ответа с текущим результатом постоянного запроса"""
+        return {
+            "standing_query_id": standing_query_id,
+            "query_id": entry["query_id"],
+            "type": entry["type"],
+            "analysis_result": [self._window_to_dict(window) for window in found_windows],
+            "found_windows_count": len(found_windows)
+        }
+
+    def _get_standing_entry(self, standing_query_id: str) -> Optional[Dict[str, Any]]:
+        """Постоянный запрос по ID (или None, если запрос не зарегистрирован или вытеснен)"""
+        with self._standing_lock:
+            return self._standing_queries.get(standing_query_id)
+
+    async def register_standing_query(self, request: StandingQueryRequest) -> WindowResponse:
+        """
+        Регистрация постоянного запроса поиска окна
+
+        Анализатор запроса сохраняется вместе с загруженными слотами и лучшими
+        окнами по дням, поэтому обновление досок пересчитывает только
+        затронутые дни. Количество постоянных запросов ограничено настройкой
+        standing_queries_max, самые старые запросы вытесняются.
+
+        Args:
+            request: Запрос с источником расписаний и параметрами поиска
+
+        Returns:
+            WindowResponse: ID постоянного запроса и найденные окна
+        """
+        try:
+            algorithm_config, error = self._query_config(request.query)
+            if not algorithm_config:
+                return WindowResponse(success=False, message=error)
+
+            analyzer, error = await self._create_analyzer(request)
+            if not analyzer:
+                return WindowResponse(success=False, message=error)
+
+            standing_query_id = uuid.uuid4().hex
+            found_windows = await run_in_threadpool(
+                analyzer.register_standing_query, standing_query_id, algorithm_config
+            )
+            entry = {
+                "analyzer": analyzer,
+                "lock": threading.Lock(),
+                "source": request.source,
+                "login": request.login,
+                "query_id": request.query.query_id,
+                "type": request.query.type.value
+            }
+            with self._standing_lock:
+                self._standing_queries[standing_query_id] = entry
+                while len(self._standing_queries) > settings.standing_queries_max:
+                    self._standing_queries.popitem(last=False)
+
+            return WindowResponse(
+                success=True,
+                message=f"Постоянный запрос зарегистрирован. Найдено окон: {len(found_windows)}",
+                data=self._standing_query_data(standing_query_id, entry, found_windows)
+            )
+
+        except ValueError as e:
+            return WindowResponse(success=False, message=str(e))
+        except Exception as e:
+            logger.error(f"Ошибка при регистрации постоянного запроса: {e}")
+            return WindowResponse(
+                success=False,
+                message=f"Ошибка при регистрации постоянного запроса: {str(e)}"
+            )
+
+    def get_standing_query(self, standing_query_id: str) -> WindowResponse:
+        """
+        Текущий результат постоянного запроса без пересчёта
+
+        Args:
+            standing_query_id: ID постоянного запроса
+
+        Returns:
+            WindowResponse: Найденные окна
+        """
+        entry = self._get_standing_entry(standing_query_id)
+        if not entry:
+            return WindowResponse(success=False, message=f"Постоянный запрос {standing_query_id} не найден")
+        with entry["lock"]:
+            found_windows = entry["analyzer"].get_standing_results(standing_query_id)
+        return WindowResponse(
+            success=True,
+            message=f"Найдено окон: {len(found_windows)}",
+            data=self._standing_query_data(standing_query_id, entry, found_windows)
+        )
+
+    async def refresh_standing_query(self, standing_query_id: str,
+                                     request: StandingQueryRefreshRequest) -> WindowResponse:
+        """
+        Обновление досок постоянного запроса
+
+        Слоты досок перечитываются из источника: для yougile - через новый
+        интегратор (общий кэш сущностей, обновляемый вебхуками, делает это
+        дешёвым), для local - из переданных расписаний или JSON-файлов парсера
+        (файл читается заново, если парсер его перезаписал). Пересчитываются только дни, затронутые изменившимися слотами.
+
+        Args:
+            standing_query_id: ID постоянного запроса
+            request: Данные YouGile или новые локальные расписания
+
+        Returns:
+            WindowResponse: Актуальные окна и признак пересчёта
+        """
+        try:
+            entry = self._get_standing_entry(standing_query_id)
+            if not entry:
+                return WindowResponse(success=False, message=f"Постоянный запрос {standing_query_id} не найден")
+            analyzer = entry["analyzer"]
+            if request.schedules and entry["source"] != "local":
+                return WindowResponse(success=False, message="Новые расписания передаются только для источника local")
+
+            integrator = None
+            if entry["source"] == "yougile":
+                if not request.login or not request.password:
+                    return WindowResponse(success=False, message="Для источника yougile необходимо указать логин и пароль")
+                if request.login != entry["login"]:
+                    return WindowResponse(success=False, message="Постоянный запрос зарегистрирован другим пользователем")
+                client, error = await self._create_client(request.login, request.password)
+                if not client:
+                    return WindowResponse(success=False, message=error)
+                integrator = await run_in_threadpool(create_integrator, client, request.login)
+
+            def refresh() -> Tuple[List[str], bool, List[Window]]:
+                with entry["lock"]:
+                    if integrator:
+                        analyzer.integrator = integrator
+                        analyzer.slot_source = YouGileSlotSource(integrator)
+                    for name, days in (request.schedules or {}).items():
+                        analyzer.slot_source.add_schedule(name, [day.model_dump() for day in days])
+                    boards = request.boards or sorted(analyzer.get_standing_boards(standing_query_id))
+                    updated = False
+                    for board_name in boards:
+                        updated = standing_query_id in analyzer.update_board(board_name) or updated
+                    return boards, updated, analyzer.get_standing_results(standing_query_id)
+
+            boards, updated, found_windows = await run_in_threadpool(refresh)
+
+            return WindowResponse(
+                success=True,
+                message="Результат пересчитан" if updated else "Изменений в затронутых днях нет",
+                data={
+                    **self._standing_query_data(standing_query_id, entry, found_windows),
+                    "updated": updated,
+                    "boards": boards
+                }
+            )
+
+        except Exception as e:
+            logger.error(f"Ошибка при обновлении постоянного запроса: {e}")
+            return WindowResponse(
+                success=False,
+                message=f"Ошибка при обновлении постоянного запроса: {str(e)}"
+            )
+
+    def remove_standing_query(self, standing_query_id: str) -> WindowResponse:
+        """
+        Удаление постоянного запроса
+
+        Args:
+            standing_query_id: ID постоянного запроса
+
+        Returns:
+            WindowResponse: Результат удаления
+        """
+        with self._standing_lock:
+            entry = self._standing_queries.pop(standing_query_id, None)
+        if not entry:
+            return WindowResponse(success=False, message=f"Постоянный запрос {standing_query_id} не найден")
+        return WindowResponse(success=True, message=f"Постоянный запрос {standing_query_id} удалён")
@@ -0,0 +1,198 @@
+import sys
+import os
+import time
+import hmac
+import hashlib
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Optional, Tuple, Dict
+
+# Добавляем путь к модулям прототипа
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from yougile_integration.yougile_api_wrapper.yougile_api import AsyncYouGileClient
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Общий асинхронный клиент (пул соединений) для цикла событий сервера
+_client: Optional[AsyncYouGileClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+@dataclass
+class _CachedKey:
+    """Ключ API в кэше"""
+    key: str
+    password_digest: bytes
+    expires_at: float
+
+
+# Кэш ключей API по (логин, компания) и компаний по логину, общий для сервисов
+_keys: Dict[Tuple[str, str], _CachedKey] = {}
+_companies: Dict[str, str] = {}
+# Блокировки получения ключа по логину: существуют, пока их ждёт хотя бы один запрос
+_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+# Пароли в кэше не хранятся: для проверки используется HMAC со случайным секретом процесса
+_secret = os.urandom(32)
+
+
+def get_async_client() -> AsyncYouGileClient:
+    """
+    Получение общего асинхронного клиента YouGile
+
+    Соединения httpx привязаны к циклу событий, поэтому для другого цикла
+    создаётся новый клиент.
+
+    Returns:
+        AsyncYouGileClient: Клиент без токена
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client_loop is not loop:
+        _client = AsyncYouGileClient(
+            timeout=settings.yougile_timeout,
+            max_connections=settings.yougile_max_connections,
+            http2=settings.yougile_http2
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_async_client() -> None:
+    """Закрытие соединений общего асинхронного клиента"""
+    global _client, _client_loop
+    if _client is not None and _client_loop is asyncio.get_running_loop():
+        await _client.aclose()
+    _client = None
+    _client_loop = None
+
+
+def _password_digest(password: str) -> bytes:
+    """Проверочное значение пароля для кэша"""
+    return hmac.new(_secret, password.encode(), hashlib.sha256).digest()
+
+
+def _cached_key(login: str, password: str) -> Optional[str]:
+    """
+    Получение ключа из кэша
+
+    Ключ выдаётся только при совпадении пароля и до истечения срока хранения.
+
+    Args:
+        login: Логин YouGile
+        password: Пароль YouGile
+
+    Returns:
+        Optional[str]: Ключ или None
+    """
+    company_id = _companies.get(login)
+    entry = _keys.get((login, company_id)) if company_id else None
+    if entry is None or entry.expires_at <= time.monotonic():
+        return None
+    if not hmac.compare_digest(entry.password_digest, _password_digest(password)):
+        return None
+    return entry.key
+
+
+def get_company_id(login: str) -> Optional[str]:
+    """
+    ID компании, для которой получен ключ пользователя
+
+    Args:
+        login: Логин YouGile
+
+    Returns:
+        Optional[str]: ID компании или None, если ключ ещё не запрашивался
+    """
+    return _companies.get(login)
+
+
+def _evict_expired_keys() -> None:
+    """Удаление из кэша ключей с истёкшим сроком хранения и компаний их пользователей"""
+    now = time.monotonic()
+    for cache_key, entry in list(_keys.items()):
+        if entry.expires_at <= now:
+            _keys.pop(cache_key, None)
+            if _companies.get(cache_key[0]) == cache_key[1]:
+                _companies.pop(cache_key[0], None)
+
+
+def invalidate_api_key(key: str) -> None:
+    """
+    Удаление ключа из кэша (сервер отклонил ключ с ошибкой 401)
+
+    Args:
+        key: Ключ API
+    """
+    for cache_key, entry in list(_keys.items()):
+        if entry.key == key:
+            _keys.pop(cache_key, None)
+            logger.info(f"Ключ YouGile для {cache_key[0]} удалён из кэша")
+
+
+async def get_api_key(login: str, password: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Получение ключа YouGile API для первой компании пользователя
+
+    Ключ берётся из кэша процесса, иначе запрашивается (компании, ключи,
+    при отсутствии ключей - создание ключа) и кэшируется на yougile_key_ttl
+    секунд. Одновременные запросы одного пользователя получают ключ один раз.
+
+    Args:
+        login: Логин YouGile
+        password: Пароль YouGile
+
+    Returns:
+        Tuple: Ключ (или None) и сообщение об ошибке (или None)
+    """
+    key = _cached_key(login, password)
+    if key:
+        return key, None
+
+    lock = _locks.setdefault(login, asyncio.Lock())
+    async with lock:
+        key = _cached_key(login, password)
+        if key:
+            return key, None
+        return await _request_api_key(login, password)
+
+
+async def _request_api_key(login: str, password: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Запрос ключа YouGile API с сохранением в кэш
+
+    Args:
+        login: Логин YouGile
+        password: Пароль YouGile
+
+    Returns:
+        Tuple: Ключ (или None) и сообщение об ошибке (или None)
+    """
+    client = get_async_client()
+
+    companies = await client.auth.get_companies(login, password)
+    if not companies.get('content'):
+        return None, "Не удалось получить список компаний"
+
+    company_id = companies['content'][0].get('id')
+    keys = await client.auth.get_keys(login, password, company_id)
+    if not keys:
+        key = await client.auth.create_key(login, password, company_id)
+        keys = [key] if key else []
+
+    if not keys:
+        return None, "Не удалось получить ключи доступа"
+
+    key = keys[0].get('key')
+    if key:
+        _evict_expired_keys()
+        _companies[login] = company_id
+        _keys[(login, company_id)] = _CachedKey(
+            key=key,
+            password_digest=_password_digest(password),
+            expires_at=time.monotonic() + settings.yougile_key_ttl
+        )
+    return key, None
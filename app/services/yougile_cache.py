@@ -0,0 +1,136 @@
+import sys
+import os
+import hmac
+import hashlib
+import logging
+from typing import Optional, Tuple, Dict, Any
+
+# Добавляем путь к модулям прототипа
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
+
+from yougile_integration.yougile_api_wrapper.yougile_api import YouGileClient
+from yougile_integration.yougile_integrator.integrator import ScheduleIntegrator
+from yougile_integration.yougile_integrator.entity_cache import (
+    EntityCache, get_entity_cache, find_entity_caches, save_entity_caches
+)
+from app.config import settings
+from app.services.yougile_auth import get_company_id
+
+logger = logging.getLogger(__name__)
+
+
+def _get_company_cache(login: str) -> Optional[EntityCache]:
+    """
+    Общий для запросов кэш сущностей пользователя
+
+    Кэш ведётся по (компания, логин): права доступа в YouGile у
+    пользователей компании различаются, поэтому данные, загруженные ключом
+    одного пользователя, другим не выдаются.
+
+    Args:
+        login: Логин YouGile (ключ для него уже получен)
+
+    Returns:
+        Optional[EntityCache]: Кэш или None, если общий кэш отключён
+    """
+    if not settings.yougile_entity_cache:
+        return None
+    company_id = get_company_id(login)
+    if not company_id:
+        return None
+    db_path = None
+    if settings.yougile_cache_persist:
+        login_digest = hashlib.sha256(login.encode()).hexdigest()[:16]
+        db_path = os.path.join(settings.yougile_cache_dir, f"{company_id}_{login_digest}.sqlite3")
+    return get_entity_cache(company_id, login, ttl=settings.yougile_cache_ttl, db_path=db_path,
+                            resync_ttl=settings.yougile_cache_resync_ttl)
+
+
+def _webhook_url(company_id: str) -> Optional[str]:
+    """
+    Адрес приёмника вебхуков для компании
+
+    Вебхуки используются только вместе с секретом: без него приёмник
+    отклоняет события, и подписка не оформляется.
+
+    Returns:
+        Optional[str]: Адрес или None, если не заданы адрес сервиса и секрет
+    """
+    if not settings.yougile_webhook_url or not settings.yougile_webhook_secret:
+        return None
+    return (f"{settings.yougile_webhook_url.rstrip('/')}/api/v1/yougile/webhook/{company_id}"
+            f"?token={settings.yougile_webhook_secret}")
+
+
+def create_integrator(client: YouGileClient, login: str) -> ScheduleIntegrator:
+    """
+    Создание интегратора с общим кэшем сущностей пользователя
+
+    Ограничитель частоты запросов общий для всех пользователей компании.
+    При первом использовании кэша оформляется подписка на вебхуки YouGile,
+    если заданы внешний адрес сервиса и секрет вебхуков. Выполняет
+    синхронные запросы, поэтому вызывается в пуле потоков.
+
+    Args:
+        client: Клиент YouGile с токеном
+        login: Логин YouGile
+
+    Returns:
+        ScheduleIntegrator: Интегратор
+    """
+    company_id = get_company_id(login)
+    entity_cache = _get_company_cache(login)
+    if entity_cache is not None and not entity_cache.webhooks_subscribed:
+        url = _webhook_url(company_id)
+        if url:
+            entity_cache.subscribe_webhooks(client, url)
+    return ScheduleIntegrator(
+        client,
+        requests_per_minute=settings.yougile_requests_per_minute,
+        max_workers=settings.yougile_write_workers,
+        entity_cache=entity_cache,
+        company_id=company_id
+    )
+
+
+def apply_webhook_event(company_id: str, token: Optional[str], event: str,
+                        payload: Dict[str, Any]) -> Tuple[bool, str]:
+    """
+    Применение события вебхука YouGile к кэшам сущностей пользователей компании
+
+    События принимаются только при заданном секрете вебхуков и совпадающем
+    токене: иначе любой мог бы изменить кэш, из которого читают анализы.
+
+    Args:
+        company_id: ID компании из адреса вебхука
+        token: Токен из адреса вебхука
+        event: Название события
+        payload: Данные сущности
+
+    Returns:
+        Tuple: Токен принят и сообщение о результате
+    """
+    if not settings.yougile_webhook_secret:
+        return False, "Вебхуки не настроены (не задан YOUGILE_WEBHOOK_SECRET)"
+    if not hmac.compare_digest(token or "", settings.yougile_webhook_secret):
+        return False, "Неверный токен вебхука"
+
+    entity_caches = find_entity_caches(company_id)
+    if not entity_caches:
+        return True, "Кэш компании не загружен"
+    applied = sum(entity_cache.apply_event(event, payload) for entity_cache in entity_caches)
+    if applied:
+        return True, f"Событие {event} применено к кэшам: {applied}"
+    return True, f"Событие {event} пропущено"
+
+
+def save_entity_cache(integrator: ScheduleIntegrator) -> None:
+    """Сохранение кэша сущностей интегратора в SQLite (если включено сохранение)"""
+    if settings.yougile_cache_persist:
+        integrator.entity_cache.save()
+
+
+def save_all_entity_caches() -> None:
+    """Сохранение всех кэшей сущностей при остановке сервиса"""
+    if settings.yougile_cache_persist:
+        save_entity_caches()
@@ -2,15 +2,17 @@ import sys
 import os
 from typing import Optional, List
 import logging
+from fastapi.concurrency import run_in_threadpool
 
 # Добавляем путь к модулям прототипа
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'core'))
 
 from yougile_integration.yougile_api_wrapper.yougile_api import YouGileClient
-from yougile_integration.yougile_integrator.integrator import ScheduleIntegrator
 from app.models.yougile import (
     YouGileIntegrateRequest, YouGileIntegrateResponse
 )
+from app.services.yougile_auth import get_api_key, invalidate_api_key
+from app.services.yougile_cache import create_integrator, save_entity_cache
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,28 @@ class YouGileService:
     def __init__(self):
         pass
 
+    def _integrate(self, client: YouGileClient, login: str, schedule_data: List[dict], schedule_name: str,
+                   project_title: Optional[str], sync_tasks: bool = True) -> bool:
+        """
+        Интеграция расписания через синхронный интегратор
+
+        Args:
+            client: Клиент YouGile с токеном
+            login: Логин YouGile (для общего кэша сущностей компании)
+            schedule_data: Данные расписания
+            schedule_name: Название расписания
+            project_title: Название проекта в YouGile
+            sync_tasks: Изменять только отличающиеся задачи существующей доски
+
+        Returns:
+            bool: Результат интеграции
+        """
+        integrator = create_integrator(client, login)
+        result = integrator.integrate_schedule(schedule_data, schedule_name, project_title=project_title,
+                                               sync_tasks=sync_tasks)
+        save_entity_cache(integrator)
+        return result
+
     async def integrate_schedule(self, request: YouGileIntegrateRequest) -> YouGileIntegrateResponse:
         """
         Интеграция расписания в YouGile
@@ -32,43 +56,25 @@ class YouGileService:
             YouGileIntegrateResponse: Результат интеграции
         """
         try:
-            # Создаем клиент YouGile
-            client = YouGileClient(login=request.login, password=request.password)
-
-            # Получаем токен
-            companies = client.auth.get_companies(request.login, request.password)
-            if not companies.get('content'):
+            # Получаем ключ API (из кэша или асинхронно, не блокируя цикл событий)
+            token, error = await get_api_key(request.login, request.password)
+            if not token:
                 return YouGileIntegrateResponse(
                     success=False,
-                    message="Не удалось получить список компаний"
+                    message=error
                 )
 
-            company_id = companies['content'][0].get('id')
-            keys = client.auth.get_keys(request.login, request.password, company_id)
-            if not keys:
-                key = client.auth.create_key(request.login, request.password,
-                                             client.auth.get_companies(request.login, request.password)['content'][
-                                                 0].get('id'))
-                keys = [key]
-
-                if not key:
-                    return YouGileIntegrateResponse(
-                        success=False,
-                        message="Не удалось получить ключи доступа"
-                    )
-
-            token = keys[0].get('key')
-            client.set_token(token)
+            # Создаем клиент YouGile
+            client = YouGileClient(token=token, login=request.login, password=request.password,
+                                   on_auth_error=invalidate_api_key)
 
             # Преобразуем данные расписания в формат для интегратора
             schedule_data = [day.dict() for day in request.schedule_data]
 
-            # Создаем интегратор и интегрируем расписание
-            integrator = ScheduleIntegrator(client)
-            result = integrator.integrate_schedule(
-                schedule_data,
-                request.schedule_name,
-                project_title=request.project_title
+            # Интеграция выполняет сотни синхронных запросов, поэтому выполняется в пуле потоков
+            result = await run_in_threadpool(
+                self._integrate, client, request.login, schedule_data, request.schedule_name, request.project_title,
+                request.sync_tasks
             )
 
             return YouGileIntegrateResponse(
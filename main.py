@@ -8,6 +8,9 @@ import os
 
 from app.config import settings
 from app.routers import schedule_router, yougile_router, analysis_router, health_router
+from app.services.yougile_auth import close_async_client
+from app.services.yougile_cache import save_all_entity_caches
+from app.services.schedule_analyzer import shutdown_analysis_pool
 
 # Настройка логирования
 logging.basicConfig(
@@ -66,6 +69,9 @@ async def startup_event():
 async def shutdown_event():
     """Событие остановки приложения"""
     logger.info(f"Остановка {settings.app_name}")
+    await close_async_client()
+    save_all_entity_caches()
+    shutdown_analysis_pool()
 
 if __name__ == "__main__":
     import uvicorn